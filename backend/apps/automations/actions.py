@@ -7,15 +7,24 @@ Each action is a dict with "type" and params. Example:
     {"type": "add_note", "entity": "reservation", "content": "Auto-generada por regla"}
 """
 import logging
+import time
 
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import observe
 
 logger = logging.getLogger(__name__)
 
 
-def execute_action(action_def, context):
+def execute_action(action_def, context, key=None):
     """
-    Execute a single action.
+    Execute a single action. The result carries its duration_ms, which is
+    also recorded in the per-organization histograms (metrics.py).
+
+    key identifies this action within an outbox delivery; executors whose
+    effect would duplicate on a redelivery use it to run at most once.
 
     context keys:
         organization, user, reservation, room, task, guest, property
@@ -26,34 +35,50 @@ def execute_action(action_def, context):
         logger.warning(f"Unknown action type: {action_type}")
         return {"type": action_type, "success": False, "error": f"Unknown action: {action_type}"}
 
+    started = time.perf_counter()
     try:
-        result = executor(action_def, context)
-        return {"type": action_type, "success": True, "detail": result}
+        # A savepoint, so a failed action leaves the caller's transaction usable
+        with transaction.atomic():
+            detail = executor(action_def, context, key)
+        result = {"type": action_type, "success": True, "detail": detail}
     except Exception as e:
         logger.exception(f"Action {action_type} failed: {e}")
-        return {"type": action_type, "success": False, "error": str(e)}
+        result = {"type": action_type, "success": False, "error": str(e)}
+    duration_ms = (time.perf_counter() - started) * 1000
+    result["duration_ms"] = round(duration_ms, 1)
 
+    organization = context.get("organization")
+    observe(getattr(organization, "pk", None), action_type, duration_ms, result["success"])
+    return result
 
-def _create_task(action_def, context):
+
+def _create_task(action_def, context, key=None):
     from apps.tasks.models import Task
 
     room = context.get("room")
     property_obj = context.get("property")
     organization = context.get("organization")
 
-    task = Task.objects.create(
-        organization=organization,
-        task_type=action_def.get("task_type", "other"),
-        property=property_obj,
-        room=room,
-        assigned_role=action_def.get("assigned_role", ""),
-        priority=action_def.get("priority", "normal"),
-        notes=action_def.get("notes", ""),
-    )
+    fields = {
+        "task_type": action_def.get("task_type", "other"),
+        "property": property_obj,
+        "room": room,
+        "assigned_role": action_def.get("assigned_role", ""),
+        "priority": action_def.get("priority", "normal"),
+        "notes": action_def.get("notes", ""),
+    }
+    if key is None:
+        task = Task.objects.create(organization=organization, **fields)
+    else:
+        task, created = Task.objects.get_or_create(
+            organization=organization, automation_key=key, defaults=fields,
+        )
+        if not created:
+            return f"Task {task.id} already created, skipped"
     return f"Task {task.id} created ({task.get_task_type_display()})"
 
 
-def _change_room_status(action_def, context):
+def _change_room_status(action_def, context, key=None):
     from apps.rooms.constants import room_state_machine
 
     room = context.get("room")
@@ -70,7 +95,7 @@ def _change_room_status(action_def, context):
         return f"Room transition failed: {e.message}"
 
 
-def _add_note(action_def, context):
+def _add_note(action_def, context, key=None):
     entity = action_def.get("entity")
     content = action_def.get("content", "")
     organization = context.get("organization")
@@ -89,10 +114,9 @@ def _add_note(action_def, context):
     return f"Note skipped (entity={entity})"
 
 
-def _emit_invoice(action_def, context):
+def _emit_invoice(action_def, context, key=None):
     from apps.billing.services.config_resolver import resolve_billing_config
     from apps.billing.services.invoice_builder import build_invoice_from_reservation
-    from apps.billing.services.invoice_emitter import emit_invoice
 
     reservation = context.get("reservation")
     if not reservation:
@@ -106,23 +130,31 @@ def _emit_invoice(action_def, context):
     emission_mode = config["emission_mode"]
     document_type = action_def.get("document_type", "boleta")
 
-    # Always create the draft
-    invoice = build_invoice_from_reservation(reservation, document_type, user)
-    if not invoice:
-        return "Could not build invoice (no serie configured?), skipped"
+    # Draft, correlativo and (in automatic mode) the emission job commit
+    # together; run_billing_worker sends it, so a slow provider never
+    # blocks the check-out. In sync mode this runs inside the check-out
+    # transaction. An error here (e.g. a lock wait on the serie counter)
+    # fails the action, and the outbox retries it.
+    with transaction.atomic():
+        # Events are delivered at least once: the reservation lock
+        # serializes overlapping deliveries, so the stay is billed once
+        type(reservation).objects.select_for_update().only("pk").get(pk=reservation.pk)
+        existing = reservation.invoices.filter(document_type=document_type).exclude(
+            status="voided",
+        ).first()
+        if existing:
+            return f"Invoice {existing.numero_completo} already exists, skipped"
+
+        invoice = build_invoice_from_reservation(reservation, document_type, user)
+        if not invoice:
+            return "Could not build invoice (no serie configured?), skipped"
+        if emission_mode == "automatic":
+            invoice.next_attempt_at = timezone.now()
+            invoice.save(update_fields=["next_attempt_at", "updated_at"])
 
-    # Only emit if automatic
     if emission_mode == "automatic":
-        result = emit_invoice(invoice, user)
-        if result["success"]:
-            return f"Invoice {invoice.numero_completo} emitted successfully"
-        else:
-            return (
-                f"Invoice {invoice.numero_completo} created, emission failed: "
-                f"{result.get('error')}. Pending retry."
-            )
-    else:  # manual
-        return f"Invoice {invoice.numero_completo} created as draft (manual mode)"
+        return f"Invoice {invoice.numero_completo} created and queued for emission"
+    return f"Invoice {invoice.numero_completo} created as draft (manual mode)"
 
 
 ACTION_REGISTRY = {
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import AutomationLog, AutomationRule
+from .models import AutomationLog, AutomationLogPolicy, AutomationRule, OutboxEvent
 
 
 @admin.register(AutomationRule)
@@ -14,3 +14,15 @@ class AutomationLogAdmin(admin.ModelAdmin):
     list_display = ["rule_name", "trigger", "conditions_met", "success", "created_at"]
     list_filter = ["success", "trigger"]
     readonly_fields = ["event_data", "actions_executed"]
+
+
+@admin.register(AutomationLogPolicy)
+class AutomationLogPolicyAdmin(admin.ModelAdmin):
+    list_display = ["organization", "unmatched_sample_percent", "updated_at"]
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ["id", "trigger", "entity_type", "entity_id", "status", "attempts", "created_at"]
+    list_filter = ["status", "trigger"]
+    readonly_fields = ["context", "last_error"]
@@ -0,0 +1,232 @@
+"""
+Bulk event dispatch for batch jobs.
+
+Usage:
+    from apps.automations.bulk import dispatch_events_bulk
+
+    dispatch_events_bulk(
+        "reservation.cancelled",
+        organization,
+        [{"reservation": r, "room": r.room, "guest": r.guest, "property": r.property}
+         for r in reservations],
+    )
+
+Rules are loaded once, conditions are evaluated for every context, and
+the matched actions are grouped by type: tasks and guest notes are
+written with bulk_create, room status changes are validated in memory
+and applied with one UPDATE per target status plus bulk transition logs.
+Action types without a bulk executor (emit_invoice) run one by one
+through execute_action. Logs are written with one bulk_create.
+
+Within a rule, actions run grouped by type rather than in list order.
+"""
+import logging
+import time
+import uuid
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .actions import execute_action
+from .cache import get_active_rules, get_unmatched_sample_percent
+from .dispatcher import _sampled, _serialize_context
+from .metrics import observe
+from .models import AutomationLog
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch_events_bulk(trigger, organization, contexts):
+    """Dispatch one trigger for many contexts. Returns summary counts."""
+    rules = get_active_rules(organization.pk, trigger)
+    summary = {"events": len(contexts), "matched": 0, "actions": 0}
+    if not rules or not contexts:
+        return summary
+
+    unmatched_percent = get_unmatched_sample_percent(organization.pk)
+    logs = []
+    results_by_log = []
+    batches = defaultdict(list)
+
+    for context in contexts:
+        context["organization"] = organization
+        event_data = _serialize_context(context)
+        dispatch_id = uuid.uuid4()
+        for rule in rules:
+            if not rule.matches(context):
+                if _sampled(unmatched_percent):
+                    logs.append(AutomationLog(
+                        organization=organization,
+                        rule_id=rule.id,
+                        rule_name=rule.name,
+                        trigger=trigger,
+                        event_data=event_data,
+                        dispatch_id=dispatch_id,
+                        conditions_met=False,
+                        actions_executed=[],
+                        success=True,
+                    ))
+                continue
+
+            summary["matched"] += 1
+            results = []
+            for action_def in rule.actions:
+                # Filled in by the executor of the action's type
+                slot = {"type": action_def.get("type")}
+                results.append(slot)
+                batches[slot["type"]].append((slot, action_def, context))
+            logs.append(AutomationLog(
+                organization=organization,
+                rule_id=rule.id,
+                rule_name=rule.name,
+                trigger=trigger,
+                event_data=event_data,
+                dispatch_id=dispatch_id,
+                conditions_met=True,
+                actions_executed=results,
+            ))
+            results_by_log.append((logs[-1], results))
+
+    for action_type, items in batches.items():
+        summary["actions"] += len(items)
+        executor = BULK_REGISTRY.get(action_type)
+        if executor is None:
+            for slot, action_def, context in items:
+                slot.update(execute_action(action_def, context))
+            continue
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                executor(items, organization)
+        except Exception as e:
+            logger.exception(f"Bulk action {action_type} failed: {e}")
+            for slot, _, _ in items:
+                slot.clear()
+                slot.update({"type": action_type, "success": False, "error": str(e)})
+        # The batch cost is shared evenly by its items
+        duration_ms = (time.perf_counter() - started) * 1000 / len(items)
+        for slot, _, _ in items:
+            slot["duration_ms"] = round(duration_ms, 1)
+            observe(organization.pk, action_type, duration_ms, slot.get("success", False))
+
+    for log, results in results_by_log:
+        failed = [r for r in results if not r.get("success")]
+        log.success = not failed
+        log.error_message = str(failed) if failed else ""
+    AutomationLog.objects.bulk_create(logs, batch_size=1000)
+
+    logger.info(
+        f"Bulk dispatch {trigger} (org={organization.id}): "
+        f"{summary['events']} events, {summary['matched']} matches"
+    )
+    return summary
+
+
+def _done(slot, detail):
+    slot.update({"success": True, "detail": detail})
+
+
+def _bulk_create_task(items, organization):
+    from apps.tasks.models import Task
+
+    tasks = [
+        Task(
+            organization=organization,
+            task_type=action_def.get("task_type", "other"),
+            property=context.get("property"),
+            room=context.get("room"),
+            assigned_role=action_def.get("assigned_role", ""),
+            priority=action_def.get("priority", "normal"),
+            notes=action_def.get("notes", ""),
+        )
+        for _, action_def, context in items
+    ]
+    Task.objects.bulk_create(tasks, batch_size=500)
+    for (slot, _, _), task in zip(items, tasks):
+        _done(slot, f"Task {task.id} created ({task.get_task_type_display()})")
+    _bump_dashboard(organization)
+
+
+def _bulk_change_room_status(items, organization):
+    from apps.common.models import StateTransitionLog
+    from apps.rooms.constants import room_state_machine
+    from apps.rooms.models import Room
+
+    current = {}
+    rooms = {}
+    logs = []
+    for slot, action_def, context in items:
+        room = context.get("room")
+        if not room:
+            _done(slot, "No room in context, skipped")
+            continue
+        new_status = action_def.get("new_status")
+        state = current.setdefault(room.pk, room.status)
+        if not room_state_machine.can_transition(state, new_status):
+            valid = ", ".join(room_state_machine.get_valid_transitions(state))
+            _done(
+                slot,
+                f"Room transition failed: Transición inválida: {state} → {new_status}. "
+                f"Transiciones válidas desde '{state}': [{valid}]",
+            )
+            continue
+        current[room.pk] = new_status
+        rooms.setdefault(room.pk, []).append(room)
+        logs.append(StateTransitionLog(
+            entity_type="Room",
+            entity_id=room.pk,
+            field="status",
+            old_value=state,
+            new_value=new_status,
+            changed_by=context.get("user"),
+            organization=organization,
+        ))
+        _done(slot, f"Room {room.number}: → {new_status}")
+
+    by_status = defaultdict(list)
+    for room_id in rooms:
+        by_status[current[room_id]].append(room_id)
+    now = timezone.now()
+    for new_status, room_ids in by_status.items():
+        Room.objects.filter(pk__in=room_ids).update(status=new_status, updated_at=now)
+    for room_id, objects in rooms.items():
+        for room in objects:
+            room.status = current[room_id]
+    StateTransitionLog.objects.bulk_create(logs, batch_size=1000)
+    if rooms:
+        _bump_dashboard(organization)
+
+
+def _bulk_add_note(items, organization):
+    from apps.guests.models import GuestNote
+
+    notes = []
+    for slot, action_def, context in items:
+        guest = context.get("guest")
+        if action_def.get("entity") != "guest" or not guest:
+            _done(slot, f"Note skipped (entity={action_def.get('entity')})")
+            continue
+        notes.append(GuestNote(
+            guest=guest,
+            organization=organization,
+            content=action_def.get("content", ""),
+            created_by=context.get("user"),
+        ))
+        _done(slot, f"Note added to guest {guest.full_name}")
+    GuestNote.objects.bulk_create(notes, batch_size=500)
+
+
+def _bump_dashboard(organization):
+    # bulk_create/update() skip the signals that invalidate dashboards
+    from apps.dashboard.cache import bump_data_version
+
+    org_id = organization.pk
+    transaction.on_commit(lambda: bump_data_version(org_id))
+
+
+BULK_REGISTRY = {
+    "create_task": _bulk_create_task,
+    "change_room_status": _bulk_change_room_status,
+    "add_note": _bulk_add_note,
+}
@@ -0,0 +1,130 @@
+"""
+Cache of active automation rules per (organization, trigger).
+
+Rules and the organization's AutomationLogPolicy are cached under the
+organization's rule version, which writes to either model bump on commit
+(see signals.py), so an edit is visible on the next dispatch. The version
+is an AutomationRuleVersion row rather than a cache key: with a
+per-process cache (locmem) a bump made by a web worker would otherwise
+never reach `run_automation_worker`. Each process keeps the version it
+read for AUTOMATION_RULE_VERSION_TTL seconds, so dispatches do not query
+it every time; an edit reaches other processes within that delay and the
+editing process at once. Conditions are compiled once per process and reused while
+the rule's updated_at does not change.
+
+Usage:
+    for rule in get_active_rules(organization.pk, "reservation.check_out"):
+        if rule.matches(context):
+            ...
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .conditions import compile_conditions
+from .models import AutomationLogPolicy, AutomationRule, AutomationRuleVersion
+
+RULES_KEY = "automations:rules:{org_id}:{version}:{trigger}"
+LOG_POLICY_KEY = "automations:log_policy:{org_id}:{version}"
+
+# Rule versions read by this process: {org_id: (version, read_at)}
+_versions = {}
+
+# Compiled conditions per process, keyed by (rule id, updated_at)
+_compiled = {}
+MAX_COMPILED = 2000
+
+
+class CachedRule:
+    """Read-only view of an AutomationRule as needed by the dispatcher."""
+
+    __slots__ = (
+        "id", "name", "trigger", "priority", "conditions", "actions", "schedule", "updated_at",
+        "matches",
+    )
+
+    def __init__(self, id, name, trigger, priority, conditions, actions, schedule, updated_at):
+        self.id = id
+        self.name = name
+        self.trigger = trigger
+        self.priority = priority
+        self.conditions = conditions
+        self.actions = actions
+        self.schedule = schedule
+        self.updated_at = updated_at
+        self.matches = _compile(id, updated_at, conditions)
+
+
+def _compile(rule_id, updated_at, conditions):
+    key = (rule_id, updated_at)
+    check = _compiled.get(key)
+    if check is None:
+        if len(_compiled) >= MAX_COMPILED:
+            _compiled.clear()
+        check = _compiled[key] = compile_conditions(conditions)
+    return check
+
+
+def get_rules_version(org_id):
+    now = time.monotonic()
+    entry = _versions.get(org_id)
+    if entry is not None and now - entry[1] < settings.AUTOMATION_RULE_VERSION_TTL:
+        return entry[0]
+    version = (
+        AutomationRuleVersion.objects.filter(organization_id=org_id)
+        .values_list("version", flat=True)
+        .first()
+    ) or 0
+    _versions[org_id] = (version, now)
+    return version
+
+
+def bump_rules_version(org_id):
+    """Invalidate the cached rules of an organization."""
+    bump = AutomationRuleVersion.objects.filter(organization_id=org_id)
+    if not bump.update(version=F("version") + 1):
+        _, created = AutomationRuleVersion.objects.get_or_create(
+            organization_id=org_id, defaults={"version": 1},
+        )
+        if not created:
+            # Created concurrently by another bump; still move past it.
+            bump.update(version=F("version") + 1)
+    # After the write, so this process cannot re-read the old version
+    _versions.pop(org_id, None)
+
+
+def get_active_rules(org_id, trigger):
+    """Active rules for the trigger, in priority order."""
+    key = RULES_KEY.format(org_id=org_id, version=get_rules_version(org_id), trigger=trigger)
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(
+            AutomationRule.objects.filter(
+                organization_id=org_id,
+                trigger=trigger,
+                is_active=True,
+            ).order_by("priority").values_list(
+                "id", "name", "trigger", "priority", "conditions", "actions", "schedule",
+                "updated_at",
+            )
+        )
+        cache.set(key, rows, settings.AUTOMATION_RULE_CACHE_TIMEOUT)
+    return [CachedRule(*row) for row in rows]
+
+
+def get_unmatched_sample_percent(org_id):
+    """Percentage of conditions_met=False evaluations to log."""
+    key = LOG_POLICY_KEY.format(org_id=org_id, version=get_rules_version(org_id))
+    percent = cache.get(key)
+    if percent is None:
+        percent = (
+            AutomationLogPolicy.objects.filter(organization_id=org_id)
+            .values_list("unmatched_sample_percent", flat=True)
+            .first()
+        )
+        if percent is None:
+            percent = settings.AUTOMATION_UNMATCHED_LOG_PERCENT
+        cache.set(key, percent, settings.AUTOMATION_RULE_CACHE_TIMEOUT)
+    return percent
@@ -7,56 +7,70 @@ Each condition is a dict:
     {"field": "room.status", "operator": "in", "value": ["dirty", "maintenance"]}
 
 Supported operators: eq, neq, in, gt, gte, lt, lte
+
+Conditions are compiled once into a single callable (field paths split
+ahead of time, operators resolved to functions) and reused for every
+event; see compile_conditions().
 """
 
 
-def evaluate_conditions(conditions, context):
-    """
-    Evaluate all conditions. Returns True if ALL conditions pass (AND logic).
-    Empty conditions list = always true.
-    """
-    if not conditions:
-        return True
-
-    for condition in conditions:
-        if not _evaluate_single(condition, context):
-            return False
+def _always_true(context):
     return True
 
 
-def _resolve_field(field_path, context):
-    """Resolve a dotted field path from context. e.g. 'task.task_type'"""
-    parts = field_path.split(".")
-    obj = context.get(parts[0])
-    if obj is None:
-        return None
-    for part in parts[1:]:
-        obj = getattr(obj, part, None)
-        if obj is None:
-            return None
-    return obj
+def _never(actual, expected):
+    return False
+
+
+OPERATORS = {
+    "eq": lambda actual, expected: actual == expected,
+    "neq": lambda actual, expected: actual != expected,
+    "in": lambda actual, expected: actual in expected,
+    "gt": lambda actual, expected: actual is not None and actual > expected,
+    "gte": lambda actual, expected: actual is not None and actual >= expected,
+    "lt": lambda actual, expected: actual is not None and actual < expected,
+    "lte": lambda actual, expected: actual is not None and actual <= expected,
+}
+
+
+def _compile_field(field_path):
+    """Return a resolver for a dotted field path. e.g. 'task.task_type'"""
+    head, *attrs = field_path.split(".")
 
+    def resolve(context):
+        obj = context.get(head)
+        for attr in attrs:
+            if obj is None:
+                return None
+            obj = getattr(obj, attr, None)
+        return obj
 
-def _evaluate_single(condition, context):
-    field = condition.get("field", "")
-    operator = condition.get("operator", "eq")
+    return resolve
+
+
+def _compile_single(condition):
+    resolve = _compile_field(condition.get("field", ""))
+    test = OPERATORS.get(condition.get("operator", "eq"), _never)
     expected = condition.get("value")
+    return lambda context: test(resolve(context), expected)
 
-    actual = _resolve_field(field, context)
-
-    if operator == "eq":
-        return actual == expected
-    elif operator == "neq":
-        return actual != expected
-    elif operator == "in":
-        return actual in expected
-    elif operator == "gt":
-        return actual is not None and actual > expected
-    elif operator == "gte":
-        return actual is not None and actual >= expected
-    elif operator == "lt":
-        return actual is not None and actual < expected
-    elif operator == "lte":
-        return actual is not None and actual <= expected
 
-    return False
+def compile_conditions(conditions):
+    """
+    Compile a list of conditions into a callable context -> bool.
+    ALL conditions must pass (AND logic); an empty list is always true.
+    """
+    if not conditions:
+        return _always_true
+    tests = [_compile_single(condition) for condition in conditions]
+    if len(tests) == 1:
+        return tests[0]
+    return lambda context: all(test(context) for test in tests)
+
+
+def evaluate_conditions(conditions, context):
+    """
+    Evaluate all conditions. Returns True if ALL conditions pass (AND logic).
+    Empty conditions list = always true.
+    """
+    return compile_conditions(conditions)(context)
@@ -17,95 +17,172 @@ Usage:
     )
 """
 import logging
+import random
+import uuid
 
 from .actions import execute_action
-from .conditions import evaluate_conditions
-from .models import AutomationLog, AutomationRule
+from .cache import get_active_rules, get_unmatched_sample_percent
+from .models import AutomationLog
 
 logger = logging.getLogger(__name__)
 
 
-def dispatch_event(trigger, organization, context):
+class ActionsFailed(Exception):
+    """
+    Raised by an outbox dispatch when some action failed, so the event is
+    retried. `completed` lists the "<rule id>:<index>" keys of the actions
+    that succeeded; the retry skips them.
+    """
+
+    def __init__(self, completed, failures):
+        super().__init__(str(failures))
+        self.completed = completed
+
+
+def dispatch_event(trigger, organization, context, rule_ids=None, event_key=None, done_actions=()):
     """
     Find all active rules matching the trigger for this organization,
     evaluate conditions, and execute actions.
+
+    Rules come from the per-(organization, trigger) cache in cache.py,
+    so a dispatch without matching rules only reads the rule version.
+    rule_ids restricts the dispatch to those rules (scheduled instances).
+    Logs of the dispatch are written with a single bulk insert; logs of
+    rules whose conditions failed are sampled per AutomationLogPolicy.
+
+    event_key identifies an outbox delivery: actions get an idempotency
+    key derived from it and failed actions raise ActionsFailed once the logs
+    are written. Actions in done_actions succeeded on an earlier attempt
+    and are skipped.
     """
     context["organization"] = organization
 
-    rules = AutomationRule.objects.filter(
-        organization=organization,
-        trigger=trigger,
-        is_active=True,
-    ).order_by("priority")
-
+    completed = []
+    failures = []
     results = []
-
-    for rule in rules:
-        conditions_met = evaluate_conditions(rule.conditions, context)
-
-        if not conditions_met:
-            AutomationLog.objects.create(
+    logs = []
+    event_data = None
+    unmatched_percent = None
+    dispatch_id = uuid.uuid4()
+
+    try:
+        for rule in get_active_rules(organization.pk, trigger):
+            if rule_ids is not None and rule.id not in rule_ids:
+                continue
+            conditions_met = rule.matches(context)
+
+            if not conditions_met:
+                if unmatched_percent is None:
+                    unmatched_percent = get_unmatched_sample_percent(organization.pk)
+                if not _sampled(unmatched_percent):
+                    continue
+                if event_data is None:
+                    event_data = _serialize_context(context)
+                logs.append(AutomationLog(
+                    organization=organization,
+                    rule_id=rule.id,
+                    rule_name=rule.name,
+                    trigger=trigger,
+                    event_data=event_data,
+                    dispatch_id=dispatch_id,
+                    conditions_met=False,
+                    actions_executed=[],
+                    success=True,
+                ))
+                continue
+
+            # Execute actions
+            action_results = []
+            all_success = True
+
+            pending = [
+                (f"{rule.id}:{index}", action_def)
+                for index, action_def in enumerate(rule.actions)
+                if f"{rule.id}:{index}" not in done_actions
+            ]
+            if done_actions and not pending:
+                continue
+
+            for action_key, action_def in pending:
+                key = f"{event_key}:{action_key}" if event_key else None
+                result = execute_action(action_def, context, key=key)
+                action_results.append(result)
+                if result.get("success"):
+                    completed.append(action_key)
+                else:
+                    all_success = False
+                    failures.append(result)
+
+            # Actions may have changed context objects (e.g. room status)
+            event_data = _serialize_context(context)
+            logs.append(AutomationLog(
                 organization=organization,
-                rule=rule,
+                rule_id=rule.id,
                 rule_name=rule.name,
                 trigger=trigger,
-                event_data=_serialize_context(context),
-                conditions_met=False,
-                actions_executed=[],
-                success=True,
+                event_data=event_data,
+                dispatch_id=dispatch_id,
+                conditions_met=True,
+                actions_executed=action_results,
+                success=all_success,
+                error_message="" if all_success else str(
+                    [r for r in action_results if not r.get("success")]
+                ),
+            ))
+
+            results.append({
+                "rule": rule.name,
+                "rule_id": rule.id,
+                "actions": action_results,
+                "success": all_success,
+            })
+
+            logger.info(
+                f"Automation '{rule.name}' executed for {trigger} "
+                f"(org={organization.id}, success={all_success})"
             )
-            continue
-
-        # Execute actions
-        action_results = []
-        all_success = True
-
-        for action_def in rule.actions:
-            result = execute_action(action_def, context)
-            action_results.append(result)
-            if not result.get("success"):
-                all_success = False
-
-        # Log execution
-        AutomationLog.objects.create(
-            organization=organization,
-            rule=rule,
-            rule_name=rule.name,
-            trigger=trigger,
-            event_data=_serialize_context(context),
-            conditions_met=True,
-            actions_executed=action_results,
-            success=all_success,
-            error_message="" if all_success else str(
-                [r for r in action_results if not r.get("success")]
-            ),
-        )
-
-        results.append({
-            "rule": rule.name,
-            "actions": action_results,
-            "success": all_success,
-        })
-
-        logger.info(
-            f"Automation '{rule.name}' executed for {trigger} "
-            f"(org={organization.id}, success={all_success})"
-        )
+
+        if event_key and failures:
+            raise ActionsFailed(completed, failures)
+    finally:
+        if logs:
+            AutomationLog.objects.bulk_create(logs)
 
     return results
 
 
+def _sampled(percent):
+    if percent >= 100:
+        return True
+    return percent > 0 and random.random() * 100 < percent
+
+
+# Concrete fields recorded next to each context id. They are plain columns
+# of the object, so reading them never loads a related row.
+LABEL_FIELDS = {
+    "reservation": "confirmation_code",
+    "room": "number",
+    "task": "task_type",
+    "property": "name",
+    "organization": "subdomain",
+    "user": "email",
+}
+
+
 def _serialize_context(context):
-    """Serialize context to JSON-safe dict for logging."""
+    """Serialize context to JSON-safe dict for logging: ids, not str()."""
     data = {}
     for key, val in context.items():
-        if hasattr(val, "pk"):
-            data[key] = {"id": str(val.pk), "str": str(val)}
-        elif val is None:
+        if val is None:
             data[key] = None
+        elif hasattr(val, "pk") and hasattr(val, "_meta"):
+            entry = {"id": str(val.pk), "model": val._meta.label_lower}
+            field = LABEL_FIELDS.get(key)
+            if field:
+                entry[field] = getattr(val, field, None)
+            data[key] = entry
+        elif isinstance(val, (str, int, float, bool)):
+            data[key] = val
         else:
-            try:
-                data[key] = str(val)
-            except Exception:
-                data[key] = repr(val)
+            data[key] = repr(val)
     return data
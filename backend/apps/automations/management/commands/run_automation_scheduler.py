@@ -0,0 +1,59 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.automations.scheduling import hand_off_due, purge_done
+
+PURGE_EVERY_SECONDS = 3600
+
+
+class Command(BaseCommand):
+    help = "Hand due time-based automations (schedule.* rules) to the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Due instances claimed per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30.0,
+            help="Seconds to wait when nothing is due (default: 30)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Hand off what is due and exit",
+        )
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=30,
+            help="Days handed-off instances are kept before being deleted (default: 30)",
+        )
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        total = 0
+        last_purge = 0
+
+        while True:
+            if time.monotonic() - last_purge > PURGE_EVERY_SECONDS:
+                purge_done(options["keep_days"])
+                last_purge = time.monotonic()
+
+            count = hand_off_due(worker_id, options["batch_size"])
+            total += count
+            if count:
+                self.stdout.write(f"Handed off {count} scheduled automation(s)")
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Handed off: {total}"))
@@ -0,0 +1,82 @@
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.automations.outbox import claim_batch, process_event, purge_done
+from apps.common.cache import is_shared_cache
+
+PURGE_EVERY_SECONDS = 3600
+
+
+class Command(BaseCommand):
+    help = "Dispatch automation events from the outbox (AUTOMATION_DISPATCH_MODE=outbox)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.AUTOMATION_WORKER_THREADS,
+            help=f"Events dispatched in parallel (default: {settings.AUTOMATION_WORKER_THREADS})",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Events claimed per pass (default: 50)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the outbox is empty (default: 1)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Dispatch what is pending and exit",
+        )
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=7,
+            help="Days dispatched events are kept before being deleted (default: 7)",
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            # Dispatch still works; only the action metrics stay in this process
+            self.stderr.write(self.style.WARNING(
+                "The cache is per-process (CACHE_URL=locmemcache://): action metrics "
+                "recorded by this worker will not be visible to the web workers. "
+                "Use a shared cache (redis://) to see them."
+            ))
+
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        threads = max(options["threads"], 1)
+        ok = failed = 0
+        last_purge = 0
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="automation") as pool:
+            while True:
+                if time.monotonic() - last_purge > PURGE_EVERY_SECONDS:
+                    purge_done(options["keep_days"])
+                    last_purge = time.monotonic()
+
+                batch = claim_batch(worker_id, options["batch_size"])
+                for success in pool.map(process_event, batch):
+                    if success:
+                        ok += 1
+                    else:
+                        failed += 1
+                if batch:
+                    self.stdout.write(f"Dispatched {len(batch)} event(s)")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Dispatched: {ok}, failed: {failed}"))
@@ -0,0 +1,50 @@
+"""
+Per-action timing of the automation engine.
+
+Every executed action is observed into an hourly histogram per
+(organization, action type) kept in the shared cache (see
+apps/common/histogram.py). Outbox dispatches observe them in
+`run_automation_worker`; with a per-process cache (apps/common/cache.py)
+those observations stay in the worker and the worker warns at start. Actions slower than AUTOMATION_SLOW_ACTION_MS are
+logged as warnings.
+"""
+import logging
+
+from django.conf import settings
+
+from apps.common import histogram
+
+logger = logging.getLogger(__name__)
+
+SERIES_PREFIX = "automations:metrics:{org_id}:{action}"
+
+
+def observe(org_id, action_type, duration_ms, success):
+    """Record one action execution."""
+    if org_id is None:
+        return
+    action_type = action_type or "unknown"
+    histogram.observe(
+        SERIES_PREFIX.format(org_id=org_id, action=action_type), duration_ms, success,
+    )
+
+    if duration_ms >= settings.AUTOMATION_SLOW_ACTION_MS:
+        logger.warning(
+            f"Slow automation action {action_type}: {duration_ms:.0f} ms "
+            f"(org={org_id})"
+        )
+
+
+def get_action_metrics(org_id, action_types, hours=24):
+    """Histograms of the last `hours` hours per action type."""
+    hours = max(1, min(hours, histogram.MAX_HOURS))
+    prefixes = {
+        SERIES_PREFIX.format(org_id=org_id, action=action): action
+        for action in action_types
+    }
+    summaries = histogram.summarize(list(prefixes), hours=hours)
+    return {
+        "hours": hours,
+        "slow_action_ms": settings.AUTOMATION_SLOW_ACTION_MS,
+        "actions": {prefixes[prefix]: summary for prefix, summary in summaries.items()},
+    }
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:15
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automations', '0002_outbox'),
+        ('organizations', '0011_bank_account_org_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutomationLogPolicy',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('unmatched_sample_percent', models.PositiveSmallIntegerField(default=100, help_text='Porcentaje de evaluaciones sin coincidencia que se registran (0 = ninguna).', validators=[django.core.validators.MaxValueValidator(100)])),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='automation_log_policy', to='organizations.organization')),
+            ],
+            options={
+                'verbose_name_plural': 'automation log policies',
+            },
+        ),
+    ]
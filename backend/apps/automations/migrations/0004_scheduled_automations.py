@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automations', '0003_automation_log_policy'),
+        ('organizations', '0011_bank_account_org_level'),
+        ('reservations', '0006_reservationnight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='automationrule',
+            name='schedule',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='outboxevent',
+            name='rule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='automations.automationrule'),
+        ),
+        migrations.AlterField(
+            model_name='automationrule',
+            name='trigger',
+            field=models.CharField(choices=[('reservation.created', 'Reserva creada'), ('reservation.confirmed', 'Reserva confirmada'), ('reservation.check_in', 'Check-in'), ('reservation.check_out', 'Check-out'), ('reservation.cancelled', 'Reserva cancelada'), ('reservation.no_show', 'No-show'), ('payment.received', 'Pago recibido'), ('room.status_changed', 'Cambio estado habitación'), ('task.completed', 'Tarea completada'), ('guest.created', 'Huésped creado'), ('schedule.before_payment_deadline', 'Antes del plazo de pago'), ('schedule.before_check_in', 'Antes del check-in'), ('schedule.stay_over_daily', 'Cada mañana de estadía')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='ScheduledAutomation',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('due_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('done', 'Enviado')], default='pending', max_length=10)),
+                ('claimed_by', models.CharField(blank=True, default='', max_length=64)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_automations', to='organizations.organization')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_automations', to='reservations.reservation')),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled', to='automations.automationrule')),
+            ],
+            options={
+                'ordering': ['due_at'],
+                'indexes': [models.Index(fields=['status', 'due_at'], name='automations_status_5bd098_idx'), models.Index(fields=['reservation', 'status'], name='automations_reserva_865ea0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('rule', 'reservation', 'due_at'), name='scheduled_automation_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automations', '0004_scheduled_automations'),
+        ('organizations', '0011_bank_account_org_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutomationRuleVersion',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='automation_rule_version', serialize=False, to='organizations.organization')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
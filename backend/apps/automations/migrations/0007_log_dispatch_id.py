@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automations', '0006_outbox_done_actions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='automationlog',
+            name='dispatch_id',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
+from django.core.validators import MaxValueValidator
 from django.db import models
+from django.utils import timezone
 
-from apps.common.models import TenantModel
+from apps.common.models import BaseModel, TenantModel
 
 
 class AutomationRule(TenantModel):
@@ -8,6 +10,9 @@ class AutomationRule(TenantModel):
     Event-driven rule: WHEN trigger IF conditions THEN actions.
 
     trigger: event name (e.g. "reservation.check_out", "task.completed")
+             or time-based "schedule.*" trigger
+    schedule: timing of schedule.* triggers, e.g. {"minutes_before": 120}
+              or {"time": "08:00"} (see apps/automations/scheduling.py)
     conditions: JSON list of condition objects to evaluate
     actions: JSON list of action objects to execute
     """
@@ -23,12 +28,17 @@ class AutomationRule(TenantModel):
         ROOM_STATUS_CHANGED = "room.status_changed", "Cambio estado habitación"
         TASK_COMPLETED = "task.completed", "Tarea completada"
         GUEST_CREATED = "guest.created", "Huésped creado"
+        # Time-based triggers, materialized into ScheduledAutomation
+        BEFORE_PAYMENT_DEADLINE = "schedule.before_payment_deadline", "Antes del plazo de pago"
+        BEFORE_CHECK_IN = "schedule.before_check_in", "Antes del check-in"
+        STAY_OVER_DAILY = "schedule.stay_over_daily", "Cada mañana de estadía"
 
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, default="")
     trigger = models.CharField(max_length=50, choices=Trigger.choices)
     conditions = models.JSONField(default=list, blank=True)
     actions = models.JSONField(default=list)
+    schedule = models.JSONField(default=dict, blank=True)
     priority = models.PositiveSmallIntegerField(default=10)
     is_active = models.BooleanField(default=True)
     is_system = models.BooleanField(
@@ -42,6 +52,10 @@ class AutomationRule(TenantModel):
     def __str__(self):
         return self.name
 
+    @property
+    def is_scheduled(self):
+        return self.trigger.startswith("schedule.")
+
 
 class AutomationLog(TenantModel):
     """Log of every automation rule execution."""
@@ -59,6 +73,8 @@ class AutomationLog(TenantModel):
     actions_executed = models.JSONField(default=list)
     success = models.BooleanField(default=True)
     error_message = models.TextField(blank=True, default="")
+    # Shared by the logs of one dispatch of an event
+    dispatch_id = models.UUIDField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
@@ -66,3 +82,153 @@ class AutomationLog(TenantModel):
     def __str__(self):
         status = "OK" if self.success else "ERROR"
         return f"[{status}] {self.rule_name} — {self.trigger}"
+
+
+class AutomationLogPolicy(BaseModel):
+    """Per-organization AutomationLog volume for rules whose conditions failed."""
+
+    organization = models.OneToOneField(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="automation_log_policy",
+    )
+    unmatched_sample_percent = models.PositiveSmallIntegerField(
+        default=100,
+        validators=[MaxValueValidator(100)],
+        help_text="Porcentaje de evaluaciones sin coincidencia que se registran (0 = ninguna).",
+    )
+
+    class Meta:
+        verbose_name_plural = "automation log policies"
+
+    def __str__(self):
+        return f"Log policy {self.organization} ({self.unmatched_sample_percent}%)"
+
+
+class AutomationRuleVersion(models.Model):
+    """
+    Per-organization counter bumped on every AutomationRule or
+    AutomationLogPolicy write. Cached rules are keyed by it (see cache.py);
+    it lives in the database so web and worker processes agree on it
+    whatever the cache backend.
+    """
+
+    organization = models.OneToOneField(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="automation_rule_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Rules {self.organization_id} v{self.version}"
+
+
+class ScheduledAutomation(models.Model):
+    """
+    Due instance of a time-based rule for one reservation.
+
+    Rows are written when the reservation or the rule changes (see
+    apps/automations/scheduling.py) and handed to the outbox by
+    `manage.py run_automation_scheduler` once due_at passes.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pendiente"
+        DONE = "done", "Enviado"
+
+    id = models.BigAutoField(primary_key=True)
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="scheduled_automations",
+    )
+    rule = models.ForeignKey(
+        AutomationRule,
+        on_delete=models.CASCADE,
+        related_name="scheduled",
+    )
+    reservation = models.ForeignKey(
+        "reservations.Reservation",
+        on_delete=models.CASCADE,
+        related_name="scheduled_automations",
+    )
+    due_at = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    claimed_by = models.CharField(max_length=64, blank=True, default="")
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["due_at"]
+        indexes = [
+            models.Index(fields=["status", "due_at"]),
+            models.Index(fields=["reservation", "status"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rule", "reservation", "due_at"],
+                name="scheduled_automation_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.rule_id} | {self.reservation_id} @ {self.due_at} [{self.status}]"
+
+
+class OutboxEvent(models.Model):
+    """
+    Automation event written in the same transaction as the state change
+    that produced it, dispatched later by `manage.py run_automation_worker`.
+
+    context holds model ids ({"reservation": "<uuid>", "user": 3, ...});
+    the worker reloads the objects before dispatching. Events of the same
+    entity are dispatched in id order.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pendiente"
+        PROCESSING = "processing", "Procesando"
+        DONE = "done", "Procesado"
+        FAILED = "failed", "Fallido"
+
+    id = models.BigAutoField(primary_key=True)
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="automation_outbox",
+    )
+    trigger = models.CharField(max_length=50)
+    # Set for scheduled rules: only this rule is dispatched
+    rule = models.ForeignKey(
+        AutomationRule,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    entity_type = models.CharField(max_length=50)
+    entity_id = models.CharField(max_length=64)
+    context = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # "<rule id>:<action index>" of actions that succeeded on a failed
+    # attempt; retries skip them
+    done_actions = models.JSONField(default=list, blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_by = models.CharField(max_length=64, blank=True, default="")
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+            models.Index(fields=["entity_type", "entity_id", "status"]),
+            models.Index(fields=["claimed_by"]),
+        ]
+
+    def __str__(self):
+        return f"{self.trigger} {self.entity_type}:{self.entity_id} [{self.status}]"
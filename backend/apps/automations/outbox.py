@@ -0,0 +1,314 @@
+"""
+Transactional outbox for automation events.
+
+Views call enqueue_event() inside the transaction of the state change, so
+the event exists if and only if the change committed. `manage.py
+run_automation_worker` claims pending events and runs dispatch_event for
+them in a thread pool:
+
+- claims are made by an UPDATE tagging rows with a per-batch token, which
+  works the same on MySQL and SQLite;
+- only the oldest unfinished event of each entity is claimable, so events
+  of one reservation are dispatched in order;
+- a claim is a lease: events of a worker that died go back to pending
+  when locked_until passes, so delivery is at-least-once;
+- failures, including failed actions, are retried with exponential
+  backoff up to AUTOMATION_OUTBOX_MAX_ATTEMPTS, then left as failed.
+  Actions that succeeded are recorded in done_actions and skipped on the
+  retry; create_task is also keyed by (event, rule, action index) so a
+  redelivery after a lost lease does not duplicate the task.
+
+With AUTOMATION_DISPATCH_MODE=sync, enqueue_event dispatches at once,
+inside the caller's transaction, so the actions' writes (tasks, room
+status, invoice drafts) commit with the state change or not at all and
+dispatch needs no worker. Actions only write to the database (invoices
+are sent by run_billing_worker), so this does not hold the transaction
+on a remote call. A rule whose actions failed gets an outbox event
+retrying them, dispatched by the next `run_automation_worker` run.
+
+Batch jobs call enqueue_events_bulk() in their transaction, in either
+mode, and drain_bulk() after the commit, which dispatches the events with
+dispatch_events_bulk. Events left pending by a job that died are drained
+by its next run, or by the worker when it is running.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .bulk import dispatch_events_bulk
+from .dispatcher import ActionsFailed, dispatch_event
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_MODELS = {
+    "reservation": "reservations.Reservation",
+    "room": "rooms.Room",
+    "guest": "guests.Guest",
+    "property": "organizations.Property",
+    "task": "tasks.Task",
+    "user": settings.AUTH_USER_MODEL,
+}
+# First context key present identifies the entity used for ordering
+ENTITY_KEYS = ["reservation", "task", "room", "guest"]
+
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+
+
+def enqueue_event(trigger, organization, context):
+    """Record an automation event; call inside the state-change transaction."""
+    if settings.AUTOMATION_DISPATCH_MODE == "sync":
+        for result in dispatch_event(trigger, organization, context):
+            if not result["success"]:
+                _enqueue_retry(trigger, organization, context, result)
+        return None
+    event = _build_event(trigger, organization, context)
+    event.save()
+    return event
+
+
+def _enqueue_retry(trigger, organization, context, result):
+    """Outbox event retrying the failed actions of one rule of a sync dispatch."""
+    rule_id = result["rule_id"]
+    event = _build_event(trigger, organization, context)
+    event.rule_id = rule_id
+    event.done_actions = [
+        f"{rule_id}:{index}"
+        for index, action in enumerate(result["actions"])
+        if action.get("success")
+    ]
+    event.available_at = timezone.now() + timedelta(seconds=RETRY_BASE_SECONDS)
+    event.save()
+
+
+def enqueue_events_bulk(trigger, organization, contexts):
+    """
+    Record one event per context with bulk inserts, whatever the dispatch
+    mode; call inside the transaction of the changes and drain_bulk() after it.
+    """
+    return OutboxEvent.objects.bulk_create(
+        [_build_event(trigger, organization, context) for context in contexts],
+        batch_size=1000,
+    )
+
+
+def _build_event(trigger, organization, context):
+    ids = {
+        key: str(obj.pk) if obj is not None else None
+        for key, obj in context.items()
+        if key in CONTEXT_MODELS
+    }
+    entity_type = next((key for key in ENTITY_KEYS if ids.get(key)), "organization")
+    return OutboxEvent(
+        organization=organization,
+        trigger=trigger,
+        entity_type=entity_type,
+        entity_id=ids.get(entity_type) or str(organization.pk),
+        context=ids,
+    )
+
+
+def load_context(event):
+    """Reload the objects referenced by an outbox event."""
+    context = {}
+    for key, pk in event.context.items():
+        if key not in CONTEXT_MODELS:
+            continue
+        model = apps.get_model(CONTEXT_MODELS[key])
+        context[key] = model.objects.filter(pk=pk).first() if pk else None
+    return context
+
+
+def load_contexts(events):
+    """load_context for many events, with one query per context key."""
+    wanted = defaultdict(set)
+    for event in events:
+        for key, pk in event.context.items():
+            if key in CONTEXT_MODELS and pk:
+                wanted[key].add(pk)
+    loaded = {}
+    for key, pks in wanted.items():
+        # Context ids are strings; in_bulk keys are typed
+        objects = apps.get_model(CONTEXT_MODELS[key]).objects.in_bulk(pks)
+        loaded[key] = {str(pk): obj for pk, obj in objects.items()}
+    return [
+        {
+            key: loaded[key].get(pk) if pk else None
+            for key, pk in event.context.items()
+            if key in CONTEXT_MODELS
+        }
+        for event in events
+    ]
+
+
+def claim_batch(worker_id, limit):
+    """Claim up to `limit` dispatchable events for this worker."""
+    now = timezone.now()
+    # Leases of workers that died go back to the queue
+    OutboxEvent.objects.filter(
+        status=OutboxEvent.Status.PROCESSING,
+        locked_until__lt=now,
+    ).update(status=OutboxEvent.Status.PENDING, claimed_by="", locked_until=None)
+
+    candidates = list(
+        OutboxEvent.objects.filter(
+            status=OutboxEvent.Status.PENDING,
+            available_at__lte=now,
+        ).order_by("id").values_list("id", "entity_type", "entity_id")[:limit * 4]
+    )
+    return _claim(worker_id, candidates, limit, now)
+
+
+def _claim(worker_id, candidates, limit, now):
+    """Claim the candidates that are the oldest unfinished event of their entity."""
+    if not candidates:
+        return []
+
+    heads = {
+        (entity_type, entity_id): first
+        for entity_type, entity_id, first in OutboxEvent.objects.filter(
+            entity_id__in={entity_id for _, _, entity_id in candidates},
+            status__in=[OutboxEvent.Status.PENDING, OutboxEvent.Status.PROCESSING],
+        ).values_list("entity_type", "entity_id").annotate(first=Min("id"))
+    }
+    eligible = [
+        pk for pk, entity_type, entity_id in candidates
+        if heads.get((entity_type, entity_id)) == pk
+    ][:limit]
+    if not eligible:
+        return []
+
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    OutboxEvent.objects.filter(
+        id__in=eligible,
+        status=OutboxEvent.Status.PENDING,
+    ).update(
+        status=OutboxEvent.Status.PROCESSING,
+        claimed_by=token,
+        locked_until=now + timedelta(seconds=settings.AUTOMATION_OUTBOX_LEASE_SECONDS),
+        attempts=F("attempts") + 1,
+    )
+    return list(
+        OutboxEvent.objects.filter(claimed_by=token, status=OutboxEvent.Status.PROCESSING)
+        .select_related("organization")
+        .order_by("id")
+    )
+
+
+def dispatch_outbox_event(event):
+    """
+    Run dispatch_event for an outbox event (only its rule, if set).
+    Saved events raise ActionsFailed when an action fails.
+    """
+    rule_ids = {event.rule_id} if event.rule_id else None
+    return dispatch_event(
+        event.trigger, event.organization, load_context(event), rule_ids=rule_ids,
+        event_key=f"outbox:{event.pk}" if event.pk else None,
+        done_actions=set(event.done_actions),
+    )
+
+
+def drain_bulk(trigger, worker_id, limit=1000):
+    """
+    Claim the pending events of `trigger` and dispatch them with
+    dispatch_events_bulk, per organization. Returns the number dispatched.
+    Events claimed by the worker are left to it; when a bulk dispatch
+    raises, its events are retried like any failed event.
+    """
+    dispatched = 0
+    while True:
+        now = timezone.now()
+        candidates = list(
+            OutboxEvent.objects.filter(
+                status=OutboxEvent.Status.PENDING,
+                trigger=trigger,
+                rule__isnull=True,
+                available_at__lte=now,
+            ).order_by("id").values_list("id", "entity_type", "entity_id")[:limit]
+        )
+        events = _claim(worker_id, candidates, limit, now)
+        if not events:
+            return dispatched
+
+        by_org = defaultdict(list)
+        for event in events:
+            by_org[event.organization_id].append(event)
+        for org_events in by_org.values():
+            try:
+                dispatch_events_bulk(trigger, org_events[0].organization, load_contexts(org_events))
+            except Exception as exc:
+                logger.exception(f"Bulk dispatch of {len(org_events)} {trigger} event(s) failed")
+                for event in org_events:
+                    _record_failure(event, exc)
+                continue
+            OutboxEvent.objects.filter(
+                pk__in=[event.pk for event in org_events],
+                claimed_by=org_events[0].claimed_by,
+            ).update(
+                status=OutboxEvent.Status.DONE,
+                processed_at=timezone.now(),
+                locked_until=None,
+                last_error="",
+            )
+            dispatched += len(org_events)
+
+
+def process_event(event):
+    """Dispatch one claimed event and record the outcome. Returns success."""
+    close_old_connections()
+    try:
+        dispatch_outbox_event(event)
+    except ActionsFailed as exc:
+        logger.warning(f"Outbox event {event.pk} ({event.trigger}): actions failed: {exc}")
+        _record_failure(event, exc, done_actions=event.done_actions + exc.completed)
+        return False
+    except Exception as exc:
+        logger.exception(f"Outbox event {event.pk} ({event.trigger}) failed")
+        _record_failure(event, exc)
+        return False
+    else:
+        OutboxEvent.objects.filter(pk=event.pk, claimed_by=event.claimed_by).update(
+            status=OutboxEvent.Status.DONE,
+            processed_at=timezone.now(),
+            locked_until=None,
+            last_error="",
+        )
+        return True
+    finally:
+        close_old_connections()
+
+
+def _record_failure(event, exc, done_actions=None):
+    if event.attempts >= settings.AUTOMATION_OUTBOX_MAX_ATTEMPTS:
+        status, delay = OutboxEvent.Status.FAILED, 0
+    else:
+        status = OutboxEvent.Status.PENDING
+        delay = min(RETRY_BASE_SECONDS * 2 ** (event.attempts - 1), RETRY_MAX_SECONDS)
+    fields = {}
+    if done_actions is not None:
+        fields["done_actions"] = done_actions
+    OutboxEvent.objects.filter(pk=event.pk, claimed_by=event.claimed_by).update(
+        status=status,
+        available_at=timezone.now() + timedelta(seconds=delay),
+        locked_until=None,
+        last_error=f"{type(exc).__name__}: {exc}"[:2000],
+        **fields,
+    )
+
+
+def purge_done(days):
+    """Delete events dispatched more than `days` days ago."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboxEvent.objects.filter(
+        status=OutboxEvent.Status.DONE,
+        processed_at__lt=cutoff,
+    ).delete()
+    return deleted
@@ -0,0 +1,290 @@
+"""
+Time-based automation rules.
+
+A schedule.* rule has one due instance (ScheduledAutomation row) per
+reservation and moment it applies to:
+
+    schedule.before_payment_deadline  {"minutes_before": 120}
+        payment_deadline minus the offset, while incomplete or pending
+    schedule.before_check_in          {"minutes_before": 1440}
+        arrival day at the property's check_in_time (organization time
+        zone) minus the offset, while incomplete, pending or confirmed
+    schedule.stay_over_daily          {"time": "08:00"}
+        every morning between arrival and departure day, while
+        confirmed or checked in
+
+Instances are recomputed when a reservation is saved and when a rule is
+saved (see signals.py), never by scanning reservations on a timer.
+`manage.py run_automation_scheduler` claims due rows by the (status,
+due_at) index and, in the same transaction, turns them into OutboxEvents
+that dispatch only their rule, so retries and per-reservation ordering
+come from the outbox worker.
+"""
+import uuid
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import get_active_rules
+from .models import AutomationRule, OutboxEvent, ScheduledAutomation
+from .outbox import dispatch_outbox_event
+
+Trigger = AutomationRule.Trigger
+
+ACTIVE_STATUSES = {
+    Trigger.BEFORE_PAYMENT_DEADLINE: {"incomplete", "pending"},
+    Trigger.BEFORE_CHECK_IN: {"incomplete", "pending", "confirmed"},
+    Trigger.STAY_OVER_DAILY: {"confirmed", "check_in"},
+}
+SCHEDULE_TRIGGERS = list(ACTIVE_STATUSES)
+
+# Reservation fields that move or cancel due instances
+SOURCE_FIELDS = {
+    "operational_status", "payment_deadline", "check_in_date", "check_out_date", "property",
+}
+RESERVATION_VALUES = [
+    "id", "organization_id", "operational_status", "payment_deadline",
+    "check_in_date", "check_out_date", "property__check_in_time",
+]
+MAX_STAY_NIGHTS = 60
+MAX_OFFSET_MINUTES = 60 * 24 * 30
+
+
+def validate_schedule(trigger, schedule):
+    """Return the cleaned schedule for a trigger; raises ValueError."""
+    if trigger not in ACTIVE_STATUSES:
+        return {}
+    if not isinstance(schedule, dict):
+        raise ValueError("Debe ser un objeto.")
+    if trigger == Trigger.STAY_OVER_DAILY:
+        try:
+            at = datetime.strptime(str(schedule.get("time", "")), "%H:%M").time()
+        except ValueError:
+            raise ValueError('Se requiere "time" con formato HH:MM.') from None
+        return {"time": at.strftime("%H:%M")}
+    minutes = schedule.get("minutes_before")
+    if isinstance(minutes, bool) or not isinstance(minutes, int) or not 0 <= minutes <= MAX_OFFSET_MINUTES:
+        raise ValueError(f'Se requiere "minutes_before" entre 0 y {MAX_OFFSET_MINUTES}.')
+    return {"minutes_before": minutes}
+
+
+def _clean_schedule(trigger, schedule):
+    try:
+        return validate_schedule(trigger, schedule)
+    except ValueError:
+        return None
+
+
+def organization_tz(organization):
+    try:
+        return ZoneInfo(organization.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.get_default_timezone()
+
+
+def instance_times(trigger, schedule, row, tz):
+    """Due datetimes of a rule for a reservation (RESERVATION_VALUES dict)."""
+    if row["operational_status"] not in ACTIVE_STATUSES.get(trigger, ()):
+        return []
+    if trigger == Trigger.STAY_OVER_DAILY:
+        at = time.fromisoformat(schedule["time"])
+        first = row["check_in_date"] + timedelta(days=1)
+        nights = min((row["check_out_date"] - first).days, MAX_STAY_NIGHTS)
+        return [
+            datetime.combine(first + timedelta(days=offset), at, tzinfo=tz)
+            for offset in range(max(nights, 0))
+        ]
+
+    offset = timedelta(minutes=schedule["minutes_before"])
+    if trigger == Trigger.BEFORE_PAYMENT_DEADLINE:
+        deadline = row["payment_deadline"]
+        return [deadline - offset] if deadline else []
+
+    check_in_time = row["property__check_in_time"]
+    if isinstance(check_in_time, str):
+        check_in_time = time.fromisoformat(check_in_time)
+    return [datetime.combine(row["check_in_date"], check_in_time, tzinfo=tz) - offset]
+
+
+def _sync(existing, desired, build, now):
+    """
+    Delete pending rows no longer desired and create the missing future
+    ones. existing: {key: row id}; desired: set of keys.
+    """
+    stale = [pk for key, pk in existing.items() if key not in desired]
+    if stale:
+        ScheduledAutomation.objects.filter(pk__in=stale, status=ScheduledAutomation.Status.PENDING).delete()
+    missing = [build(key) for key in desired if key not in existing and key[-1] > now]
+    # Conflicts are instances already handed off (done): not re-created
+    ScheduledAutomation.objects.bulk_create(missing, batch_size=1000, ignore_conflicts=True)
+    return len(missing), len(stale)
+
+
+def sync_reservation(reservation):
+    """Recompute the pending instances of one reservation."""
+    org_id = reservation.organization_id
+    rules = [rule for trigger in SCHEDULE_TRIGGERS for rule in get_active_rules(org_id, trigger)]
+    if not rules:
+        # Deactivating or deleting a rule already removed its pending rows
+        return
+    existing = {
+        (rule_id, due_at): pk
+        for pk, rule_id, due_at in ScheduledAutomation.objects.filter(
+            reservation_id=reservation.pk,
+            status=ScheduledAutomation.Status.PENDING,
+        ).values_list("id", "rule_id", "due_at")
+    }
+    row = {
+        "operational_status": reservation.operational_status,
+        "payment_deadline": reservation.payment_deadline,
+        "check_in_date": reservation.check_in_date,
+        "check_out_date": reservation.check_out_date,
+        "property__check_in_time": reservation.property.check_in_time,
+    }
+    tz = organization_tz(reservation.organization)
+    desired = set()
+    for rule in rules:
+        schedule = _clean_schedule(rule.trigger, rule.schedule)
+        if schedule is not None:
+            desired.update((rule.id, due) for due in instance_times(rule.trigger, schedule, row, tz))
+
+    _sync(
+        existing,
+        desired,
+        lambda key: ScheduledAutomation(
+            organization_id=org_id, rule_id=key[0], reservation_id=reservation.pk, due_at=key[1],
+        ),
+        timezone.now(),
+    )
+
+
+def sync_rule(rule_id):
+    """
+    Recompute the pending instances of one rule across the organization's
+    open reservations. Runs when the rule is saved.
+    """
+    rule = AutomationRule.objects.filter(pk=rule_id).select_related("organization").first()
+    pending = ScheduledAutomation.objects.filter(rule_id=rule_id, status=ScheduledAutomation.Status.PENDING)
+    schedule = _clean_schedule(rule.trigger, rule.schedule) if rule else None
+    if not rule or not rule.is_active or rule.trigger not in ACTIVE_STATUSES or schedule is None:
+        return 0, pending.delete()[0]
+
+    from apps.reservations.models import Reservation
+
+    existing = {
+        (reservation_id, due_at): pk
+        for pk, reservation_id, due_at in pending.values_list("id", "reservation_id", "due_at")
+    }
+    tz = organization_tz(rule.organization)
+    rows = Reservation.objects.filter(
+        organization_id=rule.organization_id,
+        operational_status__in=ACTIVE_STATUSES[rule.trigger],
+        check_out_date__gte=timezone.localdate() - timedelta(days=1),
+    ).values(*RESERVATION_VALUES)
+
+    desired = set()
+    for row in rows.iterator(chunk_size=2000):
+        desired.update((row["id"], due) for due in instance_times(rule.trigger, schedule, row, tz))
+
+    return _sync(
+        existing,
+        desired,
+        lambda key: ScheduledAutomation(
+            organization_id=rule.organization_id, rule_id=rule.pk, reservation_id=key[0], due_at=key[1],
+        ),
+        timezone.now(),
+    )
+
+
+def cancel_pending(reservation_ids):
+    """Drop pending instances of reservations changed with queryset.update()."""
+    return ScheduledAutomation.objects.filter(
+        reservation_id__in=reservation_ids,
+        status=ScheduledAutomation.Status.PENDING,
+    ).delete()[0]
+
+
+def hand_off_due(worker_id, limit):
+    """
+    Claim up to `limit` due instances and enqueue them in the outbox.
+    Returns the number handed off.
+    """
+    from apps.reservations.models import Reservation
+
+    now = timezone.now()
+    sync_mode = settings.AUTOMATION_DISPATCH_MODE == "sync"
+    with transaction.atomic():
+        due = ScheduledAutomation.objects.filter(
+            status=ScheduledAutomation.Status.PENDING,
+            due_at__lte=now,
+        ).order_by("due_at")
+        if connection.features.has_select_for_update_skip_locked:
+            rows = list(due.select_for_update(skip_locked=True)[:limit])
+        else:
+            # Claim by update (SQLite): only rows nobody else tagged
+            token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+            ids = list(due.values_list("id", flat=True)[:limit])
+            ScheduledAutomation.objects.filter(
+                id__in=ids,
+                status=ScheduledAutomation.Status.PENDING,
+                claimed_by="",
+            ).update(claimed_by=token)
+            rows = list(ScheduledAutomation.objects.filter(
+                claimed_by=token, status=ScheduledAutomation.Status.PENDING,
+            ))
+        if not rows:
+            return 0
+
+        triggers = dict(
+            AutomationRule.objects.filter(id__in={row.rule_id for row in rows})
+            .values_list("id", "trigger")
+        )
+        reservations = {
+            values["id"]: values
+            for values in Reservation.objects.filter(
+                id__in={row.reservation_id for row in rows},
+            ).values("id", "room_id", "guest_id", "property_id")
+        }
+        events = []
+        for row in rows:
+            values = reservations.get(row.reservation_id)
+            if values is None or row.rule_id not in triggers:
+                continue
+            events.append(OutboxEvent(
+                organization_id=row.organization_id,
+                trigger=triggers[row.rule_id],
+                rule_id=row.rule_id,
+                entity_type="reservation",
+                entity_id=str(row.reservation_id),
+                context={
+                    "reservation": str(values["id"]),
+                    "room": str(values["room_id"]) if values["room_id"] else None,
+                    "guest": str(values["guest_id"]),
+                    "property": str(values["property_id"]),
+                },
+            ))
+        if not sync_mode:
+            OutboxEvent.objects.bulk_create(events, batch_size=1000)
+        ScheduledAutomation.objects.filter(id__in=[row.id for row in rows]).update(
+            status=ScheduledAutomation.Status.DONE,
+            processed_at=now,
+        )
+        if sync_mode:
+            transaction.on_commit(lambda: _dispatch_now(events))
+    return len(rows)
+
+
+def _dispatch_now(events):
+    for event in events:
+        dispatch_outbox_event(event)
+
+
+def purge_done(days):
+    cutoff = timezone.now() - timedelta(days=days)
+    return ScheduledAutomation.objects.filter(
+        status=ScheduledAutomation.Status.DONE,
+        processed_at__lt=cutoff,
+    ).delete()[0]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .models import AutomationLog, AutomationRule
+from .scheduling import validate_schedule
 
 
 class AutomationRuleSerializer(serializers.ModelSerializer):
@@ -8,12 +9,21 @@ class AutomationRuleSerializer(serializers.ModelSerializer):
         model = AutomationRule
         fields = [
             "id", "name", "description",
-            "trigger", "conditions", "actions",
+            "trigger", "conditions", "actions", "schedule",
             "priority", "is_active", "is_system",
             "created_at", "updated_at",
         ]
         read_only_fields = ["id", "is_system", "created_at", "updated_at"]
 
+    def validate(self, attrs):
+        trigger = attrs.get("trigger", getattr(self.instance, "trigger", ""))
+        schedule = attrs.get("schedule", getattr(self.instance, "schedule", {}))
+        try:
+            attrs["schedule"] = validate_schedule(trigger, schedule)
+        except ValueError as exc:
+            raise serializers.ValidationError({"schedule": [str(exc)]})
+        return attrs
+
 
 class AutomationLogSerializer(serializers.ModelSerializer):
     class Meta:
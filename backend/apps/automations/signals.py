@@ -0,0 +1,43 @@
+"""
+Bump the organization's rule version whenever an AutomationRule or its
+AutomationLogPolicy is written, so the dispatcher stops using its cached
+rules. The bump runs on commit so a concurrent dispatch cannot cache
+pre-commit rules under the new version.
+
+Reservation and rule writes also recompute the due instances of
+time-based rules (see scheduling.py), after the bump.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.reservations.models import Reservation
+
+from .cache import bump_rules_version
+from .models import AutomationLogPolicy, AutomationRule
+from .scheduling import SOURCE_FIELDS, sync_reservation, sync_rule
+
+
+@receiver([post_save, post_delete], sender=AutomationRule)
+@receiver([post_save, post_delete], sender=AutomationLogPolicy)
+def bump_on_rule_write(sender, instance, **kwargs):
+    org_id = instance.organization_id
+    if org_id:
+        transaction.on_commit(lambda: bump_rules_version(org_id))
+
+
+@receiver(post_save, sender=AutomationRule)
+def schedule_on_rule_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    rule_id = instance.pk
+    transaction.on_commit(lambda: sync_rule(rule_id))
+
+
+@receiver(post_save, sender=Reservation)
+def schedule_on_reservation_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & SOURCE_FIELDS:
+        return
+    transaction.on_commit(lambda: sync_reservation(instance))
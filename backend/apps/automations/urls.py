@@ -1,9 +1,12 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import AutomationLogViewSet, AutomationRuleViewSet
+from .views import AutomationLogViewSet, AutomationMetricsView, AutomationRuleViewSet
 
 router = DefaultRouter()
 router.register("rules", AutomationRuleViewSet, basename="automation-rule")
 router.register("logs", AutomationLogViewSet, basename="automation-log")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("metrics/", AutomationMetricsView.as_view(), name="automation-metrics"),
+] + router.urls
@@ -1,11 +1,21 @@
-from rest_framework import mixins, viewsets
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.common.mixins import TenantQuerySetMixin
 from apps.common.permissions import IsOwnerOrManager
 
+from .actions import ACTION_REGISTRY
+from .metrics import get_action_metrics
 from .models import AutomationLog, AutomationRule
 from .serializers import AutomationLogSerializer, AutomationRuleSerializer
+from .simulation import can_simulate, simulate_rule
+
+SIMULATE_MAX_DAYS = 366
 
 
 class AutomationRuleViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
@@ -20,6 +30,64 @@ class AutomationRuleViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
             raise PermissionDenied("Las reglas del sistema no pueden eliminarse. Desactívela en su lugar.")
         instance.delete()
 
+    @action(detail=True, methods=["post"], url_path="simulate")
+    def simulate(self, request, pk=None):
+        """
+        POST /automations/rules/<id>/simulate/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        Replays the rule's past triggers through its conditions without
+        executing actions. Body may carry {"conditions": [...]} to try a
+        draft before saving it. Default range: last 30 days.
+        """
+        rule = self.get_object()
+        if not can_simulate(rule.trigger):
+            return Response(
+                {"detail": f"El trigger {rule.trigger} no se puede simular."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = request.query_params
+        today = timezone.localdate()
+        try:
+            start = date.fromisoformat(params["from"]) if params.get("from") else today - timedelta(days=29)
+            end = date.fromisoformat(params["to"]) if params.get("to") else today
+        except ValueError:
+            return Response(
+                {"detail": "Formato de fecha inválido. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end < start:
+            return Response(
+                {"detail": "to debe ser posterior a from."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (end - start).days + 1 > SIMULATE_MAX_DAYS:
+            return Response(
+                {"detail": f"El rango máximo es de {SIMULATE_MAX_DAYS} días."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        conditions = request.data.get("conditions", rule.conditions)
+        if not isinstance(conditions, list) or not all(isinstance(c, dict) for c in conditions):
+            return Response(
+                {"detail": "conditions debe ser una lista de objetos."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result = simulate_rule(
+            request.organization,
+            rule.trigger,
+            conditions,
+            timezone.make_aware(datetime.combine(start, time.min)),
+            timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+        )
+        return Response({
+            "rule": rule.name,
+            "trigger": rule.trigger,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            **result,
+        })
+
 
 class AutomationLogViewSet(
     TenantQuerySetMixin,
@@ -31,3 +99,26 @@ class AutomationLogViewSet(
     queryset = AutomationLog.objects.all()
     permission_classes = [IsOwnerOrManager]
     filterset_fields = ["trigger", "success", "rule"]
+
+
+class AutomationMetricsView(APIView):
+    """
+    GET /api/v1/automations/metrics/?hours=24
+    Count, failures and latency histogram per action type over the last
+    `hours` hours (max 168).
+    """
+    permission_classes = [IsOwnerOrManager]
+
+    def get(self, request):
+        try:
+            hours = int(request.query_params.get("hours", 24))
+        except ValueError:
+            return Response(
+                {"detail": "hours debe ser un número entero."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(get_action_metrics(
+            request.organization.pk,
+            list(ACTION_REGISTRY),
+            hours=hours,
+        ))
@@ -1,6 +1,9 @@
 import logging
 
 import requests
+from django.conf import settings
+
+from apps.common import http
 
 from .base import BaseBillingAdapter
 
@@ -39,7 +42,7 @@ class EfactAdapter(BaseBillingAdapter):
 
     def build_payload(self, invoice, config):
         items = []
-        for item in invoice.items.all().order_by("sort_order"):
+        for item in invoice.items.all():
             entry = {
                 "descripcion": item.description,
                 "cantidad": float(item.quantity),
@@ -114,14 +117,13 @@ class EfactAdapter(BaseBillingAdapter):
         api_key = config["api_key"]
 
         try:
-            response = requests.post(
+            response = http.post(
                 url,
                 json=payload,
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": f"Bearer {api_key}",
                 },
-                timeout=30,
             )
 
             body = {}
@@ -163,7 +165,7 @@ class EfactAdapter(BaseBillingAdapter):
                 "ticket": "",
                 "document_url": "",
                 "raw_response": {},
-                "error": "Request timed out after 30s",
+                "error": f"Request timed out after {settings.HTTP_READ_TIMEOUT:g}s",
             }
         except requests.RequestException as e:
             return {
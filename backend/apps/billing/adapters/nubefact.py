@@ -1,6 +1,9 @@
 import logging
 
 import requests
+from django.conf import settings
+
+from apps.common import http
 
 from .base import BaseBillingAdapter
 
@@ -35,7 +38,7 @@ class NubefactAdapter(BaseBillingAdapter):
 
     def build_payload(self, invoice, config):
         items = []
-        for item in invoice.items.all().order_by("sort_order"):
+        for item in invoice.items.all():
             tipo_igv = "1" if item.tipo_afectacion_igv == "10" else "9"
             items.append({
                 "unidad_de_medida": "ZZ",
@@ -106,14 +109,13 @@ class NubefactAdapter(BaseBillingAdapter):
         api_key = config["api_key"]
 
         try:
-            response = requests.post(
+            response = http.post(
                 url,
                 json=payload,
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": f"Bearer {api_key}",
                 },
-                timeout=30,
             )
 
             body = {}
@@ -155,7 +157,7 @@ class NubefactAdapter(BaseBillingAdapter):
                 "ticket": "",
                 "document_url": "",
                 "raw_response": {},
-                "error": "Request timed out after 30s",
+                "error": f"Request timed out after {settings.HTTP_READ_TIMEOUT:g}s",
             }
         except requests.RequestException as e:
             return {
@@ -1,6 +1,9 @@
 import logging
 
 import requests
+from django.conf import settings
+
+from apps.common import http
 
 from .base import BaseBillingAdapter
 
@@ -15,7 +18,7 @@ class CustomWebhookAdapter(BaseBillingAdapter):
 
     def build_payload(self, invoice, config):
         items = []
-        for item in invoice.items.all().order_by("sort_order"):
+        for item in invoice.items.all():
             items.append({
                 "description": item.description,
                 "quantity": str(item.quantity),
@@ -68,11 +71,10 @@ class CustomWebhookAdapter(BaseBillingAdapter):
             if api_key:
                 headers["Authorization"] = f"Bearer {api_key}"
 
-            response = requests.post(
+            response = http.post(
                 url,
                 json=payload,
                 headers=headers,
-                timeout=30,
             )
 
             body = {}
@@ -113,7 +115,7 @@ class CustomWebhookAdapter(BaseBillingAdapter):
                 "ticket": "",
                 "document_url": "",
                 "raw_response": {},
-                "error": "Webhook timed out after 30s",
+                "error": f"Webhook timed out after {settings.HTTP_READ_TIMEOUT:g}s",
             }
         except requests.RequestException as e:
             return {
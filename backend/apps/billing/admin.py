@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import BillingConfig, Invoice, InvoiceItem, PropertyBillingConfig
+from .models import BillingConfig, Invoice, InvoiceItem, InvoiceSequence, PropertyBillingConfig
 
 
 class InvoiceItemInline(admin.TabularInline):
@@ -39,3 +39,10 @@ class InvoiceAdmin(admin.ModelAdmin):
 @admin.register(InvoiceItem)
 class InvoiceItemAdmin(admin.ModelAdmin):
     list_display = ["invoice", "description", "quantity", "total", "tipo_afectacion_igv"]
+
+
+@admin.register(InvoiceSequence)
+class InvoiceSequenceAdmin(admin.ModelAdmin):
+    list_display = ["organization", "serie", "next_value", "updated_at"]
+    list_filter = ["organization"]
+    search_fields = ["serie"]
@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.billing.models import Invoice, InvoiceSequence
+from apps.organizations.models import Organization
+
+
+def _format(gaps, limit=20):
+    parts = [f"{a}" if a == b else f"{a}-{b}" for a, b in gaps[:limit]]
+    if len(gaps) > limit:
+        parts.append("...")
+    return ", ".join(parts)
+
+
+class Command(BaseCommand):
+    help = "Report gaps in invoice correlativos and sequences out of step with issued invoices"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            help="Only this organization (subdomain)",
+        )
+        parser.add_argument(
+            "--serie",
+            help="Only this serie (e.g. B001)",
+        )
+
+    def handle(self, *args, **options):
+        invoices = Invoice.objects.all()
+        sequences = InvoiceSequence.objects.select_related("organization")
+        if options["organization"]:
+            org = Organization.objects.filter(subdomain=options["organization"]).first()
+            if org is None:
+                raise CommandError(f"Organization '{options['organization']}' not found.")
+            invoices = invoices.filter(organization=org)
+            sequences = sequences.filter(organization=org)
+        if options["serie"]:
+            invoices = invoices.filter(serie=options["serie"])
+            sequences = sequences.filter(serie=options["serie"])
+
+        next_values = {
+            (seq.organization_id, seq.serie): seq.next_value for seq in sequences
+        }
+        org_names = dict(Organization.objects.values_list("id", "name"))
+
+        rows = (
+            invoices.order_by("organization_id", "serie", "correlativo")
+            .values_list("organization_id", "serie", "correlativo")
+            .iterator(chunk_size=5000)
+        )
+        problems = 0
+        key = None
+        expected = 1
+        gaps = []
+
+        def report(key, last):
+            nonlocal problems
+            label = f"{org_names.get(key[0], key[0])} {key[1]}"
+            if gaps:
+                problems += 1
+                missing = sum(b - a + 1 for a, b in gaps)
+                self.stdout.write(
+                    self.style.WARNING(f"{label}: {missing} missing ({_format(gaps)})")
+                )
+            next_value = next_values.pop(key, None)
+            if next_value is None:
+                self.stdout.write(f"{label}: no sequence row (created on next invoice)")
+            elif next_value != last + 1:
+                problems += 1
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{label}: sequence at {next_value}, last invoice is {last}"
+                    )
+                )
+
+        for org_id, serie, correlativo in rows:
+            if (org_id, serie) != key:
+                if key is not None:
+                    report(key, expected - 1)
+                key = (org_id, serie)
+                expected = 1
+                gaps = []
+            if correlativo > expected:
+                gaps.append((expected, correlativo - 1))
+            expected = correlativo + 1
+        if key is not None:
+            report(key, expected - 1)
+
+        # Sequences without invoices should still be at their start value
+        for (org_id, serie), next_value in next_values.items():
+            if next_value != 1:
+                problems += 1
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{org_names.get(org_id, org_id)} {serie}: sequence at "
+                        f"{next_value} but no invoices"
+                    )
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Series with problems: {problems}"))
@@ -0,0 +1,221 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from apps.billing.models import Invoice, InvoiceItem, InvoiceSequence
+from apps.billing.services.config_resolver import resolve_billing_config
+from apps.billing.services.correlativo import allocate_correlativos
+from apps.billing.services.invoice_emitter import emit_invoice
+from apps.billing.services.provider_health import reset_breaker
+from apps.billing.simulator import (
+    PATHS,
+    add_profile_arguments,
+    endpoint_url,
+    profile_from_options,
+    start_in_background,
+)
+from apps.common.models import StateTransitionLog
+from apps.organizations.models import Organization
+
+
+def _percentiles(samples):
+    if not samples:
+        return "n/a"
+    ordered = sorted(samples)
+    pick = lambda fraction: ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+    return (
+        f"p50 {pick(0.50):.0f}  p90 {pick(0.90):.0f}  p95 {pick(0.95):.0f}  "
+        f"p99 {pick(0.99):.0f}  max {ordered[-1]:.0f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Emit N throwaway invoices through emit_invoice against a provider "
+        "simulator and report throughput and latency percentiles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            required=True,
+            help="Organization (subdomain) whose first property issues the invoices",
+        )
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=200,
+            help="Invoices to emit (default: 200)",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.BILLING_WORKER_THREADS,
+            help=f"Invoices emitted in parallel (default: {settings.BILLING_WORKER_THREADS})",
+        )
+        parser.add_argument(
+            "--provider",
+            choices=list(PATHS),
+            default="custom_webhook",
+            help="Adapter to exercise (default: custom_webhook)",
+        )
+        parser.add_argument(
+            "--endpoint",
+            help="api_endpoint of a running simulate_billing_provider; "
+                 "without it a simulator is started in-process with the options below",
+        )
+        parser.add_argument(
+            "--serie",
+            default="Z999",
+            help="Serie used for the benchmark invoices (default: Z999)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark invoices instead of deleting them",
+        )
+        add_profile_arguments(parser)
+
+    def handle(self, *args, **options):
+        org = Organization.objects.filter(subdomain=options["organization"]).first()
+        if org is None:
+            raise CommandError(f"Organization '{options['organization']}' not found.")
+        prop = org.properties.order_by("created_at").first()
+        if prop is None:
+            raise CommandError(f"Organization '{org.name}' has no properties.")
+        serie = options["serie"]
+        if Invoice.objects.filter(organization=org, serie=serie).exclude(
+            cliente_razon_social="Cliente benchmark",
+        ).exists():
+            raise CommandError(f"Serie {serie} has real invoices; choose another --serie.")
+
+        server = None
+        endpoint = options["endpoint"]
+        if not endpoint:
+            profile = profile_from_options(options)
+            server = start_in_background(profile)
+            endpoint = endpoint_url(server, options["provider"])
+            self.stdout.write(f"Simulator on {endpoint} ({profile.describe()})")
+
+        invoices = []
+        try:
+            config = {
+                "ruc": "20000000001",
+                "razon_social": org.name,
+                "direccion_fiscal": "",
+                "configuracion_tributaria": {},
+                **(resolve_billing_config(prop) or {}),
+                "emission_mode": "automatic",
+                "proveedor": options["provider"],
+                "api_endpoint": endpoint,
+                "api_key": "benchmark",
+            }
+            reset_breaker(config)
+
+            invoices = self._create_invoices(org, prop, serie, options["count"])
+            self._run(invoices, config, max(options["threads"], 1))
+        finally:
+            # Also on errors and Ctrl+C: never leave the simulator running or
+            # throwaway invoices behind
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+            if invoices and not options["keep"]:
+                self._cleanup(org, serie, invoices)
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def _run(self, invoices, config, threads):
+        self.stdout.write(
+            f"Emitting {len(invoices)} invoices with {threads} threads "
+            f"(provider limits: {settings.BILLING_PROVIDER_CONCURRENCY} in flight, "
+            f"{settings.BILLING_PROVIDER_RATE_PER_SECOND:g}/s)..."
+        )
+
+        def emit(invoice):
+            close_old_connections()
+            try:
+                start = time.monotonic()
+                result = emit_invoice(invoice, config=config)
+                elapsed_ms = (time.monotonic() - start) * 1000
+                # A failure or a breaker deferral queues the invoice again;
+                # run_billing_worker would then emit it through the
+                # property's real provider, so take it off the queue.
+                Invoice.objects.filter(pk=invoice.pk).update(next_attempt_at=None)
+                return result, elapsed_ms
+            finally:
+                close_old_connections()
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="benchmark") as pool:
+            results = list(pool.map(emit, invoices))
+        elapsed = time.monotonic() - started
+
+        outcomes = {"accepted": 0, "rejected": 0, "error": 0, "deferred": 0}
+        for result, _ in results:
+            if result["success"]:
+                outcomes["accepted"] += 1
+            elif result.get("deferred"):
+                outcomes["deferred"] += 1
+        for status in Invoice.objects.filter(pk__in=[i.pk for i in invoices]).values_list("status", flat=True):
+            if status in ("rejected", "error"):
+                outcomes[status] += 1
+        provider_latencies = list(
+            Invoice.objects.filter(pk__in=[i.pk for i in invoices], provider_latency_ms__isnull=False)
+            .values_list("provider_latency_ms", flat=True)
+        )
+
+        self.stdout.write(
+            f"  {', '.join(f'{name}: {count}' for name, count in outcomes.items())}"
+        )
+        self.stdout.write(f"  throughput: {len(invoices) / elapsed:.1f} invoices/s ({elapsed:.2f}s)")
+        self.stdout.write(f"  emit_invoice: {_percentiles([ms for _, ms in results])}")
+        self.stdout.write(f"  provider:     {_percentiles(provider_latencies)}")
+
+    def _create_invoices(self, org, prop, serie, count):
+        today = timezone.localdate()
+        with transaction.atomic():
+            invoices = Invoice.objects.bulk_create([
+                Invoice(
+                    organization=org,
+                    property=prop,
+                    document_type="boleta",
+                    serie=serie,
+                    correlativo=correlativo,
+                    numero_completo=f"{serie}-{correlativo:08d}",
+                    cliente_tipo_documento="DNI",
+                    cliente_numero_documento="00000000",
+                    cliente_razon_social="Cliente benchmark",
+                    total_gravado=Decimal("100.00"),
+                    total_igv=Decimal("18.00"),
+                    total=Decimal("118.00"),
+                    fecha_emision=today,
+                )
+                for correlativo in allocate_correlativos(org, serie, count)
+            ])
+            InvoiceItem.objects.bulk_create([
+                InvoiceItem(
+                    invoice=invoice,
+                    description="Alojamiento (benchmark)",
+                    quantity=Decimal("1"),
+                    unit_price=Decimal("100.00"),
+                    subtotal=Decimal("100.00"),
+                    igv=Decimal("18.00"),
+                    total=Decimal("118.00"),
+                    sort_order=1,
+                )
+                for invoice in invoices
+            ])
+        return invoices
+
+    def _cleanup(self, org, serie, invoices):
+        ids = [invoice.pk for invoice in invoices]
+        with transaction.atomic():
+            StateTransitionLog.objects.filter(entity_type="Invoice", entity_id__in=ids).delete()
+            Invoice.objects.filter(pk__in=ids).delete()
+            if not Invoice.objects.filter(organization=org, serie=serie).exists():
+                InvoiceSequence.objects.filter(organization=org, serie=serie).delete()
@@ -1,24 +1,31 @@
 import logging
-from datetime import timedelta
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
-from apps.billing.models import Invoice
-from apps.billing.services.invoice_emitter import emit_invoice
+from apps.billing.services.emission_queue import (
+    claim_invoices,
+    interleave_by_provider,
+    process_invoice,
+    release_stale,
+)
+from apps.common.cache import is_shared_cache
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = "Retry invoices in error/rejected status with exponential backoff"
+    help = "Retry invoices in error/rejected status whose backoff has elapsed (one pass)"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--max-retries",
             type=int,
-            default=5,
-            help="Maximum retry count per invoice (default: 5)",
+            default=settings.BILLING_EMISSION_MAX_ATTEMPTS,
+            help=f"Maximum retry count per invoice (default: {settings.BILLING_EMISSION_MAX_ATTEMPTS})",
         )
         parser.add_argument(
             "--batch-size",
@@ -26,33 +33,28 @@ class Command(BaseCommand):
             default=100,
             help="Maximum invoices to process per run (default: 100)",
         )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.BILLING_WORKER_THREADS,
+            help=f"Invoices emitted in parallel (default: {settings.BILLING_WORKER_THREADS})",
+        )
 
     def handle(self, *args, **options):
-        max_retries = options["max_retries"]
-        batch_size = options["batch_size"]
-        now = timezone.now()
+        if not is_shared_cache():
+            # Emission still runs; the breaker then only sees this process's calls
+            self.stderr.write(self.style.WARNING(
+                "The cache is per-process (CACHE_URL=locmemcache://): the provider "
+                "breaker and latencies only track this process's calls. Use a shared "
+                "cache (redis://) when several processes emit invoices."
+            ))
 
-        invoices = (
-            Invoice.objects
-            .filter(
-                status__in=["error", "rejected"],
-                retry_count__lt=max_retries,
-            )
-            .order_by("last_attempt_at")
+        release_stale()
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        eligible = interleave_by_provider(
+            claim_invoices(worker_id, options["batch_size"], options["max_retries"])
         )
 
-        # Filter by individual backoff
-        eligible = []
-        for inv in invoices:
-            backoff_minutes = min(2 ** inv.retry_count * 5, 60)
-            if (
-                not inv.last_attempt_at
-                or inv.last_attempt_at + timedelta(minutes=backoff_minutes) <= now
-            ):
-                eligible.append(inv)
-            if len(eligible) >= batch_size:
-                break
-
         if not eligible:
             self.stdout.write("No invoices eligible for retry.")
             return
@@ -62,19 +64,21 @@ class Command(BaseCommand):
         success_count = 0
         error_count = 0
 
-        for invoice in eligible:
-            self.stdout.write(
-                f"  Retrying {invoice.numero_completo} "
-                f"(attempt {invoice.retry_count + 1})...",
-                ending="",
-            )
-            result = emit_invoice(invoice)
-            if result["success"]:
-                success_count += 1
-                self.stdout.write(" OK")
-            else:
-                error_count += 1
-                self.stdout.write(f" FAIL: {result.get('error', 'unknown')}")
+        with ThreadPoolExecutor(max_workers=max(options["threads"], 1)) as pool:
+            for invoice, result in zip(eligible, pool.map(process_invoice, eligible)):
+                if result["success"]:
+                    success_count += 1
+                    self.stdout.write(f"  {invoice.numero_completo} (attempt {invoice.retry_count}) OK")
+                elif result.get("deferred"):
+                    self.stdout.write(f"  {invoice.numero_completo} DEFERRED: provider unavailable")
+                elif result.get("skipped"):
+                    self.stdout.write(f"  {invoice.numero_completo} SKIPPED: already being emitted")
+                else:
+                    error_count += 1
+                    self.stdout.write(
+                        f"  {invoice.numero_completo} (attempt {invoice.retry_count}) "
+                        f"FAIL: {result.get('error', 'unknown')}"
+                    )
 
         self.stdout.write(
             self.style.SUCCESS(
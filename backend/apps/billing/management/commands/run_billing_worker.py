@@ -0,0 +1,82 @@
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.billing.services.emission_queue import (
+    claim_invoices,
+    interleave_by_provider,
+    process_invoice,
+    release_stale,
+)
+from apps.common.cache import is_shared_cache
+
+
+class Command(BaseCommand):
+    help = "Emit queued invoices through their billing providers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.BILLING_WORKER_THREADS,
+            help=f"Invoices emitted in parallel (default: {settings.BILLING_WORKER_THREADS})",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Invoices claimed per pass (default: 100)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when nothing is due (default: 5)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Emit what is due and exit",
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            # Emission still runs; the breaker then only sees this process's calls
+            self.stderr.write(self.style.WARNING(
+                "The cache is per-process (CACHE_URL=locmemcache://): the provider "
+                "breaker and latencies only track this process's calls. Use a shared "
+                "cache (redis://) when several processes emit invoices."
+            ))
+
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        threads = max(options["threads"], 1)
+        ok = failed = deferred = skipped = 0
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="billing") as pool:
+            while True:
+                released = release_stale()
+                if released:
+                    self.stdout.write(f"Released {released} interrupted invoice(s)")
+
+                batch = interleave_by_provider(claim_invoices(worker_id, options["batch_size"]))
+                for result in pool.map(process_invoice, batch):
+                    if result["success"]:
+                        ok += 1
+                    elif result.get("deferred"):
+                        deferred += 1
+                    elif result.get("skipped"):
+                        skipped += 1
+                    else:
+                        failed += 1
+                if batch:
+                    self.stdout.write(f"Emitted {len(batch)} invoice(s)")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Success: {ok}, Failed: {failed}, Deferred: {deferred}, Skipped: {skipped}"))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from apps.billing.simulator import PATHS, SimulatorServer, add_profile_arguments, profile_from_options
+
+
+class Command(BaseCommand):
+    help = "Run a local stand-in for Nubefact, eFact and webhook billing providers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--host",
+            default="127.0.0.1",
+            help="Address to listen on (default: 127.0.0.1)",
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=8900,
+            help="Port to listen on (default: 8900)",
+        )
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Log every request",
+        )
+        add_profile_arguments(parser)
+
+    def handle(self, *args, **options):
+        profile = profile_from_options(options)
+        server = SimulatorServer((options["host"], options["port"]), profile, verbose=options["verbose"])
+        host, port = server.server_address[:2]
+
+        self.stdout.write(f"Billing provider simulator on http://{host}:{port}/ ({profile.describe()})")
+        for provider, path in PATHS.items():
+            self.stdout.write(f"  {provider}: api_endpoint http://{host}:{port}/{path}/")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+        self.stdout.write("")
+        for (provider, outcome), count in sorted(server.stats.items()):
+            self.stdout.write(f"  {provider} {outcome}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Done. Requests: {sum(server.stats.values())}"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:22
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def seed_sequences(apps, schema_editor):
+    """Start each (organization, serie) sequence after its highest correlativo."""
+    Invoice = apps.get_model("billing", "Invoice")
+    InvoiceSequence = apps.get_model("billing", "InvoiceSequence")
+    last = (
+        Invoice.objects.values("organization_id", "serie")
+        .annotate(last=Max("correlativo"))
+        .order_by()
+    )
+    InvoiceSequence.objects.bulk_create(
+        [
+            InvoiceSequence(
+                organization_id=row["organization_id"],
+                serie=row["serie"],
+                next_value=row["last"] + 1,
+            )
+            for row in last
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0002_invoice_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
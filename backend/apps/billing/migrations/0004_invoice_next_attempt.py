@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:25
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def queue_failed_invoices(apps, schema_editor):
+    """Queue invoices the old retry command would still have retried."""
+    Invoice = apps.get_model("billing", "Invoice")
+    Invoice.objects.filter(
+        status__in=["error", "rejected"],
+        retry_count__lt=5,
+    ).update(next_attempt_at=Coalesce("last_attempt_at", "created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0003_seed_invoice_sequences'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='claimed_by',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['next_attempt_at'], name='invoice_next_attempt_idx'),
+        ),
+        migrations.RunPython(queue_failed_invoices, migrations.RunPython.noop),
+    ]
@@ -176,6 +176,9 @@ class Invoice(TenantModel):
     retry_count = models.PositiveSmallIntegerField(default=0)
     last_error = models.TextField(blank=True, default="")
     last_attempt_at = models.DateTimeField(null=True, blank=True)
+    # Set while the invoice is queued for the emission worker; NULL otherwise
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.CharField(max_length=100, blank=True, default="")
 
     # Otros
     observaciones = models.TextField(blank=True, default="")
@@ -190,6 +193,9 @@ class Invoice(TenantModel):
     class Meta:
         ordering = ["-created_at"]
         unique_together = [("organization", "serie", "correlativo")]
+        indexes = [
+            models.Index(fields=["next_attempt_at"], name="invoice_next_attempt_idx"),
+        ]
 
     def __str__(self):
         return f"{self.numero_completo} — {self.get_document_type_display()}"
@@ -200,6 +206,36 @@ class Invoice(TenantModel):
         super().save(*args, **kwargs)
 
 
+class InvoiceSequence(models.Model):
+    """
+    Next correlativo per organization and serie.
+
+    The row is locked and incremented in the transaction that creates the
+    invoice (see services/correlativo.py), so numbering stays gapless
+    without scanning the serie's invoices.
+    """
+
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="invoice_sequences",
+    )
+    serie = models.CharField(max_length=10)
+    next_value = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "serie"],
+                name="invoice_sequence_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.serie} → {self.next_value}"
+
+
 class InvoiceItem(BaseModel):
     invoice = models.ForeignKey(
         Invoice,
@@ -1,22 +1,61 @@
-from django.db import transaction
-from django.db.models import Max
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
 
 
-def get_next_correlativo(organization, serie):
+def _locked_sequence(organization, serie):
     """
-    Get the next correlativo number for a given organization + serie.
+    Return the InvoiceSequence row for organization + serie, locked with
+    SELECT FOR UPDATE. A missing row (new serie) is created starting after
+    the highest correlativo already issued.
+    """
+    from apps.billing.models import Invoice, InvoiceSequence
+
+    sequences = InvoiceSequence.objects.select_for_update()
+    sequence = sequences.filter(organization=organization, serie=serie).first()
+    if sequence is not None:
+        return sequence
 
-    Uses SELECT FOR UPDATE to prevent race conditions. Each serie
-    (B001, F001, etc.) has an independent sequence per organization.
-    The unique_together on Invoice is the safety net.
+    last = Invoice.objects.filter(
+        organization=organization, serie=serie,
+    ).aggregate(max_correlativo=Max("correlativo"))["max_correlativo"]
+    try:
+        with transaction.atomic():
+            InvoiceSequence.objects.create(
+                organization=organization,
+                serie=serie,
+                next_value=(last or 0) + 1,
+            )
+    except IntegrityError:
+        # Created concurrently; the lock below waits for that transaction
+        pass
+    return sequences.get(organization=organization, serie=serie)
+
+
+def allocate_correlativos(organization, serie, count):
     """
-    from apps.billing.models import Invoice
+    Reserve `count` consecutive correlativos and return them as a range.
 
+    Call inside the transaction that creates the invoices: the sequence row
+    stays locked until it commits and a rollback returns the numbers, which
+    keeps each serie gapless. Batch jobs creating many invoices at once
+    take a whole block with a single row update.
+    """
     with transaction.atomic():
-        last = (
-            Invoice.objects
-            .select_for_update()
-            .filter(organization=organization, serie=serie)
-            .aggregate(max_correlativo=Max("correlativo"))
+        sequence = _locked_sequence(organization, serie)
+        first = sequence.next_value
+        type(sequence).objects.filter(pk=sequence.pk).update(
+            next_value=F("next_value") + count,
         )
-        return (last["max_correlativo"] or 0) + 1
+        return range(first, first + count)
+
+
+def get_next_correlativo(organization, serie):
+    """
+    Get the next correlativo number for a given organization + serie.
+
+    Locks a single InvoiceSequence row instead of scanning the serie's
+    invoices. Each serie (B001, F001, etc.) has an independent sequence
+    per organization. Must run in the same transaction as the invoice
+    insert; the unique_together on Invoice is the safety net.
+    """
+    return allocate_correlativos(organization, serie, 1)[0]
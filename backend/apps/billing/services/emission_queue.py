@@ -0,0 +1,110 @@
+"""
+Queue of invoices waiting to be emitted.
+
+An invoice is queued while next_attempt_at is set: emit_invoice sets it
+to the backoff time after a failure and clears it on success, so the
+eligible set is one indexed range scan instead of a Python loop over
+every failed invoice.
+
+Workers claim invoices with an UPDATE that tags them with a per-batch
+token and pushes next_attempt_at past BILLING_EMISSION_LEASE_SECONDS.
+An invoice still waiting in a batch when that lease expires can be
+claimed again, but emit_invoice only moves it to pending if the row
+still carries the claim it was loaded with, so just one worker sends it.
+
+emit_invoice renews the lease when the invoice moves to pending and to
+sent, so in-flight invoices carry the lease of their own send, not of
+the batch. One left in pending/sent after that lease expired belonged to
+a worker that died mid-emission; release_stale() marks it as error, if
+the lease is still the one it read, so it is retried.
+"""
+import logging
+import uuid
+from datetime import timedelta
+from itertools import chain, zip_longest
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.billing.models import Invoice
+
+from .config_resolver import resolve_billing_config
+from .invoice_emitter import emit_invoice, mark_interrupted
+from .throttle import provider_key
+
+logger = logging.getLogger(__name__)
+
+CLAIMABLE_STATUSES = ["draft", "error", "rejected"]
+IN_FLIGHT_STATUSES = ["pending", "sent"]
+
+
+def claim_invoices(worker_id, limit, max_attempts=None):
+    """Claim up to `limit` invoices due for emission, with what emit needs preloaded."""
+    if max_attempts is None:
+        max_attempts = settings.BILLING_EMISSION_MAX_ATTEMPTS
+    now = timezone.now()
+    due = list(
+        Invoice.objects.filter(
+            next_attempt_at__lte=now,
+            status__in=CLAIMABLE_STATUSES,
+            retry_count__lt=max_attempts,
+        ).order_by("next_attempt_at").values_list("id", flat=True)[:limit]
+    )
+    if not due:
+        return []
+
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    Invoice.objects.filter(id__in=due, next_attempt_at__lte=now).update(
+        claimed_by=token,
+        next_attempt_at=now + timedelta(seconds=settings.BILLING_EMISSION_LEASE_SECONDS),
+    )
+    return list(
+        Invoice.objects.filter(claimed_by=token, status__in=CLAIMABLE_STATUSES)
+        .select_related(
+            "organization",
+            "property__organization__billing_config",
+            "property__billing_config",
+            "related_invoice",
+        )
+        .prefetch_related("items")
+        .order_by("next_attempt_at", "created_at")
+    )
+
+
+def release_stale():
+    """Mark as error the in-flight invoices whose send lease expired."""
+    stale = Invoice.objects.filter(
+        next_attempt_at__lt=timezone.now(),
+        status__in=IN_FLIGHT_STATUSES,
+    ).select_related("organization")
+    released = 0
+    for invoice in stale:
+        if mark_interrupted(invoice):
+            released += 1
+    return released
+
+
+def interleave_by_provider(invoices):
+    """
+    Round-robin the batch across providers so a slow or capped provider
+    does not hold every worker thread while others sit idle.
+    """
+    groups = {}
+    for invoice in invoices:
+        config = resolve_billing_config(invoice.property) or {}
+        groups.setdefault(provider_key(config), []).append(invoice)
+    return [
+        invoice
+        for invoice in chain.from_iterable(zip_longest(*groups.values()))
+        if invoice is not None
+    ]
+
+
+def process_invoice(invoice):
+    """Emit one claimed invoice. Returns emit_invoice's result dict."""
+    close_old_connections()
+    try:
+        return emit_invoice(invoice)
+    finally:
+        close_old_connections()
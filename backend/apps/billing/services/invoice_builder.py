@@ -1,6 +1,7 @@
 import logging
 from decimal import Decimal
 
+from django.db import transaction
 from django.utils import timezone
 
 from .config_resolver import resolve_billing_config
@@ -41,10 +42,6 @@ def build_invoice_from_reservation(reservation, document_type="boleta", user=Non
     tributaria = config.get("configuracion_tributaria") or {}
     igv_rate = Decimal(str(tributaria.get("igv_rate", "0.18")))
 
-    # Get next correlativo
-    correlativo = get_next_correlativo(reservation.organization, serie)
-    numero_completo = f"{serie}-{correlativo:08d}"
-
     # Calculate nights
     nights = (reservation.check_out_date - reservation.check_in_date).days
     if nights < 1:
@@ -94,53 +91,60 @@ def build_invoice_from_reservation(reservation, document_type="boleta", user=Non
     cliente_razon_social = getattr(guest, "full_name", "") or ""
     cliente_email = getattr(guest, "email", "") or ""
 
-    # Create invoice
-    invoice = Invoice.objects.create(
-        organization=reservation.organization,
-        created_by=user,
-        reservation=reservation,
-        property=reservation.property,
-        document_type=document_type,
-        serie=serie,
-        correlativo=correlativo,
-        numero_completo=numero_completo,
-        status="draft",
-        cliente_tipo_documento=cliente_tipo_documento,
-        cliente_numero_documento=cliente_numero_documento,
-        cliente_razon_social=cliente_razon_social,
-        cliente_email=cliente_email,
-        total_gravado=total_gravado,
-        total_exonerado=total_exonerado,
-        total_inafecto=total_inafecto,
-        total_descuentos=Decimal("0.00"),
-        total_igv=total_igv,
-        total=total,
-        currency=reservation.currency,
-        fecha_emision=timezone.localdate(),
-    )
-
-    # Create item: alojamiento
-    unit_price = (total_amount / nights).quantize(QUANTIZE)
-    item_subtotal = (base / nights * nights).quantize(QUANTIZE)
-    item_igv = (igv / nights * nights).quantize(QUANTIZE)
-
-    # Adjust for rounding on last item
-    item_subtotal = base
-    item_igv = igv
-
-    InvoiceItem.objects.create(
-        invoice=invoice,
-        description=(
-            f"Alojamiento — {reservation.property.name} "
-            f"({reservation.check_in_date} a {reservation.check_out_date})"
-        ),
-        quantity=Decimal(str(nights)),
-        unit_price=unit_price,
-        subtotal=item_subtotal,
-        igv=item_igv,
-        total=total_amount,
-        tipo_afectacion_igv=tipo_afectacion,
-        sort_order=1,
-    )
+    # Numbering and inserts share one transaction: a failure rolls the
+    # correlativo back and the serie stays gapless
+    with transaction.atomic():
+        # Get next correlativo
+        correlativo = get_next_correlativo(reservation.organization, serie)
+        numero_completo = f"{serie}-{correlativo:08d}"
+
+        # Create invoice
+        invoice = Invoice.objects.create(
+            organization=reservation.organization,
+            created_by=user,
+            reservation=reservation,
+            property=reservation.property,
+            document_type=document_type,
+            serie=serie,
+            correlativo=correlativo,
+            numero_completo=numero_completo,
+            status="draft",
+            cliente_tipo_documento=cliente_tipo_documento,
+            cliente_numero_documento=cliente_numero_documento,
+            cliente_razon_social=cliente_razon_social,
+            cliente_email=cliente_email,
+            total_gravado=total_gravado,
+            total_exonerado=total_exonerado,
+            total_inafecto=total_inafecto,
+            total_descuentos=Decimal("0.00"),
+            total_igv=total_igv,
+            total=total,
+            currency=reservation.currency,
+            fecha_emision=timezone.localdate(),
+        )
+
+        # Create item: alojamiento
+        unit_price = (total_amount / nights).quantize(QUANTIZE)
+        item_subtotal = (base / nights * nights).quantize(QUANTIZE)
+        item_igv = (igv / nights * nights).quantize(QUANTIZE)
+
+        # Adjust for rounding on last item
+        item_subtotal = base
+        item_igv = igv
+
+        InvoiceItem.objects.create(
+            invoice=invoice,
+            description=(
+                f"Alojamiento — {reservation.property.name} "
+                f"({reservation.check_in_date} a {reservation.check_out_date})"
+            ),
+            quantity=Decimal(str(nights)),
+            unit_price=unit_price,
+            subtotal=item_subtotal,
+            igv=item_igv,
+            total=total_amount,
+            tipo_afectacion_igv=tipo_afectacion,
+            sort_order=1,
+        )
 
     return invoice
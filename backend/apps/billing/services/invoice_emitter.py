@@ -1,6 +1,8 @@
 import logging
 import time
+from datetime import timedelta
 
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
@@ -8,47 +10,93 @@ from apps.billing.adapters import get_adapter
 from apps.billing.constants import invoice_state_machine
 
 from .config_resolver import resolve_billing_config
+from .provider_health import allow_request, defer_seconds, record_result
+from .throttle import provider_slot
 
 logger = logging.getLogger(__name__)
 
+RETRY_BASE_MINUTES = 5
+RETRY_MAX_MINUTES = 60
 
-def emit_invoice(invoice, user=None):
+
+def next_retry_at(invoice):
+    """
+    When a failed invoice should be retried: 5, 10, 20, 40 then 60 minutes
+    after the attempt. None once BILLING_EMISSION_MAX_ATTEMPTS is reached.
+    """
+    if invoice.retry_count >= settings.BILLING_EMISSION_MAX_ATTEMPTS:
+        return None
+    minutes = min(2 ** (invoice.retry_count - 1) * RETRY_BASE_MINUTES, RETRY_MAX_MINUTES)
+    return invoice.last_attempt_at + timedelta(minutes=minutes)
+
+
+def emit_invoice(invoice, user=None, config=None):
     """
     Emit an invoice through the configured billing provider.
 
+    `config` replaces the property's resolved billing config (used by
+    benchmark_billing_emission to target the simulator).
+
+    The move to pending is conditional on the row still being in the
+    loaded status and claim, so two workers holding the same invoice (e.g.
+    after a lease expired) never both send it; the loser gets
+    {"skipped": True}.
+
     NEVER raises — returns dict with success/error info.
     Triple safety net: emitter → action → dispatcher.
     """
     try:
-        config = resolve_billing_config(invoice.property)
+        if config is None:
+            config = resolve_billing_config(invoice.property)
         if not config:
+            _unschedule(invoice)
             return {"success": False, "error": "Billing disabled"}
 
-        # Transition: draft/error/rejected → pending
-        with transaction.atomic():
-            invoice_state_machine.transition(
-                invoice, "status", "pending", user=user,
-            )
-
-        adapter = get_adapter(config["proveedor"])
-        if not adapter:
-            _mark_error(invoice, f"No adapter for provider: {config['proveedor']}", user)
-            return {"success": False, "error": f"No adapter for provider: {config['proveedor']}"}
-
-        payload = adapter.build_payload(invoice, config)
-
-        # Save request + transition → sent
-        with transaction.atomic():
-            invoice.provider_request = payload
-            invoice.save(update_fields=["provider_request", "updated_at"])
-            invoice_state_machine.transition(
-                invoice, "status", "sent", user=user,
-            )
+        # Provider down: keep the invoice queued without calling it
+        if not allow_request(config):
+            return _defer(invoice, defer_seconds(config))
+
+        # The provider slot is taken before the invoice leaves the queue,
+        # so waiting for it never runs down the lease of an in-flight send
+        with provider_slot(config):
+            # Transition: draft/error/rejected → pending, only if no other
+            # worker (after a lease expiry) or manual emit got there first.
+            # The same UPDATE renews the lease release_stale() checks.
+            with transaction.atomic():
+                started = invoice_state_machine.transition_if_current(
+                    invoice, "status", "pending", user=user,
+                    updates={"next_attempt_at": _lease_until()},
+                    claimed_by=invoice.claimed_by,
+                )
+            if not started:
+                return {
+                    "success": False,
+                    "skipped": True,
+                    "invoice_id": str(invoice.id),
+                    "error": "Emision ya iniciada por otro proceso",
+                }
+
+            adapter = get_adapter(config["proveedor"])
+            if not adapter:
+                _mark_error(invoice, f"No adapter for provider: {config['proveedor']}", user)
+                return {"success": False, "error": f"No adapter for provider: {config['proveedor']}"}
+
+            payload = adapter.build_payload(invoice, config)
+
+            # Save request + transition → sent
+            with transaction.atomic():
+                invoice.provider_request = payload
+                invoice.next_attempt_at = _lease_until()
+                invoice.save(update_fields=["provider_request", "next_attempt_at", "updated_at"])
+                invoice_state_machine.transition(
+                    invoice, "status", "sent", user=user,
+                )
 
-        # Call provider (with timing)
-        start = time.monotonic()
-        result = adapter.send(payload, config)
-        latency = int((time.monotonic() - start) * 1000)
+            # Call provider (with timing)
+            start = time.monotonic()
+            result = adapter.send(payload, config)
+            latency = int((time.monotonic() - start) * 1000)
+        record_result(config, result.get("http_status"), result.get("error_code", ""), latency)
 
         # Save response + final transition
         with transaction.atomic():
@@ -62,22 +110,25 @@ def emit_invoice(invoice, user=None):
             if result["success"]:
                 invoice.sunat_ticket = result.get("ticket", "")
                 invoice.provider_document_url = result.get("document_url", "")
+                invoice.next_attempt_at = None
                 invoice.save(update_fields=[
                     "provider_response", "provider_http_status",
                     "provider_latency_ms", "provider_error_code",
                     "sunat_ticket", "provider_document_url",
-                    "last_attempt_at", "retry_count", "updated_at",
+                    "last_attempt_at", "retry_count", "next_attempt_at",
+                    "updated_at",
                 ])
                 invoice_state_machine.transition(
                     invoice, "status", "accepted", user=user,
                 )
             else:
                 invoice.last_error = result.get("error", "")
+                invoice.next_attempt_at = next_retry_at(invoice)
                 invoice.save(update_fields=[
                     "provider_response", "provider_http_status",
                     "provider_latency_ms", "provider_error_code",
                     "last_error", "last_attempt_at", "retry_count",
-                    "updated_at",
+                    "next_attempt_at", "updated_at",
                 ])
                 new_status = "rejected" if result.get("rejected") else "error"
                 invoice_state_machine.transition(
@@ -105,8 +156,10 @@ def _mark_error(invoice, error_message, user):
             invoice.last_error = error_message
             invoice.last_attempt_at = timezone.now()
             invoice.retry_count += 1
+            invoice.next_attempt_at = next_retry_at(invoice)
             invoice.save(update_fields=[
-                "last_error", "last_attempt_at", "retry_count", "updated_at",
+                "last_error", "last_attempt_at", "retry_count",
+                "next_attempt_at", "updated_at",
             ])
             if invoice.status in ("pending", "sent"):
                 invoice_state_machine.transition(
@@ -114,3 +167,49 @@ def _mark_error(invoice, error_message, user):
                 )
     except Exception:
         logger.exception(f"Failed to mark invoice {invoice.id} as error")
+
+
+def mark_interrupted(invoice):
+    """
+    Fail an emission whose worker stopped before recording the outcome.
+    Only applies while the row still holds the lease the invoice was loaded
+    with; returns False when the emission renewed it or finished meanwhile.
+    """
+    lease = invoice.next_attempt_at
+    invoice.last_error = "Emision interrumpida antes de recibir respuesta del proveedor"
+    invoice.last_attempt_at = timezone.now()
+    invoice.retry_count += 1
+    with transaction.atomic():
+        return invoice_state_machine.transition_if_current(
+            invoice, "status", "error",
+            updates={
+                "last_error": invoice.last_error,
+                "last_attempt_at": invoice.last_attempt_at,
+                "retry_count": invoice.retry_count,
+                "next_attempt_at": next_retry_at(invoice),
+            },
+            next_attempt_at=lease,
+        )
+
+
+def _lease_until():
+    return timezone.now() + timedelta(seconds=settings.BILLING_EMISSION_LEASE_SECONDS)
+
+
+def _defer(invoice, delay_seconds):
+    """Postpone an emission while the provider's breaker is open."""
+    invoice.next_attempt_at = timezone.now() + timedelta(seconds=max(delay_seconds, 1))
+    invoice.last_error = "Proveedor no disponible, emision diferida"
+    invoice.save(update_fields=["next_attempt_at", "last_error", "updated_at"])
+    return {
+        "success": False,
+        "deferred": True,
+        "invoice_id": str(invoice.id),
+        "error": invoice.last_error,
+    }
+
+
+def _unschedule(invoice):
+    if invoice.next_attempt_at is not None:
+        invoice.next_attempt_at = None
+        type(invoice).objects.filter(pk=invoice.pk).update(next_attempt_at=None)
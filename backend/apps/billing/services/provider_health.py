@@ -0,0 +1,172 @@
+"""
+Health tracking and circuit breaker per billing endpoint.
+
+Every provider call is recorded per (provider, api_endpoint): its latency
+goes into an hourly histogram (apps/common/histogram.py) and its outcome
+feeds a breaker kept in the cache. Both are only consistent across
+processes with a shared backend (redis, memcached); with locmem each
+process has its own breaker and run_billing_worker and
+retry_pending_invoices warn at start (see apps/common/cache.py).
+
+A call counts as a failure when it got no HTTP response (timeout,
+connection error), a 5xx or 429, or took longer than
+BILLING_BREAKER_SLOW_MS. Rejections (400/422) mean the provider is up and
+do not count.
+
+- closed: calls go through. BILLING_BREAKER_FAILURES consecutive
+  failures, each within BILLING_BREAKER_WINDOW_SECONDS of the previous,
+  open the breaker.
+- open: emit_invoice defers the invoice until the cooldown
+  (BILLING_BREAKER_COOLDOWN_SECONDS) ends, without calling the provider.
+- half-open: after the cooldown a single call is let through as a probe
+  (claimed with cache.add). Success closes the breaker, failure opens it
+  for another cooldown. Other callers wait for the probe's timeout.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.common import histogram
+
+logger = logging.getLogger(__name__)
+
+BREAKER_KEY = "billing:breaker:{endpoint}:{field}"
+LATENCY_PREFIX = "billing:latency:{endpoint}"
+# Remembers a trip after the cooldown expires (half-open)
+TRIPPED_TIMEOUT = 86400
+FAILURE_STATUSES = {429}
+
+
+def endpoint_id(config):
+    digest = hashlib.sha1((config.get("api_endpoint") or "").encode()).hexdigest()[:16]
+    return f"{config.get('proveedor') or 'none'}:{digest}"
+
+
+def _key(endpoint, field):
+    return BREAKER_KEY.format(endpoint=endpoint, field=field)
+
+
+def _probe_timeout():
+    return int(settings.HTTP_CONNECT_TIMEOUT + settings.HTTP_READ_TIMEOUT) + 5
+
+
+def is_failure(http_status, error_code, latency_ms):
+    if http_status is None or error_code in ("TIMEOUT", "CONNECTION_ERROR"):
+        return True
+    if http_status >= 500 or http_status in FAILURE_STATUSES:
+        return True
+    return latency_ms is not None and latency_ms >= settings.BILLING_BREAKER_SLOW_MS
+
+
+def allow_request(config):
+    """
+    Whether a call to the config's endpoint may go out now. In half-open
+    state only the caller that claims the probe gets True.
+    """
+    endpoint = endpoint_id(config)
+    state = cache.get_many([_key(endpoint, "open"), _key(endpoint, "tripped")])
+    if _key(endpoint, "open") in state:
+        return False
+    if _key(endpoint, "tripped") not in state:
+        return True
+    return cache.add(_key(endpoint, "probe"), 1, timeout=_probe_timeout())
+
+
+def retry_after(config):
+    """Seconds until the breaker lets a probe through (0 if not open)."""
+    opened_at = cache.get(_key(endpoint_id(config), "open"))
+    if opened_at is None:
+        return 0
+    return max(int(opened_at + settings.BILLING_BREAKER_COOLDOWN_SECONDS - time.time()), 1)
+
+
+def defer_seconds(config):
+    """
+    How long to postpone a call refused by allow_request: the rest of the
+    cooldown while open, the probe's timeout while a half-open probe runs.
+    """
+    return retry_after(config) or _probe_timeout()
+
+
+def record_result(config, http_status, error_code, latency_ms):
+    """Feed one provider call into the endpoint's histogram and breaker."""
+    endpoint = endpoint_id(config)
+    failure = is_failure(http_status, error_code, latency_ms)
+    histogram.observe(LATENCY_PREFIX.format(endpoint=endpoint), latency_ms or 0, not failure)
+
+    if not failure:
+        cache.delete_many([
+            _key(endpoint, "failures"), _key(endpoint, "tripped"), _key(endpoint, "probe"),
+        ])
+        return
+
+    if cache.get(_key(endpoint, "tripped")) is not None:
+        # Probe (or a call in flight when the breaker opened) failed
+        _open(endpoint, config)
+        return
+    failures_key = _key(endpoint, "failures")
+    cache.add(failures_key, 0, timeout=settings.BILLING_BREAKER_WINDOW_SECONDS)
+    try:
+        failures = cache.incr(failures_key)
+    except ValueError:
+        failures = 1
+    cache.touch(failures_key, settings.BILLING_BREAKER_WINDOW_SECONDS)
+    if failures >= settings.BILLING_BREAKER_FAILURES:
+        _open(endpoint, config)
+
+
+def _open(endpoint, config):
+    cache.set(_key(endpoint, "open"), time.time(), timeout=settings.BILLING_BREAKER_COOLDOWN_SECONDS)
+    cache.set(_key(endpoint, "tripped"), 1, timeout=TRIPPED_TIMEOUT)
+    cache.delete_many([_key(endpoint, "failures"), _key(endpoint, "probe")])
+    logger.warning(
+        f"Billing breaker open for {config.get('proveedor')} "
+        f"({endpoint}) for {settings.BILLING_BREAKER_COOLDOWN_SECONDS}s"
+    )
+
+
+def reset_breaker(config):
+    endpoint = endpoint_id(config)
+    cache.delete_many([_key(endpoint, field) for field in ("open", "tripped", "failures", "probe")])
+
+
+def breaker_state(config):
+    endpoint = endpoint_id(config)
+    fields = ["open", "tripped", "failures", "probe"]
+    values = cache.get_many([_key(endpoint, field) for field in fields])
+    get = lambda field: values.get(_key(endpoint, field))
+    if get("open") is not None:
+        state = "open"
+    elif get("tripped") is not None:
+        state = "half_open"
+    else:
+        state = "closed"
+    return {
+        "state": state,
+        "consecutive_failures": get("failures") or 0,
+        "retry_after_seconds": retry_after(config) if state == "open" else 0,
+        "probe_in_flight": get("probe") is not None,
+    }
+
+
+def get_provider_health(configs, hours=24):
+    """Breaker state and latency summary for each distinct endpoint in `configs`."""
+    endpoints = {}
+    for config in configs:
+        endpoints.setdefault(endpoint_id(config), config)
+    summaries = histogram.summarize(
+        [LATENCY_PREFIX.format(endpoint=endpoint) for endpoint in endpoints], hours=hours,
+    )
+    result = []
+    for endpoint, config in endpoints.items():
+        latency = summaries.get(LATENCY_PREFIX.format(endpoint=endpoint))
+        result.append({
+            "provider": config.get("proveedor"),
+            "api_endpoint": config.get("api_endpoint"),
+            **breaker_state(config),
+            "latency": latency,
+        })
+    return result
@@ -0,0 +1,71 @@
+"""
+Limits on outgoing requests to billing providers.
+
+Each (provider, endpoint host) gets a concurrency cap (requests in
+flight) and a token bucket (requests per second, bursting up to one
+second's worth). Defaults come from BILLING_PROVIDER_CONCURRENCY and
+BILLING_PROVIDER_RATE_PER_SECOND, overridable per provider through
+BILLING_PROVIDER_LIMITS.
+
+Limits are per process: when several workers emit against the same
+provider, split its quota between them.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+_limits = {}
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def provider_key(config):
+    """(provider, endpoint host) identifying a rate-limited upstream."""
+    return (config.get("proveedor") or "", urlsplit(config.get("api_endpoint") or "").netloc)
+
+
+def _limits_for(key):
+    with _lock:
+        if key not in _limits:
+            overrides = settings.BILLING_PROVIDER_LIMITS.get(key[0], {})
+            concurrency = overrides.get("concurrency", settings.BILLING_PROVIDER_CONCURRENCY)
+            rate = overrides.get("rate", settings.BILLING_PROVIDER_RATE_PER_SECOND)
+            _limits[key] = (
+                threading.BoundedSemaphore(max(concurrency, 1)),
+                TokenBucket(rate) if rate > 0 else None,
+            )
+        return _limits[key]
+
+
+@contextmanager
+def provider_slot(config):
+    """Hold a concurrency slot and a rate token for the config's provider."""
+    semaphore, bucket = _limits_for(provider_key(config))
+    with semaphore:
+        if bucket is not None:
+            bucket.acquire()
+        yield
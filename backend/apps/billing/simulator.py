@@ -0,0 +1,279 @@
+"""
+Local stand-in for the billing providers, for load and failure testing.
+
+Speaks the request/response format each adapter expects, selected by the
+first path segment of the endpoint:
+
+    POST /nubefact/...   NubefactAdapter
+    POST /efact/...      EfactAdapter
+    POST /webhook/...    CustomWebhookAdapter
+
+Each request gets a latency drawn from the configured distribution and
+one outcome: accepted, provider error (HTTP 500), rejection (HTTP 400
+with the provider's error body) or timeout (the server hangs longer than
+the client waits). Payloads missing fields the real provider requires are
+rejected with 422, so adapter regressions show up as rejections.
+
+Used by `manage.py simulate_billing_provider` and, in-process, by
+`manage.py benchmark_billing_emission`.
+"""
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PATHS = {
+    "nubefact": "nubefact",
+    "efact": "efact",
+    "custom_webhook": "webhook",
+}
+
+REQUIRED_FIELDS = {
+    "nubefact": ["operacion", "tipo_de_comprobante", "serie", "numero", "items"],
+    "efact": ["tipoComprobante", "serie", "numero", "cliente", "items", "totales"],
+    "webhook": ["document_type", "serie", "correlativo", "items"],
+}
+
+DISTRIBUTIONS = ["fixed", "uniform", "exponential", "lognormal"]
+
+
+class SimulatorProfile:
+    """Latency distribution and outcome rates of the simulated provider."""
+
+    def __init__(self, latency_ms=150, distribution="lognormal", sigma=0.5,
+                 error_rate=0.0, reject_rate=0.0, timeout_rate=0.0,
+                 hang_seconds=60, seed=None):
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.reject_rate = reject_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.random = random.Random(seed)
+
+    def latency(self):
+        """Seconds to wait before answering."""
+        mean = self.latency_ms
+        if mean <= 0:
+            return 0
+        if self.distribution == "uniform":
+            ms = self.random.uniform(0, 2 * mean)
+        elif self.distribution == "exponential":
+            ms = self.random.expovariate(1 / mean)
+        elif self.distribution == "lognormal":
+            # latency_ms is the median
+            ms = self.random.lognormvariate(math.log(mean), self.sigma)
+        else:
+            ms = mean
+        return ms / 1000
+
+    def outcome(self):
+        roll = self.random.random()
+        for name, rate in (
+            ("timeout", self.timeout_rate),
+            ("error", self.error_rate),
+            ("rejected", self.reject_rate),
+        ):
+            if roll < rate:
+                return name
+            roll -= rate
+        return "accepted"
+
+    def describe(self):
+        return (
+            f"latency {self.distribution} {self.latency_ms}ms"
+            + (f" sigma={self.sigma}" if self.distribution == "lognormal" else "")
+            + f", errors {self.error_rate:.0%}, rejections {self.reject_rate:.0%}, "
+            f"timeouts {self.timeout_rate:.0%} (hang {self.hang_seconds}s)"
+        )
+
+
+def add_profile_arguments(parser):
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=150,
+        help="Typical response time in ms; the median for lognormal (default: 150)",
+    )
+    parser.add_argument(
+        "--latency-dist",
+        choices=DISTRIBUTIONS,
+        default="lognormal",
+        help="Latency distribution (default: lognormal)",
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.5,
+        help="Spread of the lognormal distribution (default: 0.5)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with HTTP 500 (default: 0)",
+    )
+    parser.add_argument(
+        "--reject-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests rejected as SUNAT would (default: 0)",
+    )
+    parser.add_argument(
+        "--timeout-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that hang past the client timeout (default: 0)",
+    )
+    parser.add_argument(
+        "--hang-seconds",
+        type=float,
+        default=60,
+        help="How long a timed-out request hangs (default: 60)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed, for repeatable runs",
+    )
+
+
+def profile_from_options(options):
+    return SimulatorProfile(
+        latency_ms=options["latency_ms"],
+        distribution=options["latency_dist"],
+        sigma=options["latency_sigma"],
+        error_rate=options["error_rate"],
+        reject_rate=options["reject_rate"],
+        timeout_rate=options["timeout_rate"],
+        hang_seconds=options["hang_seconds"],
+        seed=options["seed"],
+    )
+
+
+def _accepted(provider, payload):
+    ticket = uuid.uuid4().hex[:20]
+    if provider == "nubefact":
+        number = f"{payload['serie']}-{payload['numero']}"
+        return 200, {
+            "tipo_de_comprobante": payload["tipo_de_comprobante"],
+            "serie": payload["serie"],
+            "numero": payload["numero"],
+            "aceptada_por_sunat": True,
+            "sunat_description": f"La Boleta numero {number}, ha sido aceptada",
+            "sunat_ticket_number": ticket,
+            "enlace_del_pdf": f"https://simulator.local/nubefact/{number}.pdf",
+        }
+    if provider == "efact":
+        number = f"{payload['serie']}-{payload['numero']}"
+        return 200, {
+            "estado": "ACEPTADO",
+            "ticket": ticket,
+            "enlacePdf": f"https://simulator.local/efact/{number}.pdf",
+        }
+    return 201, {
+        "ticket": ticket,
+        "document_url": f"https://simulator.local/webhook/{payload['serie']}-{payload['correlativo']}.pdf",
+    }
+
+
+def _rejected(provider, message, status=400):
+    if provider == "nubefact":
+        return status, {"errors": message, "codigo": 20}
+    if provider == "efact":
+        return status, {"errors": [message], "codigo": "2800", "mensaje": message}
+    return status, {"error": message, "error_code": "REJECTED"}
+
+
+def _provider_error(provider):
+    if provider == "nubefact":
+        return 500, {"errors": "Error interno del servidor", "codigo": 50}
+    if provider == "efact":
+        return 500, {"errors": ["Servicio no disponible"], "codigo": "0100"}
+    return 500, {"error": "Internal error", "error_code": "SERVER_ERROR"}
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled client sessions are exercised as in production
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        provider = self.path.strip("/").split("/")[0]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if provider not in REQUIRED_FIELDS:
+            self._respond(404, {"error": f"Unknown provider path: {self.path}"})
+            return
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._respond(400, {"error": "Invalid JSON"})
+            return
+
+        missing = [field for field in REQUIRED_FIELDS[provider] if field not in payload]
+        if missing:
+            outcome = "invalid"
+            status, data = _rejected(provider, f"Faltan campos: {', '.join(missing)}", status=422)
+        else:
+            outcome = self.server.profile.outcome()
+            if outcome == "timeout":
+                time.sleep(self.server.profile.hang_seconds)
+                status, data = _provider_error(provider)
+            else:
+                time.sleep(self.server.profile.latency())
+                if outcome == "error":
+                    status, data = _provider_error(provider)
+                elif outcome == "rejected":
+                    status, data = _rejected(provider, "El comprobante fue rechazado por SUNAT")
+                else:
+                    status, data = _accepted(provider, payload)
+
+        self.server.record(provider, outcome)
+        try:
+            self._respond(status, data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _respond(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SimulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, profile, verbose=False):
+        super().__init__(address, SimulatorHandler)
+        self.profile = profile
+        self.verbose = verbose
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def record(self, provider, outcome):
+        with self._stats_lock:
+            self.stats[(provider, outcome)] += 1
+
+
+def start_in_background(profile, host="127.0.0.1", port=0):
+    """Start a simulator on a daemon thread; port 0 picks a free one."""
+    server = SimulatorServer((host, port), profile)
+    threading.Thread(target=server.serve_forever, daemon=True, name="billing-simulator").start()
+    return server
+
+
+def endpoint_url(server, provider):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/{PATHS[provider]}/"
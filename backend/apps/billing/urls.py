@@ -1,7 +1,12 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import BillingConfigView, InvoiceViewSet, PropertyBillingConfigViewSet
+from .views import (
+    BillingConfigView,
+    InvoiceViewSet,
+    PropertyBillingConfigViewSet,
+    ProviderHealthView,
+)
 
 router = DefaultRouter()
 router.register("invoices", InvoiceViewSet, basename="invoice")
@@ -14,6 +19,7 @@ property_config = PropertyBillingConfigViewSet.as_view({
 
 urlpatterns = [
     path("config/", BillingConfigView.as_view(), name="billing-config"),
+    path("provider-health/", ProviderHealthView.as_view(), name="billing-provider-health"),
     path(
         "properties/<uuid:property_pk>/config/",
         property_config,
@@ -5,6 +5,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.common.export import export_response
 from apps.common.mixins import TenantQuerySetMixin
 from apps.common.permissions import IsOwnerOrManager
 from apps.reservations.models import Reservation
@@ -19,7 +20,30 @@ from .serializers import (
     PropertyBillingConfigSerializer,
 )
 from .services.invoice_builder import build_invoice_from_reservation
+from .services.config_resolver import resolve_billing_config
 from .services.invoice_emitter import emit_invoice
+from .services.provider_health import get_provider_health
+
+INVOICE_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("numero", "numero_completo"),
+    ("tipo", "document_type"),
+    ("serie", "serie"),
+    ("correlativo", "correlativo"),
+    ("estado", "status"),
+    ("propiedad", "property__name"),
+    ("reserva", "reservation__confirmation_code"),
+    ("fecha_emision", "fecha_emision"),
+    ("cliente_tipo_documento", "cliente_tipo_documento"),
+    ("cliente_numero_documento", "cliente_numero_documento"),
+    ("cliente_razon_social", "cliente_razon_social"),
+    ("total_gravado", "total_gravado"),
+    ("total_exonerado", "total_exonerado"),
+    ("total_inafecto", "total_inafecto"),
+    ("total_igv", "total_igv"),
+    ("total", "total"),
+    ("moneda", "currency"),
+]
 
 
 class BillingConfigView(APIView):
@@ -176,3 +200,46 @@ class InvoiceViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
             )
 
         return Response(InvoiceDetailSerializer(invoice).data)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        GET /billing/invoices/export/?output=csv|ndjson&compress=gzip
+        Streams every invoice matching the list filters.
+        """
+        return export_response(
+            self.filter_queryset(self.get_queryset()),
+            columns=INVOICE_EXPORT_COLUMNS,
+            filename="comprobantes",
+            request=request,
+        )
+
+
+class ProviderHealthView(APIView):
+    """
+    GET /api/v1/billing/provider-health/?hours=24
+    Breaker state and latency percentiles of each provider endpoint the
+    organization's properties emit through.
+    """
+
+    permission_classes = [IsOwnerOrManager]
+
+    def get(self, request):
+        try:
+            hours = int(request.query_params.get("hours", 24))
+        except ValueError:
+            return Response(
+                {"detail": "hours debe ser un número entero."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        properties = request.organization.properties.select_related(
+            "organization__billing_config", "billing_config",
+        )
+        configs = [
+            config for config in map(resolve_billing_config, properties)
+            if config and config["proveedor"]
+        ]
+        return Response({
+            "hours": max(1, min(hours, 168)),
+            "providers": get_provider_health(configs, hours=hours),
+        })
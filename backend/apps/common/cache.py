@@ -0,0 +1,20 @@
+"""
+Helpers about the configured cache backend.
+
+Some state is only useful when every process sees it: action metrics
+written by `run_automation_worker` and billing breaker state written by
+`run_billing_worker` are read by the web workers. The commands that write
+it warn when started with a per-process backend (locmem, dummy) and run
+with state local to their process.
+"""
+from django.conf import settings
+
+PER_PROCESS_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def is_shared_cache(alias="default"):
+    """Whether the cache is shared between processes (redis, memcached, db...)."""
+    return settings.CACHES[alias]["BACKEND"] not in PER_PROCESS_BACKENDS
@@ -0,0 +1,97 @@
+"""
+Hourly latency histograms kept in the shared cache.
+
+Each series has one counter per latency bucket, plus failure and
+total-milliseconds counters, under keys that include the hour. Readers
+sum the last N hours, so the window rolls by itself and old hours expire
+with the cache timeout.
+"""
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+
+# Upper bounds in ms; the last bucket is open-ended
+BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+LABELS = [str(bound) for bound in BUCKETS_MS] + ["inf"]
+MAX_HOURS = 168
+KEY_TIMEOUT = (MAX_HOURS + 1) * 3600
+
+
+def _hour(ts=None):
+    return int((ts or time.time()) // 3600)
+
+
+def _bucket(duration_ms):
+    for bound in BUCKETS_MS:
+        if duration_ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def _incr(key, delta=1):
+    cache.add(key, 0, timeout=KEY_TIMEOUT)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def observe(prefix, duration_ms, success):
+    """Record one sample in the series `prefix` (a cache key prefix)."""
+    key = f"{prefix}:{_hour()}:{{}}".format
+    _incr(key(_bucket(duration_ms)))
+    _incr(key("total_ms"), int(round(duration_ms)))
+    if not success:
+        _incr(key("failures"))
+
+
+def _percentile(counts, total, fraction):
+    """
+    Upper bound (ms) of the bucket holding the given fraction of samples;
+    None when it falls in the open-ended bucket.
+    """
+    target = total * fraction
+    seen = 0
+    for label, count in counts:
+        seen += count
+        if seen >= target:
+            return int(label) if label != "inf" else None
+    return None
+
+
+def summarize(prefixes, hours=24):
+    """
+    Count, failures, average and p50/p95/p99 of the last `hours` hours for
+    each series. Returns {prefix: summary}, leaving out empty series.
+    """
+    hours = max(1, min(hours, MAX_HOURS))
+    current = _hour()
+    counters = LABELS + ["failures", "total_ms"]
+    keys = {
+        (prefix, hour, counter): f"{prefix}:{hour}:{counter}"
+        for prefix in prefixes
+        for hour in range(current - hours + 1, current + 1)
+        for counter in counters
+    }
+    values = cache.get_many(list(keys.values()))
+    sums = defaultdict(int)
+    for (prefix, _, counter), key in keys.items():
+        sums[(prefix, counter)] += values.get(key, 0)
+
+    result = {}
+    for prefix in prefixes:
+        buckets = [(label, sums[(prefix, label)]) for label in LABELS]
+        count = sum(n for _, n in buckets)
+        if not count:
+            continue
+        result[prefix] = {
+            "count": count,
+            "failures": sums[(prefix, "failures")],
+            "avg_ms": round(sums[(prefix, "total_ms")] / count, 1),
+            "p50_ms": _percentile(buckets, count, 0.50),
+            "p95_ms": _percentile(buckets, count, 0.95),
+            "p99_ms": _percentile(buckets, count, 0.99),
+            "buckets": [{"le": label, "count": n} for label, n in buckets],
+        }
+    return result
@@ -0,0 +1,95 @@
+"""
+Shared HTTP client for outbound integrations (billing providers, RENIEC).
+
+A module-level requests.post opens a new TCP+TLS connection per call.
+Here each process keeps one Session per retry policy whose adapter pools
+up to HTTP_POOL_MAXSIZE keep-alive connections per host. Sessions are
+recreated after a fork so workers never share sockets with their parent.
+
+Timeouts are (HTTP_CONNECT_TIMEOUT, read timeout); callers may pass a
+shorter or longer read timeout per request.
+
+Retries use exponential backoff with full jitter. Connection failures are
+retried for any method, since nothing reached the server. Read errors and
+502/503/504 responses are only retried for idempotent methods, or for a
+POST when the caller passes idempotent=True (e.g. lookups). The budget is
+HTTP_MAX_RETRIES; calls made while a user waits pass a smaller `retries`,
+since each retry can add a full read timeout.
+"""
+import os
+import random
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (502, 503, 504)
+
+_sessions = {}
+_pid = None
+_lock = threading.Lock()
+
+
+class JitterRetry(Retry):
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+
+def _build_session(idempotent, retries):
+    methods = set(Retry.DEFAULT_ALLOWED_METHODS)
+    if idempotent:
+        methods.add("POST")
+    retry = JitterRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        allowed_methods=frozenset(methods),
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=settings.HTTP_RETRY_BACKOFF,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(idempotent=False, retries=None):
+    """The process-wide pooled Session for the given retry policy."""
+    global _pid
+    if retries is None:
+        retries = settings.HTTP_MAX_RETRIES
+    key = (idempotent, retries)
+    with _lock:
+        if _pid != os.getpid():
+            _sessions.clear()
+            _pid = os.getpid()
+        if key not in _sessions:
+            _sessions[key] = _build_session(idempotent, retries)
+        return _sessions[key]
+
+
+def request(method, url, timeout=None, idempotent=False, retries=None, **kwargs):
+    """
+    Send a request through the pooled session.
+
+    `timeout` is the read timeout in seconds (default HTTP_READ_TIMEOUT);
+    the connect timeout is always HTTP_CONNECT_TIMEOUT. `retries` overrides
+    HTTP_MAX_RETRIES.
+    """
+    read_timeout = timeout if timeout is not None else settings.HTTP_READ_TIMEOUT
+    return get_session(idempotent, retries).request(
+        method, url, timeout=(settings.HTTP_CONNECT_TIMEOUT, read_timeout), **kwargs,
+    )
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
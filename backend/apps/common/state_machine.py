@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from apps.common.models import StateTransitionLog
 
@@ -27,7 +28,40 @@ class StateMachine:
         return new_state in self.get_valid_transitions(current_state)
 
     def transition(self, instance, field: str, new_state: str, user=None):
-        current_state = getattr(instance, field)
+        old_state = getattr(instance, field)
+        self._validate(old_state, new_state)
+
+        setattr(instance, field, new_state)
+        instance.save(update_fields=[field, "updated_at"])
+        self._log(instance, field, old_state, new_state, user)
+
+    def transition_if_current(
+        self, instance, field: str, new_state: str, user=None, updates=None, **conditions,
+    ) -> bool:
+        """
+        Apply the transition with a conditional UPDATE that only matches
+        while the row still holds the instance's state (and `conditions`).
+        `updates` are other fields written by the same UPDATE. Returns
+        False, leaving the instance untouched, when another process moved
+        the row first.
+        """
+        old_state = getattr(instance, field)
+        self._validate(old_state, new_state)
+
+        now = timezone.now()
+        values = {**(updates or {}), field: new_state, "updated_at": now}
+        updated = type(instance)._default_manager.filter(
+            pk=instance.pk, **{field: old_state}, **conditions,
+        ).update(**values)
+        if not updated:
+            return False
+
+        for name, value in values.items():
+            setattr(instance, name, value)
+        self._log(instance, field, old_state, new_state, user)
+        return True
+
+    def _validate(self, current_state, new_state):
         if not self.can_transition(current_state, new_state):
             valid = ", ".join(self.get_valid_transitions(current_state))
             raise ValidationError(
@@ -35,10 +69,7 @@ class StateMachine:
                 f"Transiciones válidas desde '{current_state}': [{valid}]"
             )
 
-        old_state = current_state
-        setattr(instance, field, new_state)
-        instance.save(update_fields=[field, "updated_at"])
-
+    def _log(self, instance, field, old_state, new_state, user):
         organization = getattr(instance, "organization", None)
         if organization is None:
             organization = getattr(instance, "property", None)
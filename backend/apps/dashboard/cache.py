@@ -0,0 +1,218 @@
+"""
+Versioned response cache for the dashboard endpoints.
+
+Each organization has a data version stored in the cache. Writes to
+reservations, payments, rooms, room types and tasks bump it (see
+signals.py), which makes every cached dashboard response of that
+organization unreachable at once. Entries are keyed by (org, version,
+view, query params, local date) and carry an ETag so polling clients can
+revalidate with If-None-Match.
+
+Usage:
+    class TodayView(APIView):
+        @cached_dashboard_response()
+        def get(self, request):
+            ...
+"""
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "dashboard:version:{org_id}"
+INDEX_KEY = "dashboard:index:{org_id}"
+ENTRY_KEY = "dashboard:entry:{org_id}:{version}:{digest}"
+STATS_KEY = "dashboard:stats:{org_id}:{view}:{outcome}"
+
+STAT_OUTCOMES = ("hit", "miss", "not_modified")
+
+
+# ---------- Data version ----------
+
+def get_data_version(org_id):
+    """Return the current data version for an organization."""
+    key = VERSION_KEY.format(org_id=org_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from a timestamp so an evicted version never collides
+        # with entries cached under an older counter.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(org_id):
+    """Invalidate every cached dashboard response of an organization."""
+    key = VERSION_KEY.format(org_id=org_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+# ---------- Stats ----------
+
+def _record(org_id, view, outcome):
+    key = STATS_KEY.format(org_id=org_id, view=view, outcome=outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_cache_stats(org_id, views):
+    """Hit/miss counters per view plus the current cache footprint."""
+    keys = {
+        (view, outcome): STATS_KEY.format(org_id=org_id, view=view, outcome=outcome)
+        for view in views
+        for outcome in STAT_OUTCOMES
+    }
+    values = cache.get_many(list(keys.values()))
+
+    by_view = {}
+    for view in views:
+        counts = {
+            outcome: values.get(keys[(view, outcome)], 0)
+            for outcome in STAT_OUTCOMES
+        }
+        total = sum(counts.values())
+        served = counts["hit"] + counts["not_modified"]
+        counts["hit_rate"] = round(served / total * 100, 1) if total else 0
+        by_view[view] = counts
+
+    version = get_data_version(org_id)
+    index = cache.get(INDEX_KEY.format(org_id=org_id))
+    if not index or index["version"] != version:
+        index = {"entries": {}, "bytes": 0}
+
+    return {
+        "version": version,
+        "entries": len(index["entries"]),
+        "bytes": index["bytes"],
+        "max_bytes": settings.DASHBOARD_CACHE_MAX_BYTES_PER_ORG,
+        "views": by_view,
+    }
+
+
+# ---------- Entries ----------
+
+def _make_digest(view, request):
+    params = sorted(
+        (key, sorted(values)) for key, values in request.query_params.lists()
+    )
+    raw = json.dumps([view, params, timezone.localdate().isoformat()])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _store(org_id, version, digest, entry, size, timeout):
+    """
+    Save an entry and keep the organization's footprint under
+    DASHBOARD_CACHE_MAX_BYTES_PER_ORG, evicting its oldest entries first.
+    """
+    max_bytes = settings.DASHBOARD_CACHE_MAX_BYTES_PER_ORG
+    if size > max_bytes:
+        return
+
+    index_key = INDEX_KEY.format(org_id=org_id)
+    index = cache.get(index_key)
+    if not index or index["version"] != version:
+        if index:
+            cache.delete_many([
+                ENTRY_KEY.format(org_id=org_id, version=index["version"], digest=d)
+                for d in index["entries"]
+            ])
+        index = {"version": version, "entries": {}, "bytes": 0}
+
+    previous = index["entries"].pop(digest, 0)
+    index["bytes"] -= previous
+
+    evicted = []
+    while index["entries"] and index["bytes"] + size > max_bytes:
+        oldest = next(iter(index["entries"]))
+        index["bytes"] -= index["entries"].pop(oldest)
+        evicted.append(ENTRY_KEY.format(org_id=org_id, version=version, digest=oldest))
+    if evicted:
+        cache.delete_many(evicted)
+
+    index["entries"][digest] = size
+    index["bytes"] += size
+    cache.set(ENTRY_KEY.format(org_id=org_id, version=version, digest=digest), entry, timeout)
+    cache.set(index_key, index, timeout)
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if "*" in etags:
+        return True
+    return _strip_weak(etag) in {_strip_weak(value) for value in etags}
+
+
+def _respond(request, entry):
+    if _etag_matches(request, entry["etag"]):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry["data"])
+    response["ETag"] = entry["etag"]
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def cached_dashboard_response(timeout=None):
+    """
+    Decorator for dashboard `get` handlers.
+
+    Successful responses are cached under the organization's current data
+    version; `timeout` overrides DASHBOARD_CACHE_TIMEOUT for views whose
+    data is not covered by the version bumps (e.g. web events).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            org_id = getattr(request.organization, "pk", None)
+            if org_id is None:
+                return method(self, request, *args, **kwargs)
+
+            view = self.__class__.__name__
+            version = get_data_version(org_id)
+            digest = _make_digest(view, request)
+            entry_key = ENTRY_KEY.format(org_id=org_id, version=version, digest=digest)
+
+            entry = cache.get(entry_key)
+            if entry is not None:
+                hit = _etag_matches(request, entry["etag"])
+                _record(org_id, view, "not_modified" if hit else "hit")
+                return _respond(request, entry)
+
+            _record(org_id, view, "miss")
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            body = json.dumps(response.data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+            entry = {
+                "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+                "data": response.data,
+            }
+            ttl = timeout if timeout is not None else settings.DASHBOARD_CACHE_TIMEOUT
+            _store(org_id, version, digest, entry, len(body), ttl)
+            return _respond(request, entry)
+
+        return wrapper
+
+    return decorator
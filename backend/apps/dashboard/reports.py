@@ -0,0 +1,185 @@
+"""
+ADR / RevPAR / occupancy report engine over the ReservationNight fact table.
+
+All metrics come from one grouped query on the facts; room counts for the
+available-inventory denominator come from two small count queries.
+
+    occupancy = nights sold / available room-nights
+    ADR       = revenue / nights sold
+    RevPAR    = revenue / available room-nights
+
+Available room-nights use the rooms of the row's room type (or property,
+or the whole organization) times the days of the range covered by the
+row. Rows split by origin_type or status share the full inventory, so
+their occupancy reads as a share of it.
+"""
+import calendar
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from apps.reservations.models import ReservationNight
+from apps.rooms.models import Room, RoomType
+
+DIMENSIONS = {
+    "property": "property_id",
+    "room_type": "room_type_id",
+    "origin_type": "origin_type",
+    "status": "status",
+    "month": "month",
+    "date": "date",
+}
+
+REVENUE_STATUSES = ["confirmed", "check_in", "check_out"]
+
+QUANTIZE = Decimal("0.01")
+
+
+def build_report(organization, start, end, group_by, property_id=None, statuses=None):
+    """
+    Pivot the stay-night facts between start and end (inclusive).
+
+    Args:
+        group_by: list of keys from DIMENSIONS (may be empty for totals only)
+        statuses: reservation statuses to count (default REVENUE_STATUSES)
+    """
+    facts = ReservationNight.objects.filter(
+        organization=organization,
+        date__gte=start,
+        date__lte=end,
+        status__in=statuses or REVENUE_STATUSES,
+    )
+    if property_id:
+        facts = facts.filter(property_id=property_id)
+    if "month" in group_by:
+        facts = facts.annotate(month=TruncMonth("date"))
+
+    columns = [DIMENSIONS[dim] for dim in group_by]
+    if columns:
+        rows = (
+            facts.values(*columns)
+            .annotate(nights=Count("id"), revenue=Sum("revenue"))
+            .order_by(*columns)
+        )
+    else:
+        rows = [facts.aggregate(nights=Count("id"), revenue=Sum("revenue"))]
+
+    rooms = _room_counts(organization, property_id)
+    names = _names(organization, group_by)
+
+    results = []
+    total_nights = 0
+    total_revenue = Decimal("0")
+    for row in rows:
+        group = {}
+        for dim, column in zip(group_by, columns):
+            value = row[column]
+            if dim == "month":
+                value = value.date() if hasattr(value, "date") else value
+                group[dim] = value.strftime("%Y-%m")
+            elif dim == "date":
+                group[dim] = value.isoformat()
+            elif dim in ("property", "room_type"):
+                group[dim] = str(value)
+                group[f"{dim}_name"] = names[dim].get(value, "")
+            else:
+                group[dim] = value
+
+        room_count = _rooms_for(row, group_by, rooms)
+        days = _days_for(row, group_by, start, end)
+        total_nights += row["nights"]
+        total_revenue += row["revenue"] or Decimal("0")
+        results.append({
+            **group,
+            **_metrics(row["nights"], row["revenue"], room_count * days),
+        })
+
+    total_days = (end - start).days + 1
+    return {
+        "period": {"start": start.isoformat(), "end": end.isoformat()},
+        "group_by": group_by,
+        "rows": results,
+        "totals": _metrics(total_nights, total_revenue, rooms["total"] * total_days),
+    }
+
+
+def _metrics(nights, revenue, available):
+    revenue = revenue or Decimal("0")
+    return {
+        "room_nights": nights,
+        "available_room_nights": available,
+        "revenue": str(revenue.quantize(QUANTIZE)),
+        "occupancy_rate": round(nights / available * 100, 1) if available else 0,
+        "adr": str((revenue / nights).quantize(QUANTIZE)) if nights else "0.00",
+        "revpar": str((revenue / available).quantize(QUANTIZE)) if available else "0.00",
+    }
+
+
+def _room_counts(organization, property_id):
+    rooms = Room.objects.filter(property__organization=organization)
+    if property_id:
+        rooms = rooms.filter(property_id=property_id)
+
+    by_property = dict(
+        rooms.values_list("property_id").annotate(n=Count("id")).values_list("property_id", "n")
+    )
+    by_room_type = dict(
+        Room.room_types.through.objects.filter(room__in=rooms)
+        .values_list("roomtype_id")
+        .annotate(n=Count("room_id"))
+        .values_list("roomtype_id", "n")
+    )
+    return {
+        "total": sum(by_property.values()),
+        "property": by_property,
+        "room_type": by_room_type,
+    }
+
+
+def _names(organization, group_by):
+    names = {"property": {}, "room_type": {}}
+    if "property" in group_by:
+        names["property"] = dict(
+            organization.properties.values_list("id", "name")
+        )
+    if "room_type" in group_by:
+        names["room_type"] = dict(
+            RoomType.objects.filter(property__organization=organization).values_list("id", "name")
+        )
+    return names
+
+
+def _rooms_for(row, group_by, rooms):
+    if "room_type" in group_by:
+        return rooms["room_type"].get(row["room_type_id"], 0)
+    if "property" in group_by:
+        return rooms["property"].get(row["property_id"], 0)
+    return rooms["total"]
+
+
+def _days_for(row, group_by, start, end):
+    if "date" in group_by:
+        return 1
+    if "month" in group_by:
+        month = row["month"]
+        month = month.date() if hasattr(month, "date") else month
+        first = max(start, month)
+        last_day = calendar.monthrange(month.year, month.month)[1]
+        last = min(end, date(month.year, month.month, last_day))
+        return (last - first).days + 1
+    return (end - start).days + 1
+
+
+def parse_range(params, today):
+    """Read start_date/end_date (default: current month) from query params."""
+    start_param = params.get("start_date")
+    end_param = params.get("end_date")
+    start = date.fromisoformat(start_param) if start_param else today.replace(day=1)
+    if end_param:
+        end = date.fromisoformat(end_param)
+    else:
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        end = next_month - timedelta(days=1)
+    return start, end
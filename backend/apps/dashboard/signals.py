@@ -0,0 +1,55 @@
+"""
+Bump the dashboard data version whenever a model the dashboard reads from
+is written. The bump runs on commit so a concurrent request cannot cache
+pre-commit data under the new version.
+"""
+import functools
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.organizations.models import Property
+from apps.reservations.models import Payment, Reservation
+from apps.rooms.models import Room, RoomType
+from apps.tasks.models import Task
+
+from .cache import bump_data_version
+
+
+@functools.lru_cache(maxsize=1024)
+def _property_org_id(property_id):
+    # A property never moves between organizations, so the lookup can be
+    # memoized per process instead of loading instance.property on every save.
+    return (
+        Property.objects.filter(pk=property_id)
+        .values_list("organization_id", flat=True)
+        .first()
+    )
+
+
+def _schedule_bump(org_id):
+    if org_id:
+        transaction.on_commit(lambda: bump_data_version(org_id))
+
+
+@receiver([post_save, post_delete], sender=Reservation)
+@receiver([post_save, post_delete], sender=Payment)
+@receiver([post_save, post_delete], sender=Task)
+def bump_on_tenant_write(sender, instance, **kwargs):
+    _schedule_bump(instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=RoomType)
+def bump_on_property_write(sender, instance, **kwargs):
+    if instance.property_id:
+        _schedule_bump(_property_org_id(instance.property_id))
+
+
+@receiver(m2m_changed, sender=Room.room_types.through)
+def bump_on_room_types_change(sender, instance, action, **kwargs):
+    # `instance` is a Room or a RoomType depending on the side written from;
+    # both belong to a property.
+    if action in ("post_add", "post_remove", "post_clear") and instance.property_id:
+        _schedule_bump(_property_org_id(instance.property_id))
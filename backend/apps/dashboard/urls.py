@@ -1,10 +1,23 @@
 from django.urls import path
 
-from .views import OccupancyView, RevenueView, TodayView, WebFunnelView
+from .views import (
+    DashboardCacheStatsView,
+    OccupancyView,
+    PortfolioView,
+    ReportsView,
+    RevenueView,
+    SearchDemandView,
+    TodayView,
+    WebFunnelView,
+)
 
 urlpatterns = [
     path("today/", TodayView.as_view(), name="dashboard-today"),
+    path("portfolio/", PortfolioView.as_view(), name="dashboard-portfolio"),
     path("occupancy/", OccupancyView.as_view(), name="dashboard-occupancy"),
     path("revenue/", RevenueView.as_view(), name="dashboard-revenue"),
     path("web-funnel/", WebFunnelView.as_view(), name="dashboard-web-funnel"),
+    path("reports/", ReportsView.as_view(), name="dashboard-reports"),
+    path("search-demand/", SearchDemandView.as_view(), name="dashboard-search-demand"),
+    path("cache-stats/", DashboardCacheStatsView.as_view(), name="dashboard-cache-stats"),
 ]
@@ -1,17 +1,23 @@
-from datetime import timedelta
+import uuid
+from datetime import date, timedelta
 from decimal import Decimal
 
 from django.db.models import Count, Min, Q, Sum
 from django.utils import timezone
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.common.permissions import HasRolePermission
-from apps.events.models import EventLog
-from apps.reservations.models import Payment, Reservation
+from apps.events.models import EventLog, SearchDemand
+from apps.events.sketches import session_counts as approx_session_counts
+from apps.reservations.models import Payment, Reservation, ReservationNight
 from apps.rooms.models import Room, RoomType
 from apps.tasks.models import Task
 
+from .cache import cached_dashboard_response, get_cache_stats
+from .reports import DIMENSIONS as REPORT_DIMENSIONS, build_report, parse_range
+
 
 class TodayView(APIView):
     """
@@ -19,6 +25,7 @@ class TodayView(APIView):
     Summary of today's operations for the current organization.
     """
 
+    @cached_dashboard_response()
     def get(self, request):
         org = request.organization
         today = timezone.localdate()
@@ -222,6 +229,160 @@ class TodayView(APIView):
         })
 
 
+class PortfolioView(APIView):
+    """
+    GET /api/v1/dashboard/portfolio/
+    Today's KPIs for every property of the organization in one response.
+    Each source table is read with a single query grouped by property.
+    """
+    required_role = "owner"
+    permission_classes = [HasRolePermission]
+
+    @cached_dashboard_response()
+    def get(self, request):
+        org = request.organization
+        today = timezone.localdate()
+        tomorrow = today + timedelta(days=1)
+
+        properties = list(
+            org.properties.filter(is_active=True)
+            .order_by("name")
+            .values("id", "name", "city")
+        )
+
+        # --- Reservations ---
+        reservation_counts = {
+            row["property_id"]: row
+            for row in Reservation.objects.filter(organization=org)
+            .values("property_id")
+            .annotate(
+                check_ins_today=Count("id", filter=Q(
+                    check_in_date=today,
+                    operational_status__in=["confirmed", "check_in"],
+                )),
+                check_outs_today=Count("id", filter=Q(
+                    check_out_date=today,
+                    operational_status__in=["check_in", "check_out"],
+                )),
+                in_house=Count("id", filter=Q(operational_status="check_in")),
+                incomplete=Count("id", filter=Q(operational_status="incomplete")),
+                pending=Count("id", filter=Q(operational_status="pending")),
+                unconfirmed_tomorrow=Count("id", filter=Q(
+                    check_in_date=tomorrow,
+                    operational_status__in=["incomplete", "pending"],
+                )),
+            )
+            .order_by()
+        }
+
+        # --- Rooms ---
+        room_status_counts = {}
+        for property_id, room_status, count in (
+            Room.objects.filter(property__organization=org)
+            .values_list("property_id", "status")
+            .annotate(count=Count("id"))
+            .order_by()
+        ):
+            room_status_counts.setdefault(property_id, {})[room_status] = count
+
+        # --- Tasks ---
+        task_counts = {
+            row["property_id"]: row
+            for row in Task.objects.filter(organization=org)
+            .values("property_id")
+            .annotate(
+                pending=Count("id", filter=Q(status="pending")),
+                in_progress=Count("id", filter=Q(status="in_progress")),
+                completed_today=Count("id", filter=Q(
+                    status="completed", completed_at__date=today,
+                )),
+                urgent=Count("id", filter=Q(
+                    status__in=["pending", "in_progress"],
+                    priority__in=["high", "urgent"],
+                )),
+            )
+            .order_by()
+        }
+
+        # --- Today's revenue ---
+        revenue_today = dict(
+            Payment.objects.filter(
+                organization=org,
+                status="completed",
+                processed_at__date=today,
+            )
+            .values_list("reservation__property_id")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+
+        empty_reservations = {
+            "check_ins_today": 0, "check_outs_today": 0, "in_house": 0,
+            "incomplete": 0, "pending": 0, "unconfirmed_tomorrow": 0,
+        }
+        empty_tasks = {"pending": 0, "in_progress": 0, "completed_today": 0, "urgent": 0}
+
+        results = []
+        totals = {
+            "reservations": dict(empty_reservations),
+            "rooms": {"total": 0, "occupied": 0, "dirty": 0, "ready": 0, "not_ready": 0},
+            "tasks": dict(empty_tasks),
+            "revenue_today": Decimal("0"),
+        }
+        for prop in properties:
+            pid = prop["id"]
+            reservations = {
+                key: reservation_counts.get(pid, {}).get(key, 0)
+                for key in empty_reservations
+            }
+            tasks = {key: task_counts.get(pid, {}).get(key, 0) for key in empty_tasks}
+            by_status = room_status_counts.get(pid, {})
+            total_rooms = sum(by_status.values())
+            rooms = {
+                "total": total_rooms,
+                "occupied": by_status.get("occupied", 0),
+                "dirty": by_status.get("dirty", 0),
+                "ready": by_status.get("available", 0),
+                "not_ready": sum(
+                    by_status.get(s, 0) for s in ("dirty", "cleaning", "inspection")
+                ),
+            }
+            revenue = revenue_today.get(pid) or Decimal("0")
+
+            for key, value in reservations.items():
+                totals["reservations"][key] += value
+            for key, value in rooms.items():
+                totals["rooms"][key] += value
+            for key, value in tasks.items():
+                totals["tasks"][key] += value
+            totals["revenue_today"] += revenue
+
+            results.append({
+                "id": str(pid),
+                "name": prop["name"],
+                "city": prop["city"],
+                "reservations": reservations,
+                "rooms": {**rooms, "by_status": by_status},
+                "occupancy_rate": (
+                    round(rooms["occupied"] / total_rooms * 100, 1) if total_rooms else 0
+                ),
+                "tasks": tasks,
+                "revenue_today": str(revenue),
+            })
+
+        total_rooms = totals["rooms"]["total"]
+        totals["occupancy_rate"] = (
+            round(totals["rooms"]["occupied"] / total_rooms * 100, 1) if total_rooms else 0
+        )
+        totals["revenue_today"] = str(totals["revenue_today"])
+
+        return Response({
+            "date": today.isoformat(),
+            "properties": results,
+            "totals": totals,
+        })
+
+
 class OccupancyView(APIView):
     """
     GET /api/v1/dashboard/occupancy/
@@ -229,6 +390,7 @@ class OccupancyView(APIView):
     Query params: property, days (default 7)
     """
 
+    @cached_dashboard_response()
     def get(self, request):
         org = request.organization
         today = timezone.localdate()
@@ -289,6 +451,7 @@ class RevenueView(APIView):
     required_role = "owner"
     permission_classes = [HasRolePermission]
 
+    @cached_dashboard_response()
     def get(self, request):
         org = request.organization
         today = timezone.localdate()
@@ -384,7 +547,8 @@ class WebFunnelView(APIView):
     """
     GET /api/v1/dashboard/web-funnel/
     Web funnel analytics for the booking engine.
-    Query params: property (optional), period (today|7d|30d, default 7d)
+    Query params: property (optional), period (today|7d|30d|90d, default 7d),
+    approx (1 = distinct sessions from merged daily HyperLogLog sketches)
     """
     required_role = "owner"
     permission_classes = [HasRolePermission]
@@ -405,17 +569,22 @@ class WebFunnelView(APIView):
         "otp_verified",
     ]
 
+    # Web events do not bump the data version, so keep these entries short-lived.
+    @cached_dashboard_response(timeout=60)
     def get(self, request):
         org = request.organization
         today = timezone.localdate()
         property_id = request.query_params.get("property")
         period = request.query_params.get("period", "7d")
+        approx = request.query_params.get("approx") in ("1", "true")
 
         # Determine date range
         if period == "today":
             start = today
         elif period == "30d":
             start = today - timedelta(days=29)
+        elif period == "90d":
+            start = today - timedelta(days=89)
         else:  # 7d
             start = today - timedelta(days=6)
         end = today
@@ -427,25 +596,28 @@ class WebFunnelView(APIView):
             created_at__date__lte=end,
         )
 
-        funnel = []
-        for step in self.FUNNEL_STEPS:
-            sessions = (
-                event_qs.filter(event_name=step)
-                .values("session_id")
-                .distinct()
-                .count()
+        if approx:
+            session_counts = approx_session_counts(
+                org, start, end, self.FUNNEL_STEPS + self.FRICTION_EVENTS,
             )
-            funnel.append({"step": step, "sessions": sessions})
+        else:
+            session_counts = {
+                name: (
+                    event_qs.filter(event_name=name)
+                    .values("session_id")
+                    .distinct()
+                    .count()
+                )
+                for name in self.FUNNEL_STEPS + self.FRICTION_EVENTS
+            }
+
+        funnel = [
+            {"step": step, "sessions": session_counts[step]}
+            for step in self.FUNNEL_STEPS
+        ]
 
         # --- Checkout friction metrics ---
-        friction_counts = {}
-        for evt in self.FRICTION_EVENTS:
-            friction_counts[evt] = (
-                event_qs.filter(event_name=evt)
-                .values("session_id")
-                .distinct()
-                .count()
-            )
+        friction_counts = {evt: session_counts[evt] for evt in self.FRICTION_EVENTS}
 
         lookup_started = friction_counts["guest_lookup_started"]
         login_success = friction_counts["guest_login_success"]
@@ -531,23 +703,30 @@ class WebFunnelView(APIView):
         prev_end = start - timedelta(days=1)
         prev_start = prev_end - timedelta(days=period_days - 1)
 
-        prev_event_qs = EventLog.objects.filter(
-            organization=org,
-            created_at__date__gte=prev_start,
-            created_at__date__lte=prev_end,
-        )
-        prev_page_views = (
-            prev_event_qs.filter(event_name="page_view")
-            .values("session_id")
-            .distinct()
-            .count()
-        )
-        prev_confirmed = (
-            prev_event_qs.filter(event_name="booking_confirmed")
-            .values("session_id")
-            .distinct()
-            .count()
-        )
+        if approx:
+            prev_counts = approx_session_counts(
+                org, prev_start, prev_end, ["page_view", "booking_confirmed"],
+            )
+            prev_page_views = prev_counts["page_view"]
+            prev_confirmed = prev_counts["booking_confirmed"]
+        else:
+            prev_event_qs = EventLog.objects.filter(
+                organization=org,
+                created_at__date__gte=prev_start,
+                created_at__date__lte=prev_end,
+            )
+            prev_page_views = (
+                prev_event_qs.filter(event_name="page_view")
+                .values("session_id")
+                .distinct()
+                .count()
+            )
+            prev_confirmed = (
+                prev_event_qs.filter(event_name="booking_confirmed")
+                .values("session_id")
+                .distinct()
+                .count()
+            )
         prev_conversion_rate = (
             round(prev_confirmed / prev_page_views * 100, 2)
             if prev_page_views > 0
@@ -560,6 +739,7 @@ class WebFunnelView(APIView):
                 "start": start.isoformat(),
                 "end": end.isoformat(),
             },
+            "approx": approx,
             "funnel": funnel,
             "checkout_friction": {
                 "guest_lookup_started": lookup_started,
@@ -583,3 +763,200 @@ class WebFunnelView(APIView):
                 "wow_change": wow_change,
             },
         })
+
+
+class ReportsView(APIView):
+    """
+    GET /api/v1/dashboard/reports/
+    Room-nights, occupancy, ADR and RevPAR from the stay-night fact table.
+    Query params: start_date, end_date (default current month), property,
+    group_by (comma list: property, room_type, origin_type, status, month, date),
+    status (comma list, default confirmed,check_in,check_out)
+    """
+    required_role = "owner"
+    permission_classes = [HasRolePermission]
+
+    MAX_DAYS = 731
+
+    @cached_dashboard_response()
+    def get(self, request):
+        params = request.query_params
+        try:
+            start, end = parse_range(params, timezone.localdate())
+        except ValueError:
+            return Response(
+                {"detail": "Formato de fecha inválido. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end < start:
+            return Response(
+                {"detail": "end_date debe ser posterior a start_date."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (end - start).days + 1 > self.MAX_DAYS:
+            return Response(
+                {"detail": f"El rango máximo es de {self.MAX_DAYS} días."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        group_by = [g for g in params.get("group_by", "").split(",") if g]
+        invalid = [g for g in group_by if g not in REPORT_DIMENSIONS]
+        if invalid:
+            return Response(
+                {"detail": f"group_by inválido: {', '.join(invalid)}. "
+                           f"Opciones: {', '.join(REPORT_DIMENSIONS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if "month" in group_by and "date" in group_by:
+            return Response(
+                {"detail": "No se puede agrupar por month y date a la vez."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        property_id = params.get("property") or None
+        if property_id:
+            try:
+                property_id = uuid.UUID(property_id)
+            except ValueError:
+                return Response(
+                    {"detail": "property debe ser un UUID válido."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        statuses = [s for s in params.get("status", "").split(",") if s] or None
+
+        return Response(build_report(
+            request.organization,
+            start,
+            end,
+            group_by=list(dict.fromkeys(group_by)),
+            property_id=property_id,
+            statuses=statuses,
+        ))
+
+
+class SearchDemandView(APIView):
+    """
+    GET /api/v1/dashboard/search-demand/
+    Searched stay nights per date (from the SearchDemand rollup) next to
+    booked room-nights, to spot dates with demand the hotel is not capturing.
+    Query params: start_date, end_date (default today .. +59 days)
+    """
+    required_role = "owner"
+    permission_classes = [HasRolePermission]
+
+    MAX_DAYS = 366
+    DEFAULT_DAYS = 60
+    TOP_DATES = 10
+    BOOKED_STATUSES = [
+        Reservation.OperationalStatus.INCOMPLETE,
+        Reservation.OperationalStatus.PENDING,
+        Reservation.OperationalStatus.CONFIRMED,
+        Reservation.OperationalStatus.CHECK_IN,
+        Reservation.OperationalStatus.CHECK_OUT,
+    ]
+
+    @cached_dashboard_response(timeout=300)
+    def get(self, request):
+        org = request.organization
+        today = timezone.localdate()
+        try:
+            start_param = request.query_params.get("start_date")
+            end_param = request.query_params.get("end_date")
+            start = date.fromisoformat(start_param) if start_param else today
+            end = (
+                date.fromisoformat(end_param) if end_param
+                else start + timedelta(days=self.DEFAULT_DAYS - 1)
+            )
+        except ValueError:
+            return Response(
+                {"detail": "Formato de fecha inválido. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end < start:
+            return Response(
+                {"detail": "end_date debe ser posterior a start_date."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (end - start).days + 1 > self.MAX_DAYS:
+            return Response(
+                {"detail": f"El rango máximo es de {self.MAX_DAYS} días."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        demand = {
+            row["stay_date"]: row
+            for row in SearchDemand.objects.filter(
+                organization=org, stay_date__gte=start, stay_date__lte=end,
+            ).values("stay_date", "searches", "arrivals", "guests", "zero_result_searches")
+        }
+        booked = dict(
+            ReservationNight.objects.filter(
+                organization=org,
+                date__gte=start,
+                date__lte=end,
+                status__in=self.BOOKED_STATUSES,
+            ).values_list("date").annotate(n=Count("id")).values_list("date", "n")
+        )
+        total_rooms = Room.objects.filter(property__organization=org).count()
+
+        days = []
+        day = start
+        while day <= end:
+            row = demand.get(day, {})
+            searches = row.get("searches", 0)
+            booked_nights = booked.get(day, 0)
+            days.append({
+                "date": day.isoformat(),
+                "searches": searches,
+                "arrivals": row.get("arrivals", 0),
+                "zero_result_searches": row.get("zero_result_searches", 0),
+                "avg_party_size": round(row["guests"] / searches, 2) if searches else None,
+                "booked_nights": booked_nights,
+                "occupancy_rate": (
+                    round(booked_nights / total_rooms * 100, 1) if total_rooms else 0
+                ),
+            })
+            day += timedelta(days=1)
+
+        top = sorted(
+            (d for d in days if d["searches"] or d["zero_result_searches"]),
+            key=lambda d: (d["searches"] + d["zero_result_searches"], d["date"]),
+            reverse=True,
+        )[:self.TOP_DATES]
+
+        return Response({
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "total_rooms": total_rooms,
+            "totals": {
+                "searches": sum(d["searches"] for d in days),
+                "arrivals": sum(d["arrivals"] for d in days),
+                "zero_result_searches": sum(d["zero_result_searches"] for d in days),
+                "booked_nights": sum(d["booked_nights"] for d in days),
+            },
+            "top_dates": [d["date"] for d in top],
+            "days": days,
+        })
+
+
+class DashboardCacheStatsView(APIView):
+    """
+    GET /api/v1/dashboard/cache-stats/
+    Hit rate and footprint of the dashboard response cache for the organization.
+    """
+    required_role = "owner"
+    permission_classes = [HasRolePermission]
+
+    CACHED_VIEWS = [
+        TodayView.__name__,
+        PortfolioView.__name__,
+        OccupancyView.__name__,
+        RevenueView.__name__,
+        WebFunnelView.__name__,
+        ReportsView.__name__,
+        SearchDemandView.__name__,
+    ]
+
+    def get(self, request):
+        return Response(get_cache_stats(request.organization.pk, self.CACHED_VIEWS))
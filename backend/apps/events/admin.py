@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import EventLog
+from .models import (
+    EventDailyAggregate,
+    EventLog,
+    EventRetentionPolicy,
+    EventRollupCursor,
+    EventSessionSketch,
+    SearchDemand,
+)
 
 
 @admin.register(EventLog)
@@ -8,5 +15,37 @@ class EventLogAdmin(admin.ModelAdmin):
     list_display = ["event_name", "session_id", "organization", "created_at"]
     list_filter = ["event_name", "organization", "created_at"]
     search_fields = ["session_id", "event_name"]
-    readonly_fields = ["id", "organization", "guest", "session_id", "event_name", "metadata", "created_at"]
+    readonly_fields = ["id", "organization", "guest", "session_id", "event_name", "metadata", "created_at", "received_at"]
     date_hierarchy = "created_at"
+
+
+@admin.register(EventDailyAggregate)
+class EventDailyAggregateAdmin(admin.ModelAdmin):
+    list_display = ["date", "event_name", "organization", "events", "sessions"]
+    list_filter = ["event_name", "organization"]
+    date_hierarchy = "date"
+
+
+@admin.register(EventRetentionPolicy)
+class EventRetentionPolicyAdmin(admin.ModelAdmin):
+    list_display = ["organization", "raw_retention_days", "archive_raw", "updated_at"]
+
+
+@admin.register(EventSessionSketch)
+class EventSessionSketchAdmin(admin.ModelAdmin):
+    list_display = ["date", "event_name", "organization", "updated_at"]
+    list_filter = ["event_name", "organization"]
+    exclude = ["sketch"]
+    date_hierarchy = "date"
+
+
+@admin.register(SearchDemand)
+class SearchDemandAdmin(admin.ModelAdmin):
+    list_display = ["stay_date", "organization", "searches", "arrivals", "zero_result_searches"]
+    list_filter = ["organization"]
+    date_hierarchy = "stay_date"
+
+
+@admin.register(EventRollupCursor)
+class EventRollupCursorAdmin(admin.ModelAdmin):
+    list_display = ["name", "position", "updated_at"]
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.models import MIN_RAW_RETENTION_DAYS
+from apps.events.retention import compact_day, pending_days, retention_for
+from apps.organizations.models import Organization
+
+
+class Command(BaseCommand):
+    help = "Roll up, archive and delete EventLog rows older than each organization's retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            help="Only this organization (subdomain)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help=f"Override the retention in days for this run (minimum {MIN_RAW_RETENTION_DAYS})",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows archived and deleted per transaction (default: 2000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the days that would be compacted",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] is not None and options["days"] < MIN_RAW_RETENTION_DAYS:
+            raise CommandError(
+                f"--days must be at least {MIN_RAW_RETENTION_DAYS}: the web funnel "
+                "compares against raw events of the previous period."
+            )
+
+        orgs = Organization.objects.select_related("event_retention_policy").order_by("name")
+        if options["organization"]:
+            orgs = orgs.filter(subdomain=options["organization"])
+            if not orgs.exists():
+                raise CommandError(f"Organization '{options['organization']}' not found.")
+
+        total = 0
+        for org in orgs:
+            days, archive = retention_for(org)
+            if options["days"] is not None:
+                days = options["days"]
+
+            pending = pending_days(org, days)
+            if not pending:
+                continue
+
+            self.stdout.write(
+                f"{org.name}: {len(pending)} day(s) older than {days}d "
+                f"({pending[0]} .. {pending[-1]})"
+            )
+            if options["dry_run"]:
+                continue
+
+            for day in pending:
+                removed = compact_day(org, day, archive=archive, chunk_size=options["chunk_size"])
+                total += removed
+                self.stdout.write(f"  {day}: {removed} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Rows compacted: {total}"))
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.events.services import drain_spool
+
+
+class Command(BaseCommand):
+    help = "Load spooled tracking events into EventLog (EVENTS_INGEST_MODE=spool)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Events per bulk insert (default: 5000)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Seconds between passes with --loop (default: EVENTS_SPOOL_MAX_LATENCY / 2)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        interval = options["interval"] or settings.EVENTS_SPOOL_MAX_LATENCY / 2
+
+        while True:
+            stats = drain_spool(batch_size)
+            if stats is None:
+                self.stdout.write("Another drainer is running.")
+            elif stats["events"] or stats["segments"] or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Done. Events: {stats['events']}, Segments removed: {stats['segments']}"
+                    )
+                )
+            if not options["loop"]:
+                return
+            time.sleep(interval)
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.events.search_demand import rollup_search_demand
+
+
+class Command(BaseCommand):
+    help = "Add search events received since the last run to SearchDemand"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window-hours",
+            type=int,
+            default=6,
+            help="Hours of events applied per transaction (default: 6)",
+        )
+
+    def handle(self, *args, **options):
+        stats = rollup_search_demand(window=timedelta(hours=max(options["window_hours"], 1)))
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Events: {stats['events']}, skipped: {stats['skipped']}, "
+            f"windows: {stats['windows']}"
+        ))
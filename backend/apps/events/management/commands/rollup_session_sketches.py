@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.events.sketches import save_sketches, sketch_raw_events
+from apps.organizations.models import Organization
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily HyperLogLog session sketches from raw events"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            help="Only this organization (subdomain)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="Complete days to rebuild, counting back from yesterday (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        orgs = Organization.objects.order_by("name")
+        if options["organization"]:
+            orgs = orgs.filter(subdomain=options["organization"])
+            if not orgs.exists():
+                raise CommandError(f"Organization '{options['organization']}' not found.")
+
+        end = timezone.localdate() - timedelta(days=1)
+        start = end - timedelta(days=max(options["days"], 1) - 1)
+
+        total = 0
+        for org in orgs:
+            sketches = sketch_raw_events(org, start, end)
+            save_sketches(org, sketches, replace=True)
+            total += len(sketches)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. Sketches written: {total} ({start} .. {end})")
+        )
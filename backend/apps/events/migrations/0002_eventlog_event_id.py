@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        ('guests', '0005_add_critical_indexes'),
+        ('organizations', '0011_bank_account_org_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventlog',
+            name='event_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='eventlog',
+            constraint=models.UniqueConstraint(fields=('organization', 'event_id'), name='event_log_org_event_id_unique'),
+        ),
+    ]
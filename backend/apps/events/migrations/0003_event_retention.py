@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:06
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_eventlog_event_id'),
+        ('organizations', '0011_bank_account_org_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRetentionPolicy',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('raw_retention_days', models.PositiveSmallIntegerField(default=90, validators=[django.core.validators.MinValueValidator(60)])),
+                ('archive_raw', models.BooleanField(default=True, help_text='Guardar los eventos crudos en NDJSON comprimido antes de borrarlos.')),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='event_retention_policy', to='organizations.organization')),
+            ],
+            options={
+                'verbose_name_plural': 'event retention policies',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('event_name', models.CharField(max_length=50)),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_daily_aggregates', to='organizations.organization')),
+            ],
+            options={
+                'ordering': ['-date', 'event_name'],
+                'constraints': [models.UniqueConstraint(fields=('organization', 'date', 'event_name'), name='event_daily_agg_unique')],
+            },
+        ),
+    ]
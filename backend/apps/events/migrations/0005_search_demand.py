@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_eventsessionsketch'),
+        ('guests', '0005_add_critical_indexes'),
+        ('organizations', '0011_bank_account_org_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRollupCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('position', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchDemand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stay_date', models.DateField()),
+                ('searches', models.PositiveIntegerField(default=0)),
+                ('arrivals', models.PositiveIntegerField(default=0)),
+                ('guests', models.PositiveIntegerField(default=0)),
+                ('zero_result_searches', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['stay_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='eventlog',
+            name='received_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='eventlog',
+            index=models.Index(fields=['event_name', 'received_at'], name='events_even_event_n_7f85b5_idx'),
+        ),
+        migrations.AddField(
+            model_name='searchdemand',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_demand', to='organizations.organization'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchdemand',
+            constraint=models.UniqueConstraint(fields=('organization', 'stay_date'), name='search_demand_unique'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def raise_short_policies(apps, schema_editor):
+    EventRetentionPolicy = apps.get_model("events", "EventRetentionPolicy")
+    EventRetentionPolicy.objects.filter(raw_retention_days__lt=180).update(raw_retention_days=180)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_search_demand'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventretentionpolicy',
+            name='raw_retention_days',
+            field=models.PositiveSmallIntegerField(default=180, validators=[django.core.validators.MinValueValidator(180)]),
+        ),
+        migrations.RunPython(raise_short_policies, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,10 @@
 import uuid
 
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
+
+from apps.common.models import BaseModel
 
 
 class EventLog(models.Model):
@@ -18,6 +22,9 @@ class EventLog(models.Model):
         "booking_abandoned",
     }
 
+    # Recorded server-side by AvailabilityView, never accepted from clients
+    SEARCH_NO_RESULTS = "search_no_results"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     organization = models.ForeignKey(
         "organizations.Organization",
@@ -31,18 +38,156 @@ class EventLog(models.Model):
         blank=True,
         related_name="event_logs",
     )
+    # Client-generated id; retried beacons reuse it and are deduped on insert
+    event_id = models.CharField(max_length=64, null=True, blank=True)
     session_id = models.CharField(max_length=64, db_index=True)
     event_name = models.CharField(max_length=50, db_index=True)
     metadata = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(db_index=True)
+    # Server insert time; watermark for incremental rollups (created_at is
+    # the client clock and arrives out of order)
+    received_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
+            models.Index(fields=["event_name", "received_at"]),
             models.Index(fields=["organization", "event_name"]),
             models.Index(fields=["organization", "created_at"]),
             models.Index(fields=["organization", "session_id"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "event_id"],
+                name="event_log_org_event_id_unique",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.event_name} | {self.session_id[:8]} | {self.created_at}"
+
+
+class EventDailyAggregate(models.Model):
+    """Daily rollup of raw events, kept after the raw rows are compacted."""
+
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="event_daily_aggregates",
+    )
+    date = models.DateField()
+    event_name = models.CharField(max_length=50)
+    events = models.PositiveIntegerField(default=0)
+    sessions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date", "event_name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "date", "event_name"],
+                name="event_daily_agg_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} | {self.date} | {self.events}"
+
+
+# The web funnel reads up to 90 days of raw events (exact counts and
+# checkout times) plus the previous 90 for comparisons, so shorter
+# retention would make it undercount.
+MIN_RAW_RETENTION_DAYS = 180
+
+
+class EventRetentionPolicy(BaseModel):
+    """Per-organization retention of raw EventLog rows."""
+
+    organization = models.OneToOneField(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="event_retention_policy",
+    )
+    raw_retention_days = models.PositiveSmallIntegerField(
+        default=MIN_RAW_RETENTION_DAYS,
+        validators=[MinValueValidator(MIN_RAW_RETENTION_DAYS)],
+    )
+    archive_raw = models.BooleanField(
+        default=True,
+        help_text="Guardar los eventos crudos en NDJSON comprimido antes de borrarlos.",
+    )
+
+    class Meta:
+        verbose_name_plural = "event retention policies"
+
+    def __str__(self):
+        return f"Retention {self.organization} ({self.raw_retention_days}d)"
+
+
+class EventSessionSketch(models.Model):
+    """HyperLogLog sketch of the distinct sessions of one event on one day."""
+
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="event_session_sketches",
+    )
+    date = models.DateField()
+    event_name = models.CharField(max_length=50)
+    sketch = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "date", "event_name"],
+                name="event_session_sketch_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} | {self.date}"
+
+
+class SearchDemand(models.Model):
+    """
+    Searched stay nights per organization and date, rolled up from
+    search_dates events (see apps/events/search_demand.py).
+    """
+
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="search_demand",
+    )
+    stay_date = models.DateField()
+    # Searches whose stay includes this night
+    searches = models.PositiveIntegerField(default=0)
+    # Searches arriving on this date
+    arrivals = models.PositiveIntegerField(default=0)
+    # Sum of adults + children over `searches`
+    guests = models.PositiveIntegerField(default=0)
+    # Availability searches including this night that returned nothing
+    zero_result_searches = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["stay_date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "stay_date"],
+                name="search_demand_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.organization_id} | {self.stay_date} | {self.searches}"
+
+
+class EventRollupCursor(models.Model):
+    """Position (EventLog.received_at) up to which a rollup has processed events."""
+
+    name = models.CharField(max_length=50, unique=True)
+    position = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
@@ -0,0 +1,110 @@
+"""
+Request parsers for the event ingest endpoint.
+
+Both accept gzip bodies, signalled by `Content-Encoding: gzip` or detected
+from the gzip magic bytes (navigator.sendBeacon cannot set headers).
+Decompressed input is capped at MAX_DECOMPRESSED_BYTES.
+
+    application/json      {"events": [...]}
+    application/x-ndjson  one event object per line, parsed line by line
+"""
+import gzip
+import io
+import json
+import zlib
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .validation import MAX_EVENTS_PER_BATCH
+
+GZIP_MAGIC = b"\x1f\x8b"
+MAX_DECOMPRESSED_BYTES = 1024 * 1024
+
+
+class _Prefixed(io.RawIOBase):
+    """Raw stream that replays already-read bytes before the rest."""
+
+    def __init__(self, head, stream):
+        self.head = head
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.head:
+            size = min(len(buffer), len(self.head))
+            buffer[:size] = self.head[:size]
+            self.head = self.head[size:]
+            return size
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _open_body(stream, parser_context):
+    """Return a buffered binary stream over the (decompressed) body."""
+    if stream is None:
+        raise ParseError("Cuerpo vacio.")
+    request = (parser_context or {}).get("request")
+    encoding = request.headers.get("Content-Encoding", "").lower() if request else ""
+
+    head = stream.read(2)
+    body = io.BufferedReader(_Prefixed(head, stream))
+    if encoding == "gzip" or head == GZIP_MAGIC:
+        return io.BufferedReader(gzip.GzipFile(fileobj=body, mode="rb"))
+    if encoding not in ("", "identity"):
+        raise ParseError(f"Content-Encoding no soportado: {encoding}")
+    return body
+
+
+def _read_line(body, remaining):
+    try:
+        line = body.readline(remaining + 1)
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ParseError(f"gzip invalido: {exc}")
+    if len(line) > remaining:
+        raise ParseError("Batch demasiado grande.")
+    return line
+
+
+class EventJSONParser(BaseParser):
+    media_type = "application/json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        body = _open_body(stream, parser_context)
+        try:
+            raw = body.read(MAX_DECOMPRESSED_BYTES + 1)
+        except (OSError, EOFError, zlib.error) as exc:
+            raise ParseError(f"gzip invalido: {exc}")
+        if len(raw) > MAX_DECOMPRESSED_BYTES:
+            raise ParseError("Batch demasiado grande.")
+        try:
+            return json.loads(raw)
+        except ValueError as exc:
+            raise ParseError(f"JSON invalido: {exc}")
+
+
+class EventNDJSONParser(BaseParser):
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        body = _open_body(stream, parser_context)
+        remaining = MAX_DECOMPRESSED_BYTES
+        events = []
+        while True:
+            line = _read_line(body, remaining)
+            if not line:
+                break
+            remaining -= len(line)
+            line = line.strip()
+            if not line:
+                continue
+            if len(events) == MAX_EVENTS_PER_BATCH:
+                raise ParseError(f"Maximo {MAX_EVENTS_PER_BATCH} eventos por batch.")
+            try:
+                events.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(f"Linea {len(events) + 1}: JSON invalido: {exc}")
+        return {"events": events}
@@ -0,0 +1,144 @@
+"""
+Compaction of old EventLog rows.
+
+Raw events older than the organization's retention are processed one day
+at a time, in primary-key chunks:
+
+1. the chunk is appended to <EVENTS_ARCHIVE_DIR>/<org>/<YYYY>/<MM>/<date>.ndjson.gz
+   as its own gzip member (gzip readers concatenate members transparently),
+2. in one short transaction its counts are added to EventDailyAggregate,
+   its sessions are merged into the day's EventSessionSketch and its rows
+   are deleted.
+
+Each chunk commits its aggregate increment together with its deletion,
+so an interrupted run resumes without double counting events. At worst
+the chunk in flight is archived twice, and the archive keeps the event
+ids so it can be deduplicated. Distinct sessions are exact within a run.
+A session split across an interrupted run, or a late event that arrives
+for a day already compacted, may be counted twice.
+"""
+import gzip
+import json
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import (
+    MIN_RAW_RETENTION_DAYS,
+    EventDailyAggregate,
+    EventLog,
+    EventRetentionPolicy,
+)
+from .sketches import save_sketches
+
+ARCHIVE_FIELDS = [
+    "id", "event_id", "guest_id", "session_id", "event_name", "metadata", "created_at",
+]
+
+
+def retention_for(org):
+    """
+    Return (raw_retention_days, archive_raw) for an organization, never
+    below MIN_RAW_RETENTION_DAYS.
+    """
+    try:
+        policy = org.event_retention_policy
+    except EventRetentionPolicy.DoesNotExist:
+        days, archive = settings.EVENTS_RAW_RETENTION_DAYS, True
+    else:
+        days, archive = policy.raw_retention_days, policy.archive_raw
+    return max(days, MIN_RAW_RETENTION_DAYS), archive
+
+
+def pending_days(org, days):
+    """Dates with raw events older than the retention window."""
+    cutoff = _day_start(timezone.localdate() - timedelta(days=days))
+    return list(
+        EventLog.objects.filter(organization=org, created_at__lt=cutoff)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("day", flat=True)
+        .distinct()
+        .order_by("day")
+    )
+
+
+def compact_day(org, day, archive=True, chunk_size=2000):
+    """Roll up, archive and delete the raw events of one day. Returns rows removed."""
+    rows = EventLog.objects.filter(
+        organization=org,
+        created_at__gte=_day_start(day),
+        created_at__lt=_day_start(day + timedelta(days=1)),
+    ).order_by("pk")
+
+    archive_file = _open_archive(org, day) if archive else None
+    seen_sessions = defaultdict(set)
+    removed = 0
+    last_pk = None
+    try:
+        while True:
+            chunk_qs = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+            chunk = list(chunk_qs.values(*ARCHIVE_FIELDS)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1]["id"]
+
+            if archive_file:
+                _append_member(archive_file, chunk)
+
+            events = Counter()
+            new_sessions = Counter()
+            sketches = defaultdict(HyperLogLog)
+            for row in chunk:
+                name = row["event_name"]
+                events[name] += 1
+                sketches[(day, name)].add(row["session_id"])
+                if row["session_id"] not in seen_sessions[name]:
+                    seen_sessions[name].add(row["session_id"])
+                    new_sessions[name] += 1
+
+            with transaction.atomic():
+                for name, count in events.items():
+                    EventDailyAggregate.objects.get_or_create(
+                        organization=org, date=day, event_name=name,
+                    )
+                    EventDailyAggregate.objects.filter(
+                        organization=org, date=day, event_name=name,
+                    ).update(
+                        events=F("events") + count,
+                        sessions=F("sessions") + new_sessions[name],
+                    )
+                save_sketches(org, sketches)
+                EventLog.objects.filter(pk__in=[row["id"] for row in chunk]).delete()
+            removed += len(chunk)
+    finally:
+        if archive_file:
+            archive_file.close()
+    return removed
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _open_archive(org, day):
+    directory = Path(settings.EVENTS_ARCHIVE_DIR) / str(org.pk) / f"{day:%Y}" / f"{day:%m}"
+    directory.mkdir(parents=True, exist_ok=True)
+    return open(directory / f"{day.isoformat()}.ndjson.gz", "ab")
+
+
+def _append_member(fh, chunk):
+    lines = "".join(
+        json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for row in chunk
+    )
+    fh.write(gzip.compress(lines.encode()))
+    fh.flush()
+    os.fsync(fh.fileno())
@@ -0,0 +1,138 @@
+"""
+Incremental rollup of search demand into SearchDemand.
+
+Reads search_dates events (client metadata: check_in, check_out, adults,
+children) and search_no_results events (logged by AvailabilityView) that
+arrived after the stored cursor, and adds one count per searched night.
+Events are selected by EventLog.received_at, so each run only touches
+what arrived since the previous one. Each time window is applied in one
+transaction together with the cursor move, so a window is counted once.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EventLog, EventRollupCursor, SearchDemand
+
+CURSOR_NAME = "search_demand"
+SEARCH_EVENTS = ["search_dates", EventLog.SEARCH_NO_RESULTS]
+
+# Longest stay counted per search; longer ranges are clipped
+MAX_NIGHTS = 30
+# Events inserted by transactions still open when the cursor moves would be
+# skipped, so stay this far behind the present
+SAFETY_LAG = timedelta(seconds=60)
+
+
+def parse_search(metadata):
+    """Return (check_in, nights, party size) from event metadata, or None."""
+    if not isinstance(metadata, dict):
+        return None
+    try:
+        check_in = date.fromisoformat(str(metadata["check_in"]))
+        check_out = date.fromisoformat(str(metadata["check_out"]))
+        party = int(metadata.get("adults") or 1) + int(metadata.get("children") or 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+    nights = (check_out - check_in).days
+    if nights <= 0:
+        return None
+    return check_in, min(nights, MAX_NIGHTS), max(party, 1)
+
+
+def rollup_search_demand(window=timedelta(hours=6)):
+    """
+    Process every pending window up to now - SAFETY_LAG.
+    Returns counts of events read, events skipped (bad metadata) and windows.
+    """
+    stats = {"events": 0, "skipped": 0, "windows": 0}
+    upper = timezone.now() - SAFETY_LAG
+    while True:
+        with transaction.atomic():
+            cursor = _lock_cursor()
+            if cursor.position >= upper:
+                return stats
+            window_end = min(cursor.position + window, upper)
+            _process_window(cursor.position, window_end, stats)
+            cursor.position = window_end
+            cursor.save(update_fields=["position", "updated_at"])
+            stats["windows"] += 1
+
+
+def _lock_cursor():
+    cursor = EventRollupCursor.objects.select_for_update().filter(name=CURSOR_NAME).first()
+    if cursor is not None:
+        return cursor
+    first = (
+        EventLog.objects.filter(event_name__in=SEARCH_EVENTS)
+        .order_by("received_at")
+        .values_list("received_at", flat=True)
+        .first()
+    )
+    start = (first or timezone.now()) - timedelta(microseconds=1)
+    EventRollupCursor.objects.get_or_create(name=CURSOR_NAME, defaults={"position": start})
+    return EventRollupCursor.objects.select_for_update().get(name=CURSOR_NAME)
+
+
+def _process_window(start, end, stats):
+    # [searches, arrivals, guests, zero_result_searches] per (org, date)
+    counters = defaultdict(lambda: [0, 0, 0, 0])
+    rows = EventLog.objects.filter(
+        event_name__in=SEARCH_EVENTS,
+        received_at__gt=start,
+        received_at__lte=end,
+    ).values_list("organization_id", "event_name", "metadata")
+
+    for org_id, event_name, metadata in rows.iterator(chunk_size=2000):
+        stats["events"] += 1
+        parsed = parse_search(metadata)
+        if parsed is None:
+            stats["skipped"] += 1
+            continue
+        check_in, nights, party = parsed
+        zero_result = event_name == EventLog.SEARCH_NO_RESULTS
+        for offset in range(nights):
+            counts = counters[(org_id, check_in + timedelta(days=offset))]
+            if zero_result:
+                counts[3] += 1
+                continue
+            counts[0] += 1
+            counts[2] += party
+            if offset == 0:
+                counts[1] += 1
+
+    if counters:
+        _apply(counters)
+
+
+def _apply(counters):
+    existing = {
+        (row.organization_id, row.stay_date): row
+        for row in SearchDemand.objects.filter(
+            organization_id__in={org_id for org_id, _ in counters},
+            stay_date__in={day for _, day in counters},
+        )
+    }
+    created, changed = [], []
+    for (org_id, day), (searches, arrivals, guests, zero) in counters.items():
+        row = existing.get((org_id, day))
+        if row is None:
+            created.append(SearchDemand(
+                organization_id=org_id, stay_date=day,
+                searches=searches, arrivals=arrivals,
+                guests=guests, zero_result_searches=zero,
+            ))
+            continue
+        row.searches += searches
+        row.arrivals += arrivals
+        row.guests += guests
+        row.zero_result_searches += zero
+        changed.append(row)
+    SearchDemand.objects.bulk_create(created, batch_size=1000)
+    SearchDemand.objects.bulk_update(
+        changed,
+        ["searches", "arrivals", "guests", "zero_result_searches"],
+        batch_size=1000,
+    )
@@ -0,0 +1,158 @@
+import logging
+import time
+import uuid
+from datetime import datetime, timezone as tz
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.guests.models import Guest
+from apps.organizations.models import Organization
+
+from . import spool
+from .models import EventLog
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_uuid(value):
+    if not value:
+        return None
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def build_event_logs(org, events_data):
+    """
+    Build unsaved EventLog objects for a validated batch of events.
+
+    Guest ids are validated up front and resolved with a single query;
+    ids that are malformed or belong to another organization are dropped.
+    Events repeating an event_id already seen in the batch are skipped.
+    """
+    guest_ids = {}
+    for item in events_data:
+        raw = item.get("guest_id", "")
+        if raw not in guest_ids:
+            guest_ids[raw] = _parse_uuid(raw)
+
+    candidates = {value for value in guest_ids.values() if value}
+    known = set()
+    if candidates:
+        known = set(
+            Guest.objects.filter(organization=org, id__in=candidates)
+            .values_list("id", flat=True)
+        )
+
+    objects = []
+    seen = set()
+    for item in events_data:
+        # Drop repeated client event ids within the batch; repeats across
+        # batches are skipped by the (organization, event_id) constraint.
+        event_id = item.get("event_id") or None
+        if event_id:
+            if event_id in seen:
+                continue
+            seen.add(event_id)
+
+        guest_id = guest_ids[item.get("guest_id", "")]
+
+        # Convert timestamp (ms) to datetime
+        try:
+            ts = datetime.fromtimestamp(item["timestamp"] / 1000, tz=tz.utc)
+        except (ValueError, OSError, OverflowError):
+            ts = datetime.now(tz=tz.utc)
+
+        objects.append(
+            EventLog(
+                organization=org,
+                event_id=event_id,
+                guest_id=guest_id if guest_id in known else None,
+                session_id=item["session_id"],
+                event_name=item["event"],
+                metadata=item.get("metadata", {}),
+                created_at=ts,
+            )
+        )
+    return objects
+
+
+def record_server_event(org, event_name, metadata, session_id="server"):
+    """
+    Record an event produced by the backend itself, through the same
+    sync/spool path as client events.
+    """
+    item = {
+        "event": event_name,
+        "event_id": "",
+        "timestamp": time.time() * 1000,
+        "session_id": session_id,
+        "guest_id": "",
+        "metadata": metadata,
+    }
+    if settings.EVENTS_INGEST_MODE == "spool":
+        spool.append(org.pk, [item])
+    else:
+        EventLog.objects.bulk_create(build_event_logs(org, [item]))
+
+
+def drain_spool(batch_size):
+    """
+    Load spooled events into EventLog.
+
+    Lines are grouped into bulk_create batches of about `batch_size`
+    events; a segment's offset is committed after each batch is saved.
+
+    Returns a dict with the number of events loaded and segments removed,
+    or None when another drainer holds the lock.
+    """
+    with spool.drain_lock() as acquired:
+        if not acquired:
+            return None
+
+        stats = {"events": 0, "segments": 0}
+        organizations = {}
+        for segment in spool.segments():
+            sealed = segment.sealed
+            offset = segment.read_offset()
+            pending = []
+            pending_count = 0
+            for end_offset, org_id, events in segment.read_batches(offset):
+                pending.append((org_id, events))
+                pending_count += len(events)
+                offset = end_offset
+                if pending_count >= batch_size:
+                    stats["events"] += _load(pending, organizations)
+                    segment.commit_offset(offset)
+                    pending, pending_count = [], 0
+            if pending:
+                stats["events"] += _load(pending, organizations)
+                segment.commit_offset(offset)
+
+            if sealed:
+                if offset < segment.size():
+                    logger.warning("Discarding incomplete tail of spool segment %s", segment.path.name)
+                segment.remove()
+                stats["segments"] += 1
+        return stats
+
+
+def _load(pending, organizations):
+    missing = {org_id for org_id, _ in pending if org_id not in organizations}
+    if missing:
+        found = Organization.objects.in_bulk(list(missing))
+        for org_id in missing:
+            organizations[org_id] = found.get(uuid.UUID(org_id))
+
+    objects = []
+    for org_id, events in pending:
+        org = organizations[org_id]
+        if org is None:
+            continue
+        objects.extend(build_event_logs(org, events))
+
+    with transaction.atomic():
+        EventLog.objects.bulk_create(objects, ignore_conflicts=True)
+    return len(objects)
@@ -0,0 +1,130 @@
+"""
+Daily HyperLogLog sketches of distinct sessions per event.
+
+Past days are stored in EventSessionSketch, filled by
+`manage.py rollup_session_sketches`, on demand by `session_counts` for
+days that have not been rolled up yet, and by compact_event_logs before
+it deletes raw rows. Today is always sketched from the raw events.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import EventLog, EventSessionSketch
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def sketch_raw_events(org, start, end, event_names=None):
+    """Build {(date, event_name): HyperLogLog} from raw events between start and end."""
+    qs = EventLog.objects.filter(
+        organization=org,
+        created_at__gte=_day_start(start),
+        created_at__lt=_day_start(end + timedelta(days=1)),
+    )
+    if event_names:
+        qs = qs.filter(event_name__in=event_names)
+
+    sketches = defaultdict(HyperLogLog)
+    rows = (
+        qs.annotate(day=TruncDate("created_at"))
+        .values_list("day", "event_name", "session_id")
+        .distinct()
+        .order_by()
+    )
+    for day, event_name, session_id in rows.iterator(chunk_size=5000):
+        sketches[(day, event_name)].add(session_id)
+    return sketches
+
+
+def save_sketches(org, sketches, replace=False):
+    """Store day sketches, merging into existing rows unless `replace`."""
+    if not sketches:
+        return
+    with transaction.atomic():
+        existing = {
+            (row.date, row.event_name): row
+            for row in EventSessionSketch.objects.select_for_update().filter(
+                organization=org,
+                date__in={day for day, _ in sketches},
+                event_name__in={name for _, name in sketches},
+            )
+        }
+        now = timezone.now()
+        created, changed = [], []
+        for (day, event_name), sketch in sketches.items():
+            row = existing.get((day, event_name))
+            if row is None:
+                created.append(EventSessionSketch(
+                    organization=org, date=day, event_name=event_name,
+                    sketch=sketch.to_bytes(),
+                ))
+                continue
+            if not replace:
+                sketch = HyperLogLog.from_bytes(row.sketch).merge(sketch)
+            row.sketch = sketch.to_bytes()
+            row.updated_at = now
+            changed.append(row)
+        # A concurrent request may have stored the same day; both were built
+        # from the same raw events, so keeping either is fine.
+        EventSessionSketch.objects.bulk_create(created, ignore_conflicts=True)
+        EventSessionSketch.objects.bulk_update(changed, ["sketch", "updated_at"])
+
+
+def session_counts(org, start, end, event_names):
+    """
+    Approximate distinct sessions per event between start and end
+    (inclusive), merging one sketch per day.
+    """
+    today = timezone.localdate()
+    last_stored = min(end, today - timedelta(days=1))
+
+    per_event = defaultdict(list)
+    if start <= last_stored:
+        stored = set()
+        for day, event_name, blob in EventSessionSketch.objects.filter(
+            organization=org,
+            date__gte=start,
+            date__lte=last_stored,
+            event_name__in=event_names,
+        ).values_list("date", "event_name", "sketch"):
+            stored.add((day, event_name))
+            per_event[event_name].append(HyperLogLog.from_bytes(blob))
+
+        # A day may be stored for some events only (e.g. an earlier request
+        # asked for fewer events), so gaps are tracked per (day, event).
+        days = [start + timedelta(days=i) for i in range((last_stored - start).days + 1)]
+        missing = {
+            (day, event_name)
+            for day in days
+            for event_name in event_names
+            if (day, event_name) not in stored
+        }
+        if missing:
+            missing_days = sorted({day for day, _ in missing})
+            built = sketch_raw_events(
+                org, missing_days[0], missing_days[-1],
+                sorted({event_name for _, event_name in missing}),
+            )
+            built = {key: value for key, value in built.items() if key in missing}
+            # Store empty sketches too, so quiet days are not rescanned
+            for key in missing:
+                built.setdefault(key, HyperLogLog())
+            save_sketches(org, built)
+            for (day, event_name), sketch in built.items():
+                per_event[event_name].append(sketch)
+
+    if end >= today:
+        for (day, event_name), sketch in sketch_raw_events(org, today, today, event_names).items():
+            per_event[event_name].append(sketch)
+
+    return {
+        name: HyperLogLog.merged(per_event[name]).count() if per_event[name] else 0
+        for name in event_names
+    }
@@ -0,0 +1,145 @@
+"""
+Append-only spool for tracking events.
+
+With EVENTS_INGEST_MODE = "spool" the ingest view appends each validated
+batch as one NDJSON line to a local segment file and returns immediately;
+`manage.py drain_event_spool` later loads the spooled events into EventLog
+with large bulk_create batches.
+
+Layout of EVENTS_SPOOL_DIR:
+    <window>-<host>-<pid>.ndjson   segment, one line per ingested batch
+    <segment>.offset               bytes of the segment already loaded
+
+Each process writes to its own segment and starts a new one every
+EVENTS_SPOOL_MAX_LATENCY seconds. The drainer reads every segment up to
+its last complete line and records the offset (write + os.replace) only
+after the rows are committed, so a crash never loses events; at worst the
+last uncommitted batch is replayed. Segments whose window has ended are
+deleted once fully loaded.
+"""
+import fcntl
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".ndjson"
+OFFSET_SUFFIX = ".offset"
+LOCK_NAME = ".drain.lock"
+
+# Seconds after a window ends before its segments count as sealed, so a
+# writer that picked the segment right at the boundary has finished.
+SEAL_GRACE = 2
+
+_write_lock = threading.Lock()
+_host = socket.gethostname().replace("-", "_")
+
+
+def spool_dir():
+    path = Path(settings.EVENTS_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _window(now=None):
+    return int((now or time.time()) // settings.EVENTS_SPOOL_MAX_LATENCY)
+
+
+# ---------- Writer ----------
+
+def append(org_id, events):
+    """Append a validated batch of events for an organization."""
+    line = json.dumps(
+        {"org": str(org_id), "events": events},
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+    ) + "\n"
+    path = spool_dir() / f"{_window()}-{_host}-{os.getpid()}{SEGMENT_SUFFIX}"
+    with _write_lock:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+
+# ---------- Reader ----------
+
+class Segment:
+    def __init__(self, path):
+        self.path = path
+        self.offset_path = path.with_name(path.name + OFFSET_SUFFIX)
+        self.window = int(path.name.split("-", 1)[0])
+
+    @property
+    def sealed(self):
+        return self.window < _window(time.time() - SEAL_GRACE)
+
+    def read_offset(self):
+        try:
+            return int(self.offset_path.read_text() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def commit_offset(self, offset):
+        tmp = self.offset_path.with_name(self.offset_path.name + ".tmp")
+        with open(tmp, "w") as fh:
+            fh.write(str(offset))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.offset_path)
+
+    def remove(self):
+        self.path.unlink(missing_ok=True)
+        self.offset_path.unlink(missing_ok=True)
+
+    def read_batches(self, offset):
+        """
+        Yield (end_offset, org_id, events) for every complete line after
+        `offset`. A trailing line without newline is left for later.
+        """
+        with open(self.path, "rb") as fh:
+            fh.seek(offset)
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    return
+                offset += len(raw)
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    logger.warning("Skipping corrupt spool line in %s at %s", self.path.name, offset)
+                    continue
+                yield offset, record["org"], record["events"]
+
+    def size(self):
+        return self.path.stat().st_size
+
+
+def segments():
+    """Spooled segments, oldest window first."""
+    found = [Segment(p) for p in spool_dir().glob(f"*{SEGMENT_SUFFIX}")]
+    return sorted(found, key=lambda s: (s.window, s.path.name))
+
+
+@contextmanager
+def drain_lock():
+    """Exclusive lock so only one drainer per spool directory runs at a time."""
+    with open(spool_dir() / LOCK_NAME, "w") as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
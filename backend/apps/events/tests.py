@@ -0,0 +1,111 @@
+import random
+from datetime import datetime, time, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+
+from .hll import HyperLogLog
+from .models import EventLog, EventSessionSketch
+from .sketches import save_sketches, session_counts, sketch_raw_events
+
+# Three standard errors at precision 12 (about 1.6% each)
+TOLERANCE = 0.05
+
+
+class HyperLogLogAccuracyTests(SimpleTestCase):
+    def assertApprox(self, estimate, exact):
+        self.assertLessEqual(abs(estimate - exact), max(exact * TOLERANCE, 2), (estimate, exact))
+
+    def test_count_matches_exact_distinct_values(self):
+        for exact in (10, 1000, 20000, 200000):
+            sketch = HyperLogLog().update(f"session-{i}" for i in range(exact))
+            self.assertApprox(sketch.count(), exact)
+
+    def test_duplicates_do_not_inflate_the_count(self):
+        sketch = HyperLogLog().update(f"session-{i % 500}" for i in range(10000))
+        self.assertApprox(sketch.count(), 500)
+
+    def test_merge_counts_the_union(self):
+        days = [
+            {f"session-{i}" for i in range(offset, offset + 5000)}
+            for offset in range(0, 30000, 3000)
+        ]
+        merged = HyperLogLog.merged(HyperLogLog().update(day) for day in days)
+        self.assertApprox(merged.count(), len(set().union(*days)))
+
+    def test_serialization_round_trip(self):
+        sketch = HyperLogLog().update(range(3000))
+        self.assertEqual(HyperLogLog.from_bytes(sketch.to_bytes()).registers, sketch.registers)
+
+
+class SessionCountsTests(TestCase):
+    EVENTS = ["page_view", "room_view", "start_booking", "booking_confirmed"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name="Funnel", subdomain="funnel")
+        cls.today = timezone.localdate()
+        cls.start = cls.today - timedelta(days=14)
+        cls.end = cls.today - timedelta(days=1)
+
+        rng = random.Random(36)
+        pool = [f"s{i}" for i in range(6000)]
+        events = []
+        day = cls.start
+        while day <= cls.today:
+            created_at = timezone.make_aware(datetime.combine(day, time(12)))
+            sessions = rng.sample(pool, 800)
+            # Each step keeps a shrinking share of the previous one
+            for depth, event_name in enumerate(cls.EVENTS):
+                for session_id in sessions[: 800 // (3 ** depth)]:
+                    events.append(EventLog(
+                        organization=cls.organization,
+                        session_id=session_id,
+                        event_name=event_name,
+                        created_at=created_at,
+                    ))
+            day += timedelta(days=1)
+        EventLog.objects.bulk_create(events, batch_size=2000)
+
+    def exact_counts(self, start, end, event_names):
+        return {
+            name: EventLog.objects.filter(
+                organization=self.organization,
+                event_name=name,
+                created_at__date__gte=start,
+                created_at__date__lte=end,
+            ).values("session_id").distinct().count()
+            for name in event_names
+        }
+
+    def assertCountsClose(self, approx, exact):
+        for name, value in exact.items():
+            self.assertGreater(value, 0)
+            self.assertLessEqual(
+                abs(approx[name] - value), value * TOLERANCE, (name, approx[name], value),
+            )
+
+    def test_matches_exact_counts_and_stores_past_days(self):
+        approx = session_counts(self.organization, self.start, self.today, self.EVENTS)
+        self.assertCountsClose(approx, self.exact_counts(self.start, self.today, self.EVENTS))
+        self.assertEqual(
+            EventSessionSketch.objects.filter(organization=self.organization).count(),
+            len(self.EVENTS) * 14,
+        )
+
+        # Second read comes from the stored sketches only
+        with self.assertNumQueries(1):
+            again = session_counts(self.organization, self.start, self.end, self.EVENTS)
+        self.assertCountsClose(again, self.exact_counts(self.start, self.end, self.EVENTS))
+
+    def test_backfills_events_missing_from_stored_days(self):
+        # Days already stored for two events only, as the funnel comparison
+        # of the previous period asks for
+        save_sketches(self.organization, sketch_raw_events(
+            self.organization, self.start, self.end, ["page_view", "booking_confirmed"],
+        ))
+
+        approx = session_counts(self.organization, self.start, self.end, self.EVENTS)
+        self.assertCountsClose(approx, self.exact_counts(self.start, self.end, self.EVENTS))
@@ -0,0 +1,98 @@
+"""
+Lightweight validation for tracking events.
+
+Replaces the per-item DRF serializer on the ingest path: one dict lookup
+and a few isinstance checks per field, same rules as before.
+"""
+from rest_framework.exceptions import ValidationError
+
+from .models import EventLog
+
+MAX_EVENTS_PER_BATCH = 50
+MAX_ID_LENGTH = 64
+
+
+class EventValidationError(ValueError):
+    def __init__(self, field, message):
+        super().__init__(field, message)
+        self.field = field
+        self.message = message
+
+
+def _optional_id(item, field):
+    value = item.get(field)
+    if value is None:
+        return ""
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise EventValidationError(field, "Debe ser texto.")
+    value = str(value).strip()
+    if len(value) > MAX_ID_LENGTH:
+        raise EventValidationError(field, f"Maximo {MAX_ID_LENGTH} caracteres.")
+    return value
+
+
+def validate_event(item):
+    """
+    Return the cleaned event dict.
+
+    Raises EventValidationError on the first invalid field.
+    """
+    if not isinstance(item, dict):
+        raise EventValidationError("non_field_errors", "Se esperaba un objeto.")
+
+    event = item.get("event")
+    if not isinstance(event, str) or event not in EventLog.VALID_EVENTS:
+        raise EventValidationError("event", f"Evento no soportado: {event}")
+
+    timestamp = item.get("timestamp")
+    if isinstance(timestamp, bool):
+        raise EventValidationError("timestamp", "Debe ser numerico.")
+    try:
+        timestamp = float(timestamp)
+    except (TypeError, ValueError):
+        raise EventValidationError("timestamp", "Debe ser numerico.") from None
+
+    session_id = item.get("session_id")
+    if not isinstance(session_id, str) or not session_id.strip():
+        raise EventValidationError("session_id", "Este campo es requerido.")
+    session_id = session_id.strip()
+    if len(session_id) > MAX_ID_LENGTH:
+        raise EventValidationError("session_id", f"Maximo {MAX_ID_LENGTH} caracteres.")
+
+    metadata = item.get("metadata")
+    if metadata is None:
+        metadata = {}
+    elif not isinstance(metadata, dict):
+        raise EventValidationError("metadata", "Debe ser un objeto.")
+
+    return {
+        "event": event,
+        "event_id": _optional_id(item, "event_id"),
+        "timestamp": timestamp,
+        "session_id": session_id,
+        "guest_id": _optional_id(item, "guest_id"),
+        "metadata": metadata,
+    }
+
+
+def validate_batch(items):
+    """
+    Validate a list of raw events.
+
+    Raises a DRF ValidationError keyed by the position of each bad event.
+    """
+    if not isinstance(items, list):
+        raise ValidationError({"events": ["Se esperaba una lista de eventos."]})
+    if len(items) > MAX_EVENTS_PER_BATCH:
+        raise ValidationError({"events": [f"Maximo {MAX_EVENTS_PER_BATCH} eventos por batch."]})
+
+    cleaned = []
+    errors = {}
+    for index, item in enumerate(items):
+        try:
+            cleaned.append(validate_event(item))
+        except EventValidationError as exc:
+            errors[index] = {exc.field: [exc.message]}
+    if errors:
+        raise ValidationError({"events": errors})
+    return cleaned
@@ -6,13 +6,30 @@ from rest_framework import generics, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.common import http
+from apps.common.export import export_response
 from apps.common.mixins import TenantQuerySetMixin
+from apps.common.permissions import HasRolePermission
 
 from .models import Guest, GuestNote
 from .serializers import GuestListSerializer, GuestNoteSerializer, GuestSerializer
 
 logger = logging.getLogger(__name__)
 
+GUEST_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("nombre", "first_name"),
+    ("apellido", "last_name"),
+    ("email", "email"),
+    ("telefono", "phone"),
+    ("tipo_documento", "document_type"),
+    ("numero_documento", "document_number"),
+    ("nacionalidad", "nationality"),
+    ("pais_residencia", "country_of_residence"),
+    ("vip", "is_vip"),
+    ("creado", "created_at"),
+]
+
 
 class ReniecLookupView(generics.GenericAPIView):
     """Proxy para consulta RENIEC. Solo usuarios autenticados."""
@@ -33,11 +50,13 @@ class ReniecLookupView(generics.GenericAPIView):
             )
 
         try:
-            resp = requests.post(
+            resp = http.post(
                 settings.RENIEC_API_URL,
                 json={"dni": dni},
                 headers={"X-API-Key": api_key, "Content-Type": "application/json"},
                 timeout=10,
+                idempotent=True,
+                retries=settings.RENIEC_MAX_RETRIES,
             )
             resp.raise_for_status()
             return Response(resp.json())
@@ -61,6 +80,25 @@ class GuestViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
             return GuestListSerializer
         return GuestSerializer
 
+    def get_permissions(self):
+        if self.action == "export":
+            self.required_role = "manager"
+            self.permission_classes = [HasRolePermission]
+        return super().get_permissions()
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        GET /guests/export/?output=csv|ndjson&compress=gzip
+        Streams every guest matching the list filters.
+        """
+        return export_response(
+            self.filter_queryset(self.get_queryset()),
+            columns=GUEST_EXPORT_COLUMNS,
+            filename="huespedes",
+            request=request,
+        )
+
     # --- Nested: Notes ---
     @action(detail=True, methods=["get", "post"], url_path="notes")
     def notes(self, request, pk=None):
@@ -16,6 +16,9 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.common import http
+from apps.events.models import EventLog
+from apps.events.services import record_server_event
 from apps.guests.models import Guest
 from apps.organizations.models import BankAccount, Organization, Property
 from apps.pricing.engine import calculate_nightly_prices, calculate_total
@@ -287,6 +290,19 @@ class AvailabilityView(APIView):
                 )
                 combinations.extend(prop_combos)
 
+        if not results and not combinations:
+            # Demanda no atendida, agregada en SearchDemand
+            try:
+                record_server_event(org, EventLog.SEARCH_NO_RESULTS, {
+                    "check_in": check_in,
+                    "check_out": check_out,
+                    "adults": adults,
+                    "children": children,
+                    "property": property_slug or "",
+                })
+            except Exception:
+                logger.exception("No se pudo registrar la búsqueda sin resultados")
+
         results_serializer = AvailabilityResultSerializer(results, many=True)
         combinations_serializer = CombinationResultSerializer(combinations, many=True)
 
@@ -1515,11 +1531,13 @@ class PublicReniecLookupView(APIView):
             )
 
         try:
-            resp = http_requests.post(
+            resp = http.post(
                 settings.RENIEC_API_URL,
                 json={"dni": dni},
                 headers={"X-API-Key": api_key, "Content-Type": "application/json"},
                 timeout=10,
+                idempotent=True,
+                retries=settings.RENIEC_MAX_RETRIES,
             )
             resp.raise_for_status()
             data = resp.json().get("data", {})
@@ -0,0 +1,42 @@
+"""
+Rebuild the ReservationNight fact table from existing reservations.
+
+New writes keep it in sync automatically; run this once after deploying
+the table, or after changing pricing rules retroactively.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.reservations.models import Reservation
+from apps.reservations.services import sync_reservation_nights
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la tabla ReservationNight a partir de las reservas existentes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            help="Subdominio de la organización a procesar (por defecto todas)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Reservas cargadas por lote (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        reservations = Reservation.objects.select_related("property", "room_type")
+        if options["organization"]:
+            reservations = reservations.filter(
+                organization__subdomain=options["organization"],
+            )
+
+        count = 0
+        for reservation in reservations.iterator(chunk_size=options["chunk_size"]):
+            sync_reservation_nights(reservation)
+            count += 1
+            if count % 1000 == 0:
+                self.stdout.write(f"  {count} reservas procesadas...")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {count} reservas sincronizadas."))
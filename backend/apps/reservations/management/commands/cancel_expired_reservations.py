@@ -1,7 +1,16 @@
+import os
+import socket
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
-from apps.reservations.models import Reservation
+from apps.automations.outbox import drain_bulk, enqueue_events_bulk
+from apps.automations.scheduling import cancel_pending
+from apps.common.models import StateTransitionLog
+from apps.dashboard.cache import bump_data_version
+from apps.reservations.models import Reservation, ReservationNight
 
 
 class Command(BaseCommand):
@@ -9,15 +18,62 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         now = timezone.now()
-        expired = Reservation.objects.filter(
-            operational_status=Reservation.OperationalStatus.INCOMPLETE,
-            payment_deadline__lt=now,
-            voucher_image="",
-        )
-        count = expired.count()
-        expired.update(
-            operational_status=Reservation.OperationalStatus.CANCELLED,
-        )
+        with transaction.atomic():
+            expired = list(
+                Reservation.objects.select_for_update(of=("self",)).filter(
+                    operational_status=Reservation.OperationalStatus.INCOMPLETE,
+                    payment_deadline__lt=now,
+                    voucher_image="",
+                ).select_related("organization", "room", "guest", "property")
+            )
+            ids = [reservation.pk for reservation in expired]
+            count = Reservation.objects.filter(pk__in=ids).update(
+                operational_status=Reservation.OperationalStatus.CANCELLED,
+                updated_at=now,
+            )
+            # update() skips model signals: sync the night facts, drop
+            # scheduled automations, log the transitions and invalidate
+            # dashboards explicitly
+            ReservationNight.objects.filter(
+                reservation_id__in=ids,
+            ).update(status=Reservation.OperationalStatus.CANCELLED)
+            cancel_pending(ids)
+            StateTransitionLog.objects.bulk_create([
+                StateTransitionLog(
+                    entity_type="Reservation",
+                    entity_id=reservation.pk,
+                    field="operational_status",
+                    old_value=Reservation.OperationalStatus.INCOMPLETE,
+                    new_value=Reservation.OperationalStatus.CANCELLED,
+                    organization_id=reservation.organization_id,
+                )
+                for reservation in expired
+            ], batch_size=1000)
+
+            # Events are written with the cancellations and dispatched
+            # after the commit; a crash leaves them pending for the next run
+            by_org = defaultdict(list)
+            for reservation in expired:
+                by_org[reservation.organization_id].append(reservation)
+            for reservations in by_org.values():
+                enqueue_events_bulk(
+                    "reservation.cancelled",
+                    reservations[0].organization,
+                    [
+                        {
+                            "reservation": reservation,
+                            "room": reservation.room,
+                            "guest": reservation.guest,
+                            "property": reservation.property,
+                            "user": None,
+                        }
+                        for reservation in reservations
+                    ],
+                )
+
+        for org_id in by_org:
+            bump_data_version(org_id)
+        drain_bulk("reservation.cancelled", f"{socket.gethostname()}-{os.getpid()}")
         self.stdout.write(
             self.style.SUCCESS(f"{count} reserva(s) cancelada(s) por expiración.")
         )
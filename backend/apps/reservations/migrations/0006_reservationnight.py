@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0011_bank_account_org_level'),
+        ('reservations', '0005_add_critical_indexes'),
+        ('rooms', '0007_add_critical_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('origin_type', models.CharField(choices=[('website', 'Website'), ('walk_in', 'Walk-in'), ('phone', 'Teléfono'), ('ota', 'OTA'), ('other', 'Otro')], max_length=20)),
+                ('status', models.CharField(choices=[('incomplete', 'Incompleta'), ('pending', 'Pendiente'), ('confirmed', 'Confirmada'), ('check_in', 'Check-in'), ('check_out', 'Check-out'), ('cancelled', 'Cancelada'), ('no_show', 'No-show')], max_length=20)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_nights', to='organizations.organization')),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_nights', to='organizations.property')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='reservations.reservation')),
+                ('room_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_nights', to='rooms.roomtype')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['organization', 'date', 'status'], name='res_night_org_date'), models.Index(fields=['property', 'date'], name='res_night_prop_date')],
+                'constraints': [models.UniqueConstraint(fields=('reservation', 'date'), name='res_night_unique')],
+            },
+        ),
+    ]
@@ -172,3 +172,54 @@ class Payment(TenantModel):
 
     def __str__(self):
         return f"Pago {self.amount} {self.currency} — {self.reservation.confirmation_code}"
+
+
+class ReservationNight(models.Model):
+    """
+    One row per night of a reservation (fact table for ADR/RevPAR/occupancy).
+
+    Maintained by apps.reservations.signals on every reservation write;
+    revenue is the reservation total split by the pricing engine's nightly
+    breakdown.
+    """
+
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="reservation_nights",
+    )
+    reservation = models.ForeignKey(
+        Reservation,
+        on_delete=models.CASCADE,
+        related_name="nights",
+    )
+    property = models.ForeignKey(
+        "organizations.Property",
+        on_delete=models.CASCADE,
+        related_name="reservation_nights",
+    )
+    room_type = models.ForeignKey(
+        "rooms.RoomType",
+        on_delete=models.CASCADE,
+        related_name="reservation_nights",
+    )
+    date = models.DateField()
+    revenue = models.DecimalField(max_digits=10, decimal_places=2)
+    origin_type = models.CharField(max_length=20, choices=Reservation.OriginType.choices)
+    status = models.CharField(max_length=20, choices=Reservation.OperationalStatus.choices)
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reservation", "date"],
+                name="res_night_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["organization", "date", "status"], name="res_night_org_date"),
+            models.Index(fields=["property", "date"], name="res_night_prop_date"),
+        ]
+
+    def __str__(self):
+        return f"{self.reservation_id} — {self.date}"
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from apps.automations.models import OutboxEvent
+from apps.billing.models import Invoice
 from apps.rooms.models import Room
 
 from .models import Payment, Reservation
@@ -26,6 +28,24 @@ class PaymentSerializer(serializers.ModelSerializer):
         return value
 
 
+class ReservationInvoiceSerializer(serializers.ModelSerializer):
+    """Emission status of the reservation's invoices; queued while awaiting the billing worker."""
+
+    queued = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Invoice
+        fields = [
+            "id", "numero_completo", "document_type", "status",
+            "queued", "next_attempt_at", "retry_count", "last_error",
+            "provider_document_url", "created_at",
+        ]
+        read_only_fields = fields
+
+    def get_queued(self, obj):
+        return obj.next_attempt_at is not None and obj.status in ("draft", "error", "rejected")
+
+
 class ReservationListSerializer(serializers.ModelSerializer):
     guest_name = serializers.SerializerMethodField()
     room_type_name = serializers.CharField(source="room_type.name", read_only=True)
@@ -59,6 +79,9 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
     room_number = serializers.CharField(source="room.number", read_only=True, default=None)
     property_name = serializers.CharField(source="property.name", read_only=True)
     payments = PaymentSerializer(many=True, read_only=True)
+    invoices = ReservationInvoiceSerializer(many=True, read_only=True)
+    # Automations (e.g. the check-out invoice) still waiting in the outbox
+    automations_pending = serializers.SerializerMethodField()
 
     class Meta:
         model = Reservation
@@ -76,7 +99,7 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
             "origin_type", "origin_metadata",
             "special_requests",
             "voucher_image", "payment_deadline",
-            "payments",
+            "payments", "invoices", "automations_pending",
             "created_by", "created_at", "updated_at",
         ]
         read_only_fields = [
@@ -88,6 +111,13 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
     def get_guest_name(self, obj):
         return obj.guest.full_name
 
+    def get_automations_pending(self, obj):
+        return OutboxEvent.objects.filter(
+            entity_type="reservation",
+            entity_id=str(obj.pk),
+            status__in=[OutboxEvent.Status.PENDING, OutboxEvent.Status.PROCESSING],
+        ).exists()
+
 
 class ReservationCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+
+from apps.pricing.engine import calculate_nightly_prices
+
+from .models import ReservationNight
+
+QUANTIZE = Decimal("0.01")
+
+# Reservation fields that feed the ReservationNight fact rows
+NIGHT_SOURCE_FIELDS = {
+    "property", "room_type",
+    "check_in_date", "check_out_date",
+    "adults", "children", "total_amount",
+    "origin_type", "operational_status",
+}
+
+
+def split_nightly_revenue(reservation):
+    """
+    Split the reservation total across its nights.
+
+    The pricing engine's nightly breakdown provides the weights so season
+    and day-of-week differences survive; the amounts are scaled to the
+    stored total (which may include discounts or manual edits) and the
+    last night absorbs the rounding difference.
+
+    Returns a list of (date, Decimal) tuples.
+    """
+    nights = (reservation.check_out_date - reservation.check_in_date).days
+    if nights <= 0:
+        return []
+
+    dates = [reservation.check_in_date + timedelta(days=i) for i in range(nights)]
+    total = reservation.total_amount or Decimal("0")
+
+    breakdown = calculate_nightly_prices(
+        property_obj=reservation.property,
+        room_type=reservation.room_type,
+        check_in=reservation.check_in_date,
+        check_out=reservation.check_out_date,
+        adults=reservation.adults,
+        children=reservation.children,
+    )
+    weights = [Decimal(night["final"]) for night in breakdown]
+    weight_total = sum(weights)
+    if len(weights) != nights or weight_total <= 0:
+        weights = [Decimal("1")] * nights
+        weight_total = Decimal(nights)
+
+    amounts = [(total * w / weight_total).quantize(QUANTIZE) for w in weights]
+    amounts[-1] += total - sum(amounts)
+    return list(zip(dates, amounts))
+
+
+def sync_reservation_nights(reservation):
+    """Rebuild the ReservationNight rows of a reservation."""
+    nights = [
+        ReservationNight(
+            organization_id=reservation.organization_id,
+            reservation=reservation,
+            property_id=reservation.property_id,
+            room_type_id=reservation.room_type_id,
+            date=night_date,
+            revenue=amount,
+            origin_type=reservation.origin_type,
+            status=reservation.operational_status,
+        )
+        for night_date, amount in split_nightly_revenue(reservation)
+    ]
+    with transaction.atomic():
+        ReservationNight.objects.filter(reservation=reservation).delete()
+        ReservationNight.objects.bulk_create(nights)
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Reservation, ReservationNight
+from .services import NIGHT_SOURCE_FIELDS, sync_reservation_nights
+
+# Fields that can be copied onto existing nights without re-pricing
+NIGHT_LABEL_FIELDS = {"operational_status", "origin_type", "updated_at"}
+
+
+@receiver(post_save, sender=Reservation)
+def sync_nights_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep ReservationNight in step with the reservation."""
+    if raw:
+        return
+
+    if update_fields is not None:
+        fields = set(update_fields)
+        if not fields & NIGHT_SOURCE_FIELDS:
+            return
+        # State transitions only touch labels, no need to re-split revenue
+        if fields <= NIGHT_LABEL_FIELDS:
+            ReservationNight.objects.filter(reservation=instance).update(
+                status=instance.operational_status,
+                origin_type=instance.origin_type,
+            )
+            return
+
+    sync_reservation_nights(instance)
@@ -1,13 +1,19 @@
+import uuid
+from datetime import date, timedelta
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from apps.automations.dispatcher import dispatch_event
+from apps.automations.outbox import enqueue_event
+from apps.common.export import export_response
 from apps.common.mixins import TenantQuerySetMixin
 from apps.common.permissions import HasRolePermission
 from apps.rooms.constants import room_state_machine
@@ -25,6 +31,44 @@ from .serializers import (
     ReservationDetailSerializer,
     ReservationListSerializer,
 )
+from .timeline import build_timeline
+
+TIMELINE_MAX_DAYS = 90
+
+RESERVATION_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("codigo", "confirmation_code"),
+    ("propiedad", "property__name"),
+    ("huesped_nombre", "guest__first_name"),
+    ("huesped_apellido", "guest__last_name"),
+    ("huesped_documento", "guest__document_number"),
+    ("huesped_email", "guest__email"),
+    ("tipo_habitacion", "room_type__name"),
+    ("habitacion", "room__number"),
+    ("check_in", "check_in_date"),
+    ("check_out", "check_out_date"),
+    ("adultos", "adults"),
+    ("ninos", "children"),
+    ("total", "total_amount"),
+    ("moneda", "currency"),
+    ("estado_operativo", "operational_status"),
+    ("estado_financiero", "financial_status"),
+    ("origen", "origin_type"),
+    ("creado", "created_at"),
+]
+
+PAYMENT_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("reserva", "reservation__confirmation_code"),
+    ("propiedad", "reservation__property__name"),
+    ("monto", "amount"),
+    ("moneda", "currency"),
+    ("metodo", "method"),
+    ("estado", "status"),
+    ("referencia", "gateway_reference"),
+    ("procesado", "processed_at"),
+    ("notas", "notes"),
+]
 
 
 class ReservationViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
@@ -46,6 +90,9 @@ class ReservationViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
         if self.action in ("create", "partial_update", "destroy"):
             self.required_role = "reception"
             self.permission_classes = [HasRolePermission]
+        elif self.action in ("export", "export_payments"):
+            self.required_role = "manager"
+            self.permission_classes = [HasRolePermission]
         return super().get_permissions()
 
     def perform_create(self, serializer):
@@ -109,6 +156,126 @@ class ReservationViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
         serializer = RoomSerializer(rooms, many=True)
         return Response(serializer.data)
 
+    # ---------- Timeline (tape chart) ----------
+    @action(detail=False, methods=["get"], url_path="timeline")
+    def timeline(self, request):
+        """
+        GET /reservations/timeline/?property=&start=&days=
+        Rooms × dates grid with run-length encoded reservation blocks.
+        """
+        property_id = request.query_params.get("property")
+        if not property_id:
+            return Response(
+                {"detail": "Se requiere el parámetro 'property'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            property_id = uuid.UUID(property_id)
+            start_param = request.query_params.get("start")
+            start = date.fromisoformat(start_param) if start_param else timezone.localdate()
+            days = int(request.query_params.get("days", 14))
+        except ValueError:
+            return Response(
+                {"detail": "Parámetros inválidos. Use property=<uuid>, start=YYYY-MM-DD y days numérico."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        days = max(1, min(days, TIMELINE_MAX_DAYS))
+        end = start + timedelta(days=days)
+
+        rooms = list(
+            Room.objects.filter(
+                property_id=property_id,
+                property__organization=request.organization,
+            )
+            .order_by("floor", "number")
+            .values("id", "number", "floor", "status")
+        )
+        reservations = list(
+            self.get_queryset()
+            .filter(
+                property_id=property_id,
+                check_in_date__lt=end,
+                check_out_date__gt=start,
+            )
+            .exclude(operational_status__in=["cancelled", "no_show"])
+            .order_by("check_in_date", "created_at")
+            .values(
+                "id", "confirmation_code",
+                "room_id", "room_type_id", "room_type__name",
+                "guest__first_name", "guest__last_name",
+                "check_in_date", "check_out_date",
+                "adults", "children",
+                "operational_status", "financial_status",
+            )
+        )
+
+        data = build_timeline(rooms, reservations, start, days)
+        data["reservations"] = [
+            {
+                "id": res["id"],
+                "confirmation_code": res["confirmation_code"],
+                "guest_name": f"{res['guest__first_name']} {res['guest__last_name']}",
+                "room": res["room_id"],
+                "room_type": res["room_type_id"],
+                "room_type_name": res["room_type__name"],
+                "check_in_date": res["check_in_date"],
+                "check_out_date": res["check_out_date"],
+                "adults": res["adults"],
+                "children": res["children"],
+                "operational_status": res["operational_status"],
+                "financial_status": res["financial_status"],
+            }
+            for res in reservations
+        ]
+        return Response(data)
+
+    # ---------- Exports ----------
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        GET /reservations/export/?output=csv|ndjson&compress=gzip
+        Streams every reservation matching the list filters.
+        """
+        return export_response(
+            self.filter_queryset(self.get_queryset()),
+            columns=RESERVATION_EXPORT_COLUMNS,
+            filename="reservas",
+            request=request,
+        )
+
+    @action(detail=False, methods=["get"], url_path="payments/export")
+    def export_payments(self, request):
+        """
+        GET /reservations/payments/export/?output=&compress=&payment_status=&method=&date_from=&date_to=
+        Streams the payments of the reservations matching the list filters.
+        """
+        payments = Payment.objects.filter(
+            organization=request.organization,
+            reservation__in=self.filter_queryset(self.get_queryset()),
+        )
+        params = request.query_params
+        if params.get("payment_status"):
+            payments = payments.filter(status=params["payment_status"])
+        if params.get("method"):
+            payments = payments.filter(method=params["method"])
+        try:
+            if params.get("date_from"):
+                payments = payments.filter(processed_at__date__gte=date.fromisoformat(params["date_from"]))
+            if params.get("date_to"):
+                payments = payments.filter(processed_at__date__lte=date.fromisoformat(params["date_to"]))
+        except ValueError:
+            return Response(
+                {"detail": "Formato de fecha inválido. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return export_response(
+            payments,
+            columns=PAYMENT_EXPORT_COLUMNS,
+            filename="pagos",
+            request=request,
+        )
+
     # ---------- Confirm ----------
     @action(detail=True, methods=["post"], url_path="confirm")
     def confirm(self, request, pk=None):
@@ -183,14 +350,15 @@ class ReservationViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
 
         # Transition reservation: check_in → check_out
         try:
-            operational_state_machine.transition(
-                reservation, "operational_status", "check_out", user=request.user,
-            )
+            with transaction.atomic():
+                operational_state_machine.transition(
+                    reservation, "operational_status", "check_out", user=request.user,
+                )
+                # Automation rules handle: room → dirty + create cleaning task
+                enqueue_event("reservation.check_out", reservation.organization, self._build_context(request, reservation))
         except DjangoValidationError as e:
             return Response({"detail": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Automation rules handle: room → dirty + create cleaning task
-        dispatch_event("reservation.check_out", reservation.organization, self._build_context(request, reservation))
         return Response(ReservationDetailSerializer(reservation).data)
 
     # ---------- Cancel ----------
@@ -198,13 +366,14 @@ class ReservationViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
     def cancel(self, request, pk=None):
         reservation = self.get_object()
         try:
-            operational_state_machine.transition(
-                reservation, "operational_status", "cancelled", user=request.user,
-            )
+            with transaction.atomic():
+                operational_state_machine.transition(
+                    reservation, "operational_status", "cancelled", user=request.user,
+                )
+                enqueue_event("reservation.cancelled", reservation.organization, self._build_context(request, reservation))
         except DjangoValidationError as e:
             return Response({"detail": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
-        dispatch_event("reservation.cancelled", reservation.organization, self._build_context(request, reservation))
         return Response(ReservationDetailSerializer(reservation).data)
 
     # ---------- No-show ----------
@@ -212,14 +381,15 @@ class ReservationViewSet(TenantQuerySetMixin, viewsets.ModelViewSet):
     def no_show(self, request, pk=None):
         reservation = self.get_object()
         try:
-            operational_state_machine.transition(
-                reservation, "operational_status", "no_show", user=request.user,
-            )
+            with transaction.atomic():
+                operational_state_machine.transition(
+                    reservation, "operational_status", "no_show", user=request.user,
+                )
+                # Automation rules handle: free room if assigned
+                enqueue_event("reservation.no_show", reservation.organization, self._build_context(request, reservation))
         except DjangoValidationError as e:
             return Response({"detail": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Automation rules handle: free room if assigned
-        dispatch_event("reservation.no_show", reservation.organization, self._build_context(request, reservation))
         return Response(ReservationDetailSerializer(reservation).data)
 
     # ---------- Upload voucher ----------
@@ -52,7 +52,7 @@ class RoomTypeViewSet(viewsets.ModelViewSet):
         serializer.save()
 
     def destroy(self, request, *args, **kwargs):
-        from apps.reservations.models import Reservation
+        from apps.reservations.models import Reservation, ReservationNight
 
         instance = self.get_object()
         reassign_to_id = request.query_params.get("reassign_to")
@@ -62,6 +62,7 @@ class RoomTypeViewSet(viewsets.ModelViewSet):
                 RoomType, pk=reassign_to_id, property=instance.property,
             )
             Reservation.objects.filter(room_type=instance).update(room_type=reassign_to)
+            ReservationNight.objects.filter(room_type=instance).update(room_type=reassign_to)
 
         try:
             instance.delete()
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0011_bank_account_org_level'),
+        ('rooms', '0007_add_critical_indexes'),
+        ('tasks', '0002_add_critical_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='automation_key',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('organization', 'automation_key'), name='task_automation_key_unique'),
+        ),
+    ]
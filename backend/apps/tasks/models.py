@@ -58,9 +58,18 @@ class Task(TenantModel):
     notes = models.TextField(blank=True, default="")
     result = models.TextField(blank=True, default="")
     completed_at = models.DateTimeField(null=True, blank=True)
+    # "<outbox event>:<rule>:<action index>" of the automation that created
+    # the task, so a redelivered event does not create it twice
+    automation_key = models.CharField(max_length=100, null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "automation_key"],
+                name="task_automation_key_unique",
+            ),
+        ]
 
     def __str__(self):
         room_str = f" — Room {self.room.number}" if self.room else ""
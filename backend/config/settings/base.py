@@ -109,6 +109,14 @@ else:
         }
     }
 
+# ---------- Cache ----------
+# Use a shared backend (redis://, memcache://) when running several workers:
+# dashboard data versions and cached responses live here, and so do the
+# automation action metrics written by `run_automation_worker` and the
+# billing breaker state and latencies written by `run_billing_worker`,
+# which warn with locmem and keep that state per process.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 # ---------- Auth ----------
 AUTH_USER_MODEL = "users.User"
 
@@ -166,6 +174,7 @@ REST_FRAMEWORK = {
         "reniec_lookup": "30/hour",
         "hotel_register": "3/hour",
         "contact": "5/hour",
+        "events": "120/minute",
     },
 }
 
@@ -189,9 +198,100 @@ OTP_COOLDOWN_SECONDS = 60
 OTP_MAX_PER_HOUR = 5
 OTP_LIFETIME_MINUTES = 10
 
+# ---------- Outbound HTTP ----------
+# Pooled keep-alive sessions shared by billing adapters and RENIEC lookups
+# (apps/common/http.py)
+HTTP_CONNECT_TIMEOUT = env.float("HTTP_CONNECT_TIMEOUT", default=5)
+HTTP_READ_TIMEOUT = env.float("HTTP_READ_TIMEOUT", default=30)
+HTTP_POOL_CONNECTIONS = env.int("HTTP_POOL_CONNECTIONS", default=10)
+# Keep-alive connections kept per host
+HTTP_POOL_MAXSIZE = env.int("HTTP_POOL_MAXSIZE", default=10)
+HTTP_MAX_RETRIES = env.int("HTTP_MAX_RETRIES", default=2)
+HTTP_RETRY_BACKOFF = env.float("HTTP_RETRY_BACKOFF", default=0.5)
+
 # ---------- RENIEC ----------
 RENIEC_API_KEY = env("RENIEC_API_KEY", default="")
 RENIEC_API_URL = env("RENIEC_API_URL", default="https://api.casaaustin.pe/api/v1/reniec/lookup/")
+# Lookups run while the user waits: each retry can add a connect and a
+# 10s read timeout, so they get a smaller budget than HTTP_MAX_RETRIES
+RENIEC_MAX_RETRIES = env.int("RENIEC_MAX_RETRIES", default=1)
+
+# ---------- Dashboard ----------
+DASHBOARD_CACHE_TIMEOUT = env.int("DASHBOARD_CACHE_TIMEOUT", default=300)
+DASHBOARD_CACHE_MAX_BYTES_PER_ORG = env.int(
+    "DASHBOARD_CACHE_MAX_BYTES_PER_ORG", default=2 * 1024 * 1024,
+)
+
+# ---------- Events ----------
+# sync: EventIngestView writes EventLog rows in the request.
+# spool: batches are appended to EVENTS_SPOOL_DIR and loaded by
+#        `manage.py drain_event_spool --loop`.
+EVENTS_INGEST_MODE = env("EVENTS_INGEST_MODE", default="sync")
+EVENTS_SPOOL_DIR = env("EVENTS_SPOOL_DIR", default=str(BASE_DIR / "var" / "event-spool"))
+# Seconds a spool segment stays open before it is sealed
+EVENTS_SPOOL_MAX_LATENCY = env.int("EVENTS_SPOOL_MAX_LATENCY", default=10)
+# Raw EventLog retention for organizations without an EventRetentionPolicy;
+# older rows are rolled up and archived by `manage.py compact_event_logs`.
+# Values below 180 days are raised to 180 (see MIN_RAW_RETENTION_DAYS).
+EVENTS_RAW_RETENTION_DAYS = env.int("EVENTS_RAW_RETENTION_DAYS", default=180)
+EVENTS_ARCHIVE_DIR = env("EVENTS_ARCHIVE_DIR", default=str(BASE_DIR / "var" / "event-archive"))
+
+# ---------- Automations ----------
+# Seconds active rules stay cached per (organization, trigger); writes to
+# AutomationRule invalidate them immediately.
+AUTOMATION_RULE_CACHE_TIMEOUT = env.int("AUTOMATION_RULE_CACHE_TIMEOUT", default=3600)
+# Seconds each process reuses the rule version it read from the database;
+# edits made in another process (e.g. the web) apply after this delay.
+AUTOMATION_RULE_VERSION_TTL = env.int("AUTOMATION_RULE_VERSION_TTL", default=5)
+# Percentage of rule evaluations with unmet conditions written to
+# AutomationLog, for organizations without an AutomationLogPolicy
+AUTOMATION_UNMATCHED_LOG_PERCENT = env.int("AUTOMATION_UNMATCHED_LOG_PERCENT", default=100)
+# outbox: check-out, cancel and no-show (and due scheduled rules, via
+#         `manage.py run_automation_scheduler`) write an OutboxEvent
+#         dispatched by `manage.py run_automation_worker`.
+#         Without a shared CACHE_URL the worker warns and its action
+#         metrics stay in its own process.
+# sync:   dispatch inside the request's transaction, so actions (e.g. the
+#         check-out invoice draft) commit with it (default, needs no extra
+#         process). Failed actions are queued in the outbox; run
+#         `run_automation_worker --once` periodically to retry them.
+# To roll out outbox mode, start `run_automation_worker` (and keep it
+# supervised) before switching: events written without a worker running
+# wait in the outbox until one starts.
+AUTOMATION_DISPATCH_MODE = env("AUTOMATION_DISPATCH_MODE", default="sync")
+AUTOMATION_WORKER_THREADS = env.int("AUTOMATION_WORKER_THREADS", default=4)
+AUTOMATION_OUTBOX_MAX_ATTEMPTS = env.int("AUTOMATION_OUTBOX_MAX_ATTEMPTS", default=5)
+# Seconds a claimed event stays reserved for its worker
+AUTOMATION_OUTBOX_LEASE_SECONDS = env.int("AUTOMATION_OUTBOX_LEASE_SECONDS", default=300)
+# Actions slower than this are logged as warnings
+AUTOMATION_SLOW_ACTION_MS = env.int("AUTOMATION_SLOW_ACTION_MS", default=2000)
+
+# ---------- Billing ----------
+# Invoices queued for emission (next_attempt_at) are sent by
+# `manage.py run_billing_worker` (use a shared CACHE_URL so the provider
+# breaker is shared; with locmem it is per process); failures
+# are retried with backoff until BILLING_EMISSION_MAX_ATTEMPTS.
+BILLING_WORKER_THREADS = env.int("BILLING_WORKER_THREADS", default=8)
+BILLING_EMISSION_MAX_ATTEMPTS = env.int("BILLING_EMISSION_MAX_ATTEMPTS", default=5)
+# Seconds a claimed invoice, and then its send, stays reserved for its worker
+BILLING_EMISSION_LEASE_SECONDS = env.int("BILLING_EMISSION_LEASE_SECONDS", default=300)
+# Per process and per (provider, endpoint host): requests in flight and
+# requests per second (0 = unlimited). BILLING_PROVIDER_LIMITS overrides
+# them per provider, e.g. {"nubefact": {"concurrency": 2, "rate": 5}}.
+BILLING_PROVIDER_CONCURRENCY = env.int("BILLING_PROVIDER_CONCURRENCY", default=4)
+BILLING_PROVIDER_RATE_PER_SECOND = env.float("BILLING_PROVIDER_RATE_PER_SECOND", default=10)
+BILLING_PROVIDER_LIMITS = {}
+# Circuit breaker per (provider, api_endpoint): this many consecutive
+# failures (timeouts, 5xx, 429 or calls slower than BILLING_BREAKER_SLOW_MS)
+# defer emissions for the cooldown, then a single probe decides.
+BILLING_BREAKER_FAILURES = env.int("BILLING_BREAKER_FAILURES", default=5)
+BILLING_BREAKER_WINDOW_SECONDS = env.int("BILLING_BREAKER_WINDOW_SECONDS", default=120)
+BILLING_BREAKER_COOLDOWN_SECONDS = env.int("BILLING_BREAKER_COOLDOWN_SECONDS", default=60)
+BILLING_BREAKER_SLOW_MS = env.int("BILLING_BREAKER_SLOW_MS", default=15000)
+
+# ---------- Exports ----------
+# Rows fetched per query when streaming CSV/NDJSON exports
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", default=2000)
 
 # ---------- drf-spectacular ----------
 SPECTACULAR_SETTINGS = {
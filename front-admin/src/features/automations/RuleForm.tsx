@@ -12,6 +12,7 @@ const TRIGGERS = [
   'reservation.created', 'reservation.confirmed', 'reservation.check_in',
   'reservation.check_out', 'reservation.cancelled', 'reservation.no_show',
   'task.completed',
+  'schedule.before_payment_deadline', 'schedule.before_check_in', 'schedule.stay_over_daily',
 ];
 
 interface FormData {
@@ -20,6 +21,7 @@ interface FormData {
   trigger: string;
   conditions: string;
   actions: string;
+  schedule: string;
   priority: number;
   is_active: boolean;
 }
@@ -44,6 +46,7 @@ export default function RuleForm() {
         trigger: rule.trigger,
         conditions: JSON.stringify(rule.conditions, null, 2),
         actions: JSON.stringify(rule.actions, null, 2),
+        schedule: JSON.stringify(rule.schedule ?? {}, null, 2),
         priority: rule.priority,
         is_active: rule.is_active,
       });
@@ -51,16 +54,17 @@ export default function RuleForm() {
   }, [rule, reset]);
 
   const onSubmit = async (data: FormData) => {
-    let conditions, actions;
+    let conditions, actions, schedule;
     try {
       conditions = JSON.parse(data.conditions || '{}');
       actions = JSON.parse(data.actions || '{}');
+      schedule = JSON.parse(data.schedule || '{}');
     } catch {
-      enqueueSnackbar('JSON inválido en condiciones o acciones', { variant: 'error' });
+      enqueueSnackbar('JSON inválido en condiciones, acciones o programación', { variant: 'error' });
       return;
     }
 
-    const payload = { ...data, conditions, actions };
+    const payload = { ...data, conditions, actions, schedule };
     try {
       if (isEdit) {
         await update({ id: id!, data: payload }).unwrap();
@@ -96,6 +100,16 @@ export default function RuleForm() {
               <Grid item xs={12}>
                 <TextField {...register('actions')} label="Acciones (JSON)" fullWidth multiline rows={4} placeholder='{"type": "action"}' />
               </Grid>
+              <Grid item xs={12}>
+                <TextField
+                  {...register('schedule')}
+                  label="Programación (JSON, solo triggers schedule.*)"
+                  fullWidth
+                  multiline
+                  rows={2}
+                  placeholder='{"minutes_before": 120} o {"time": "08:00"}'
+                />
+              </Grid>
               <Grid item xs={12}>
                 <FormControlLabel control={<Switch {...register('is_active')} defaultChecked />} label="Activa" />
               </Grid>
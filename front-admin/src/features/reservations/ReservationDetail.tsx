@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import {
   Alert,
@@ -44,6 +44,8 @@ import {
   FINANCIAL_STATUS,
   ORIGIN_TYPE_LABELS,
   PAYMENT_METHOD_LABELS,
+  INVOICE_STATUS,
+  INVOICE_DOC_TYPE,
 } from '../../utils/statusLabels';
 import type { Payment } from '../../interfaces/types';
 
@@ -61,7 +63,18 @@ export default function ReservationDetail() {
   const navigate = useNavigate();
   const { enqueueSnackbar } = useSnackbar();
 
-  const { data: reservation, isLoading, isError } = useGetReservationQuery(id!);
+  // Invoices are created and emitted in the background: refresh while the
+  // check-out automations wait in the outbox or an invoice is in flight
+  const [pollInvoices, setPollInvoices] = useState(false);
+  const { data: reservation, isLoading, isError } = useGetReservationQuery(id!, {
+    pollingInterval: pollInvoices ? 5000 : 0,
+  });
+  const emissionInProgress = (reservation?.automations_pending || reservation?.invoices.some(
+    (invoice) => invoice.queued || invoice.status === 'pending' || invoice.status === 'sent',
+  )) ?? false;
+  useEffect(() => {
+    setPollInvoices(emissionInProgress);
+  }, [emissionInProgress]);
 
   const [confirmReservation] = useConfirmReservationMutation();
   const [checkInReservation] = useCheckInReservationMutation();
@@ -718,6 +731,61 @@ export default function ReservationDetail() {
         </CardContent>
       </Card>
 
+      {/* Invoices section */}
+      {reservation.invoices.length > 0 && (
+        <Card sx={{ mt: 3 }}>
+          <CardContent>
+            <Typography variant="h6" sx={{ mb: 2 }}>Comprobantes</Typography>
+            <TableContainer>
+              <Table size="small">
+                <TableHead>
+                  <TableRow>
+                    <TableCell>Numero</TableCell>
+                    <TableCell>Tipo</TableCell>
+                    <TableCell>Estado</TableCell>
+                    <TableCell>Detalle</TableCell>
+                    <TableCell align="right">PDF</TableCell>
+                  </TableRow>
+                </TableHead>
+                <TableBody>
+                  {reservation.invoices.map((invoice) => (
+                    <TableRow key={invoice.id}>
+                      <TableCell>{invoice.numero_completo}</TableCell>
+                      <TableCell>{INVOICE_DOC_TYPE[invoice.document_type] ?? invoice.document_type}</TableCell>
+                      <TableCell>
+                        <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                          <StatusChip statusMap={INVOICE_STATUS} value={invoice.status} />
+                          {(invoice.queued || invoice.status === 'pending' || invoice.status === 'sent') && (
+                            <CircularProgress size={14} />
+                          )}
+                        </Box>
+                      </TableCell>
+                      <TableCell>
+                        {invoice.queued && invoice.retry_count === 0 && 'En cola de emision'}
+                        {invoice.queued && invoice.retry_count > 0 && invoice.next_attempt_at &&
+                          `Reintento ${formatDateTime(invoice.next_attempt_at)}`}
+                        {invoice.last_error && invoice.status !== 'accepted' && (
+                          <Typography variant="caption" color="error" display="block">
+                            {invoice.last_error}
+                          </Typography>
+                        )}
+                      </TableCell>
+                      <TableCell align="right">
+                        {invoice.provider_document_url ? (
+                          <Button size="small" href={invoice.provider_document_url} target="_blank" rel="noopener">
+                            Ver
+                          </Button>
+                        ) : '---'}
+                      </TableCell>
+                    </TableRow>
+                  ))}
+                </TableBody>
+              </Table>
+            </TableContainer>
+          </CardContent>
+        </Card>
+      )}
+
       {/* Voucher lightbox */}
       {reservation.voucher_image && (
         <Dialog open={voucherOpen} onClose={() => setVoucherOpen(false)} maxWidth="lg">
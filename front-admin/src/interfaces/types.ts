@@ -222,6 +222,19 @@ export interface Payment {
   processed_at: string;
 }
 
+export interface ReservationInvoice {
+  id: string;
+  numero_completo: string;
+  document_type: string;
+  status: string;
+  queued: boolean;
+  next_attempt_at: string | null;
+  retry_count: number;
+  last_error: string;
+  provider_document_url: string;
+  created_at: string;
+}
+
 export interface ReservationList {
   id: string;
   confirmation_code: string;
@@ -252,6 +265,8 @@ export interface ReservationDetail extends ReservationList {
   voucher_image: string | null;
   payment_deadline: string | null;
   payments: Payment[];
+  invoices: ReservationInvoice[];
+  automations_pending: boolean;
   created_by: string;
   updated_at: string;
 }
@@ -393,6 +408,7 @@ export interface AutomationRule {
   trigger: string;
   conditions: Record<string, unknown>;
   actions: Record<string, unknown>;
+  schedule: Record<string, unknown>;
   priority: number;
   is_active: boolean;
   is_system: boolean;
@@ -8,12 +8,18 @@ async function proxy(request: Request, { params }: { params: Promise<{ path: str
   const target = `${API_BASE}/${slug}/${search}`;
 
   const contentType = request.headers.get("content-type") || "";
+  const contentEncoding = request.headers.get("content-encoding") || "";
   const isMultipart = contentType.includes("multipart/form-data");
+  // Compressed bodies (e.g. gzip event batches) must be forwarded as bytes
+  const isBinary = isMultipart || contentEncoding !== "";
 
   const headers: Record<string, string> = {};
   if (!isMultipart) {
     headers["Content-Type"] = contentType || "application/json";
   }
+  if (contentEncoding) {
+    headers["Content-Encoding"] = contentEncoding;
+  }
 
   const auth = request.headers.get("authorization");
   if (auth) {
@@ -22,7 +28,7 @@ async function proxy(request: Request, { params }: { params: Promise<{ path: str
 
   let body: BodyInit | undefined;
   if (request.method !== "GET") {
-    body = isMultipart
+    body = isBinary
       ? Buffer.from(await request.arrayBuffer())
       : await request.text();
     if (isMultipart) {
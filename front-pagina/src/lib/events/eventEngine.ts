@@ -3,6 +3,7 @@ import type { EventName, TrackingEvent } from "./eventTypes";
 const BUFFER_SIZE = 5;
 const FLUSH_INTERVAL_MS = 10_000; // 10 seconds
 const MAX_RETRY = 2;
+const MAX_BATCH = 50; // backend limit per request
 const STORAGE_KEY = "lervi_session_id";
 const GUEST_KEY = "lervi_guest_id";
 
@@ -53,9 +54,9 @@ export function initEventEngine(slug: string): void {
     flushTimer = setInterval(flush, FLUSH_INTERVAL_MS);
     // Flush on page unload
     window.addEventListener("visibilitychange", () => {
-      if (document.visibilityState === "hidden") flush();
+      if (document.visibilityState === "hidden") flushBeacon();
     });
-    window.addEventListener("beforeunload", flush);
+    window.addEventListener("pagehide", flushBeacon);
   }
 }
 
@@ -70,6 +71,8 @@ export function track(eventName: EventName, metadata?: Record<string, unknown>):
   try {
     const evt: TrackingEvent = {
       event: eventName,
+      // Stable across retries so the backend can drop duplicates
+      event_id: crypto.randomUUID(),
       timestamp: Date.now(),
       session_id: getSessionId(),
       hotel_slug: currentSlug,
@@ -91,22 +94,56 @@ export function track(eventName: EventName, metadata?: Record<string, unknown>):
 // Flush — send buffered events to backend
 // ---------------------------------------------------------------------------
 
+function toNdjson(batch: TrackingEvent[]): string {
+  return batch.map(({ hotel_slug, ...rest }) => JSON.stringify(rest)).join("\n");
+}
+
+async function gzip(body: string): Promise<Blob | null> {
+  if (typeof CompressionStream === "undefined") return null;
+  try {
+    const stream = new Blob([body]).stream().pipeThrough(new CompressionStream("gzip"));
+    return await new Response(stream).blob();
+  } catch {
+    return null;
+  }
+}
+
+// Page is going away: hand the buffer to the browser as beacons
+function flushBeacon(): void {
+  if (buffer.length === 0 || !currentSlug) return;
+  if (typeof navigator === "undefined" || !navigator.sendBeacon) {
+    flush();
+    return;
+  }
+  while (buffer.length > 0) {
+    const batch = buffer.slice(0, MAX_BATCH);
+    const body = new Blob([toNdjson(batch)], { type: "application/x-ndjson" });
+    if (!navigator.sendBeacon(`/api/${currentSlug}/events/`, body)) {
+      flush();
+      return;
+    }
+    buffer = buffer.slice(batch.length);
+  }
+}
+
 async function flush(): Promise<void> {
   if (buffer.length === 0 || !currentSlug) return;
 
-  const batch = [...buffer];
-  buffer = [];
+  const batch = buffer.slice(0, MAX_BATCH);
+  buffer = buffer.slice(batch.length);
 
-  const payload = {
-    events: batch.map(({ hotel_slug, ...rest }) => rest),
-  };
+  const ndjson = toNdjson(batch);
+  const compressed = await gzip(ndjson);
+  const headers: Record<string, string> = { "Content-Type": "application/x-ndjson" };
+  if (compressed) headers["Content-Encoding"] = "gzip";
+  const body = compressed ?? ndjson;
 
   for (let attempt = 0; attempt <= MAX_RETRY; attempt++) {
     try {
       const res = await fetch(`/api/${currentSlug}/events/`, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(payload),
+        headers,
+        body,
         keepalive: true, // survive page unload
       });
       if (res.ok) return; // success
@@ -16,6 +16,7 @@ export type EventName = (typeof EVENT_NAMES)[keyof typeof EVENT_NAMES];
 
 export interface TrackingEvent {
   event: EventName;
+  event_id: string;
   timestamp: number;
   session_id: string;
   hotel_slug: string;